@@ -1,23 +1,77 @@
 from flask import Flask
+from flask.helpers import get_debug_flag
 from flask_cors import CORS
+from werkzeug.serving import is_running_from_reloader
 from routes.upload import upload_bp
 from routes.resume import resume_bp
-from routes.job_ads import job_ads_bp
+from routes.job_ads import job_ads_bp, generation_queue
 from routes.completed_resumes import completed_resumes_bp
-from routes.format import format_bp
+from routes.format import format_bp, format_batch_queue, FORMATTED_PDF_URL_SECRET
 from routes.templates import templates_bp
 from routes.advice import advice_bp
+from db import llm_cache_collection
+from db_indexes import ensure_indexes
+from parser.llm_cache import configure_llm_cache
+from template_registry import get_template_registry
 
-app = Flask(__name__)
-CORS(app)
 
-app.register_blueprint(upload_bp)
-app.register_blueprint(resume_bp)
-app.register_blueprint(job_ads_bp)
-app.register_blueprint(completed_resumes_bp)
-app.register_blueprint(format_bp)
-app.register_blueprint(templates_bp)
-app.register_blueprint(advice_bp)
+def start_services(app: Flask):
+    """
+    Create the indexes backing the per-user list endpoints and the generation
+    queue, then start the resume generation and batch formatting workers (which
+    requeue jobs orphaned by a previous run). Safe to call more than once.
+    """
+    ensure_indexes(app.logger)
+    generation_queue.start()
+    format_batch_queue.start()
+
+
+def create_app(start: bool = None) -> Flask:
+    """
+    Build the app and, in every process that serves it, start the background
+    services. Used by all server modes:
+
+        python back_end/app.py
+        flask --app back_end/app.py run [--debug]
+        gunicorn --chdir back_end 'app:create_app()'
+
+    start defaults to True except in the debug reloader's watcher process,
+    which loads the app but never serves it (its serving child starts them).
+    """
+    # Signed PDF links must verify in every worker process and across restarts
+    if not FORMATTED_PDF_URL_SECRET:
+        raise RuntimeError("FORMATTED_PDF_URL_SECRET must be set (see README)")
+
+    app = Flask(__name__)
+    # Paginated lists return the next page cursor in a header the browser must be allowed to read
+    CORS(app, expose_headers=["X-Next-Cursor"])
+
+    # Persist deterministic LLM responses (parse/score) across requests and restarts
+    configure_llm_cache(llm_cache_collection)
+
+    # Load and validate the LaTeX templates up front instead of on the first render
+    get_template_registry()
+
+    app.register_blueprint(upload_bp)
+    app.register_blueprint(resume_bp)
+    app.register_blueprint(job_ads_bp)
+    app.register_blueprint(completed_resumes_bp)
+    app.register_blueprint(format_bp)
+    app.register_blueprint(templates_bp)
+    app.register_blueprint(advice_bp)
+
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        """Create the declared MongoDB indexes and exit."""
+        ensure_indexes(app.logger)
+
+    if start is None:
+        start = is_running_from_reloader() or not get_debug_flag()
+    if start:
+        start_services(app)
+    return app
+
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # debug=True runs the reloader: only its serving child starts the services
+    create_app(start=is_running_from_reloader()).run(host="0.0.0.0", port=5000, debug=True)
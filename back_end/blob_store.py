@@ -0,0 +1,211 @@
+"""
+Content-addressed storage for upload binaries and generated PDFs, kept out
+of Mongo documents so reads of a document never pull the file over the wire.
+
+Blobs are keyed by their SHA-256 hex digest. The backend is chosen with
+BLOB_STORE ("gridfs", the default, or "local" with BLOB_STORE_PATH). Run
+`python blob_store.py --migrate` to move bytes still embedded in older
+documents (upload files and data: URL PDFs) into the store.
+"""
+import base64
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import gridfs
+from gridfs.errors import NoFile
+from db import db, biography_collection, completed_resumes_collection
+
+BLOB_STORE = os.getenv("BLOB_STORE", "gridfs").lower()
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "blob_data"))
+# One bucket (GridFS bucket or subdirectory) per kind of blob
+UPLOADS_BUCKET = os.getenv("BLOB_STORE_BUCKET", "uploads")
+FORMATTED_PDFS_BUCKET = "formatted_pdfs"
+
+# Projection for biography reads that don't need the bytes older documents embed
+WITHOUT_FILE_CONTENT = {"file_content": 0}
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a referenced blob is missing from the store."""
+    pass
+
+
+class GridFSBlobStore:
+    """Blobs as GridFS files whose _id is the content hash."""
+
+    def __init__(self, database, bucket_name: str = UPLOADS_BUCKET):
+        self.bucket = gridfs.GridFSBucket(database, bucket_name=bucket_name)
+        self.files = database[f"{bucket_name}.files"]
+
+    def exists(self, ref: str) -> bool:
+        return self.files.count_documents({"_id": ref}, limit=1) > 0
+
+    def put(self, data: bytes) -> str:
+        ref = hashlib.sha256(data).hexdigest()
+        if not self.exists(ref):
+            try:
+                self.bucket.upload_from_stream_with_id(ref, ref, data)
+            except Exception:
+                # Lost a race with a concurrent upload of the same bytes
+                if not self.exists(ref):
+                    raise
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        try:
+            return self.bucket.open_download_stream(ref).read()
+        except NoFile:
+            raise BlobNotFoundError(f"Blob not found: {ref}")
+
+    def open(self, ref: str):
+        """Seekable file object over the blob plus its size; chunks are read on demand."""
+        try:
+            grid_out = self.bucket.open_download_stream(ref)
+        except NoFile:
+            raise BlobNotFoundError(f"Blob not found: {ref}")
+        return grid_out, grid_out.length
+
+    def delete(self, ref: str):
+        try:
+            self.bucket.delete(ref)
+        except NoFile:
+            pass
+
+
+class LocalBlobStore:
+    """Blobs as files under root/ab/cd/<sha256>, written atomically."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, ref: str) -> str:
+        return os.path.join(self.root, ref[:2], ref[2:4], ref)
+
+    def exists(self, ref: str) -> bool:
+        return os.path.exists(self._path(ref))
+
+    def put(self, data: bytes) -> str:
+        ref = hashlib.sha256(data).hexdigest()
+        path = self._path(ref)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except Exception:
+                os.unlink(tmp)
+                raise
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        try:
+            with open(self._path(ref), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob not found: {ref}")
+
+    def open(self, ref: str):
+        """Seekable file object over the blob plus its size."""
+        path = self._path(ref)
+        try:
+            return open(path, "rb"), os.path.getsize(path)
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob not found: {ref}")
+
+    def delete(self, ref: str):
+        try:
+            os.remove(self._path(ref))
+        except FileNotFoundError:
+            pass
+
+
+_stores = {}
+_store_lock = threading.Lock()
+
+
+def get_blob_store(bucket: str = UPLOADS_BUCKET):
+    """Process-wide blob store for one bucket of the configured backend."""
+    with _store_lock:
+        if bucket not in _stores:
+            if BLOB_STORE == "local":
+                _stores[bucket] = LocalBlobStore(os.path.join(BLOB_STORE_PATH, bucket))
+            else:
+                _stores[bucket] = GridFSBlobStore(db, bucket)
+        return _stores[bucket]
+
+
+def load_upload_bytes(doc: dict) -> bytes:
+    """
+    Fetch the original file of a biography upload. Documents from before the
+    blob store still embed the bytes; those are read back on demand since
+    queries leave file_content out of their projection.
+    """
+    if doc.get("file_ref"):
+        return get_blob_store().get(doc["file_ref"])
+    if doc.get("file_content") is not None:
+        return doc["file_content"]
+    legacy = biography_collection.find_one({"_id": doc["_id"]}, {"file_content": 1})
+    if not legacy or legacy.get("file_content") is None:
+        raise BlobNotFoundError(f"Upload {doc['_id']} has no stored file")
+    return legacy["file_content"]
+
+
+def open_upload_file(doc: dict):
+    """Streamable (file object, size) for a biography upload, without reading it into memory."""
+    if doc.get("file_ref"):
+        return get_blob_store().open(doc["file_ref"])
+    data = load_upload_bytes(doc)
+    return io.BytesIO(data), len(data)
+
+
+def release_upload_blob(ref: str):
+    """Delete a blob once no biography document references it any more."""
+    if ref and biography_collection.count_documents({"file_ref": ref}, limit=1) == 0:
+        get_blob_store().delete(ref)
+
+
+def migrate_embedded_uploads() -> int:
+    """Move file_content of older documents into the blob store; returns how many moved."""
+    store = get_blob_store()
+    moved = 0
+    for doc in biography_collection.find({"file_content": {"$exists": True}}, {"file_content": 1}):
+        data = doc["file_content"]
+        ref = store.put(data)
+        biography_collection.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"file_ref": ref, "file_sha256": ref, "file_size": len(data)},
+             "$unset": {"file_content": ""}}
+        )
+        moved += 1
+    return moved
+
+
+def store_data_url_pdf(data_url: str) -> str:
+    """Move a legacy base64 data: URL PDF into the formatted PDF bucket; returns its ref."""
+    encoded = data_url.split(",", 1)[1]
+    return get_blob_store(FORMATTED_PDFS_BUCKET).put(base64.b64decode(encoded))
+
+
+def migrate_formatted_pdfs() -> int:
+    """Replace data: URL PDFs on completed resumes with blob references; returns how many moved."""
+    moved = 0
+    query = {"formatted_pdf_url": {"$regex": "^data:"}}
+    for doc in completed_resumes_collection.find(query, {"formatted_pdf_url": 1}):
+        ref = store_data_url_pdf(doc["formatted_pdf_url"])
+        completed_resumes_collection.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"formatted_pdf_ref": ref}, "$unset": {"formatted_pdf_url": ""}}
+        )
+        moved += 1
+    return moved
+
+
+if __name__ == "__main__":
+    if "--migrate" in sys.argv:
+        print(f"Moved {migrate_embedded_uploads()} upload(s) into the {BLOB_STORE} blob store")
+        print(f"Moved {migrate_formatted_pdfs()} formatted PDF(s) into the {BLOB_STORE} blob store")
@@ -6,9 +6,14 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)),
 
 MONGO_URI = os.getenv("MONGO_URI")
 
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "fiveguys")
+
 client = MongoClient(MONGO_URI, tz_aware=True)
-db = client['fiveguys']
+db = client[MONGO_DB_NAME]
 biography_collection = db['biographies']
 job_ads_collection = db['job ads']
 completed_resumes_collection = db['completed_resumes']
-resume_generation_jobs_collection = db['resume_generation_jobs']
\ No newline at end of file
+resume_generation_jobs_collection = db['resume_generation_jobs']
+format_batch_jobs_collection = db['format_batch_jobs']
+extracted_texts_collection = db['extracted_texts']
+llm_cache_collection = db['llm_cache']
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Index declarations for the per-user access patterns of the API, created
+idempotently at startup. tests/test_db_indexes.py creates them in a test
+database and verifies with explain() that every list query is served by an
+index without a collection scan or in-memory sort; `python db_indexes.py --check`
+runs the same check against the configured database.
+"""
+import logging
+import sys
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import ServerSelectionTimeoutError
+from db import (
+    biography_collection,
+    job_ads_collection,
+    completed_resumes_collection,
+    resume_generation_jobs_collection,
+    format_batch_jobs_collection,
+)
+
+# (collection, keys, options); every index is named so re-creating it is a no-op
+INDEXES = [
+    # GET /uploads and GET /resumes: own documents, newest upload first; _id is the
+    # tie-breaker of the page cursor on every paginated list
+    (biography_collection, [("user_id", ASCENDING), ("uploadedAt", DESCENDING), ("_id", DESCENDING)],
+     {"name": "user_uploadedAt"}),
+    (biography_collection, [("user_id", ASCENDING), ("isComplete", ASCENDING)],
+     {"name": "user_isComplete"}),
+    # Blob reference counting when an upload is deleted
+    (biography_collection, [("file_ref", ASCENDING)],
+     {"name": "file_ref", "sparse": True}),
+    # GET /job_ads
+    (job_ads_collection, [("user_id", ASCENDING), ("uploaded_at", DESCENDING), ("_id", DESCENDING)],
+     {"name": "user_uploaded_at"}),
+    # GET /completed_resumes: applied resumes, newest application first
+    (completed_resumes_collection,
+     [("user_id", ASCENDING), ("status", ASCENDING), ("applied_at", DESCENDING), ("_id", DESCENDING)],
+     {"name": "user_status_applied_at"}),
+    # GET /completed_resumes/applied_job_ads
+    (completed_resumes_collection, [("user_id", ASCENDING), ("job_ad_id", ASCENDING)],
+     {"name": "user_job_ad_id"}),
+    # One completed resume per generation job, even when the job is retried
+    (completed_resumes_collection, [("generation_job_id", ASCENDING)],
+     {"name": "generation_job_id", "unique": True,
+      "partialFilterExpression": {"generation_job_id": {"$exists": True}}}),
+    # GET /resume_generation_jobs
+    (resume_generation_jobs_collection, [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+     {"name": "user_created_at"}),
+    # Generation queue claim and orphan recovery
+    (resume_generation_jobs_collection, [("status", ASCENDING), ("available_at", ASCENDING)],
+     {"name": "status_available_at"}),
+    (resume_generation_jobs_collection, [("status", ASCENDING), ("lease_expires_at", ASCENDING)],
+     {"name": "status_lease_expires_at"}),
+    # Batch formatting queue
+    (format_batch_jobs_collection, [("status", ASCENDING), ("available_at", ASCENDING)],
+     {"name": "status_available_at"}),
+    (format_batch_jobs_collection, [("status", ASCENDING), ("lease_expires_at", ASCENDING)],
+     {"name": "status_lease_expires_at"}),
+]
+
+# Query shapes issued by the list endpoints: (label, collection, filter, sort)
+QUERY_PLANS = [
+    ("GET /uploads", biography_collection,
+     {"createdFrom": {"$exists": False}, "user_id": "<uid>"}, [("uploadedAt", DESCENDING), ("_id", DESCENDING)]),
+    ("GET /job_ads", job_ads_collection,
+     {"user_id": "<uid>"}, [("uploaded_at", DESCENDING), ("_id", DESCENDING)]),
+    ("GET /completed_resumes", completed_resumes_collection,
+     {"user_id": "<uid>", "status": "applied"}, [("applied_at", DESCENDING), ("_id", DESCENDING)]),
+    ("GET /resume_generation_jobs", resume_generation_jobs_collection,
+     {"user_id": "<uid>"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+]
+
+
+def ensure_indexes(logger: logging.Logger = None):
+    """Create every declared index; existing indexes with the same spec are left alone."""
+    logger = logger or logging.getLogger(__name__)
+    for collection, keys, options in INDEXES:
+        try:
+            collection.create_index(keys, **options)
+        except ServerSelectionTimeoutError as e:
+            logger.error("Skipping index setup, database unreachable: %s", e)
+            return
+        except Exception as e:
+            # e.g. an index with the same name but different options already exists
+            logger.error("Index %s on %s not created: %s", options.get("name"), collection.name, e)
+
+
+def _plan_stages(plan: dict) -> list:
+    """Flatten the stage names of an explain() plan tree."""
+    stages = [plan.get("stage")]
+    for child in plan.get("inputStages", []) + [plan.get("inputStage")]:
+        if child:
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+def check_query_plans() -> list:
+    """Explain each list query and return a description of any that scan or sort in memory."""
+    problems = []
+    for label, collection, query, sort in QUERY_PLANS:
+        planner = collection.find(query).sort(sort).explain()["queryPlanner"]
+        winning = planner["winningPlan"]
+        # Slot-based engine nests the classic plan under queryPlan
+        stages = _plan_stages(winning.get("queryPlan", winning))
+        if "COLLSCAN" in stages or "SORT" in stages:
+            problems.append(f"{label}: {' <- '.join(s for s in stages if s)}")
+    return problems
+
+
+if __name__ == "__main__":
+    ensure_indexes()
+    if "--check" in sys.argv:
+        problems = check_query_plans()
+        for problem in problems:
+            print(f"Not index-covered: {problem}")
+        if problems:
+            sys.exit(1)
+        print("All list queries use an index")
@@ -0,0 +1,203 @@
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for failures that retrying cannot fix."""
+    pass
+
+
+class MongoJobQueue:
+    """
+    Persistent job queue on top of a Mongo collection, drained by a bounded pool
+    of worker threads.
+
+    Jobs are documents with status "pending" and an available_at time. Workers
+    claim them atomically with find_one_and_update and hold a lease that a
+    heartbeat keeps extending while the handler runs. Failed jobs are retried
+    with exponential backoff up to max_attempts. Jobs whose lease ran out,
+    because the process died mid-job or a deploy restarted it, are put back in
+    the queue by the reaper, including once at startup.
+    """
+
+    def __init__(self, collection, handler, on_failure=None, notify=None, workers=4,
+                 lease_seconds=120, max_attempts=3, backoff_seconds=5, max_backoff_seconds=300,
+                 poll_seconds=2):
+        self.collection = collection
+        self.handler = handler
+        self.on_failure = on_failure
+        self.notify = notify
+        self.workers = workers
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    # ── producer side ──────────────────────────────────────────
+
+    def enqueue(self, doc: dict):
+        """Insert a new pending job and wake a local worker; returns the inserted id."""
+        now = datetime.now(timezone.utc)
+        doc = {**doc, "status": "pending", "attempts": 0, "available_at": now}
+        doc.setdefault("created_at", now)
+        result = self.collection.insert_one(doc)
+        self._wakeup.set()
+        return result.inserted_id
+
+    # ── lifecycle ──────────────────────────────────────────────
+
+    def start(self):
+        """Recover orphaned jobs and start the worker and reaper threads (idempotent)."""
+        with self._start_lock:
+            if self._threads:
+                return
+            try:
+                self.recover_orphans(include_unleased=True)
+            except Exception as e:
+                print(f"Job queue recovery failed: {e}")
+
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker_loop, args=(f"{self.worker_prefix}:{i}",),
+                                     name=f"job-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            reaper = threading.Thread(target=self._reaper_loop, name="job-reaper", daemon=True)
+            reaper.start()
+            self._threads.append(reaper)
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    # ── recovery ───────────────────────────────────────────────
+
+    def recover_orphans(self, include_unleased: bool = False):
+        """
+        Requeue processing jobs whose lease expired, failing those out of attempts.
+        include_unleased also picks up jobs left in processing without any lease,
+        as written before this queue existed.
+        """
+        now = datetime.now(timezone.utc)
+        expired = [{"lease_expires_at": {"$lt": now}}]
+        if include_unleased:
+            expired.append({"lease_expires_at": {"$exists": False}})
+        query = {"status": "processing", "$or": expired}
+
+        for job in self.collection.find({**query, "attempts": {"$gte": self.max_attempts}}, {"_id": 1}):
+            self._fail(job, Exception("Job was interrupted too many times"), worker_id=None)
+
+        result = self.collection.update_many(
+            query,
+            {"$set": {"status": "pending", "available_at": now},
+             "$unset": {"worker_id": "", "lease_expires_at": ""}}
+        )
+        if result.modified_count:
+            print(f"Requeued {result.modified_count} orphaned job(s)")
+            self._wakeup.set()
+
+    def _reaper_loop(self):
+        while not self._stop.wait(self.lease.total_seconds() / 2):
+            try:
+                self.recover_orphans()
+            except Exception as e:
+                print(f"Job reaper failed: {e}")
+
+    # ── consumer side ──────────────────────────────────────────
+
+    def claim(self, worker_id: str):
+        """Atomically take the oldest available pending job, or return None."""
+        now = datetime.now(timezone.utc)
+        return self.collection.find_one_and_update(
+            {"status": "pending", "available_at": {"$lte": now}},
+            {"$set": {
+                "status": "processing",
+                "worker_id": worker_id,
+                "lease_expires_at": now + self.lease,
+                "heartbeat_at": now,
+            }, "$inc": {"attempts": 1}},
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _worker_loop(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                job = self.claim(worker_id)
+            except Exception as e:
+                print(f"Job claim failed: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            self._run(job, worker_id)
+
+    def _run(self, job: dict, worker_id: str):
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job["_id"], worker_id, done), daemon=True)
+        heartbeat.start()
+        try:
+            self.handler(job)
+        except PermanentJobError as e:
+            self._fail(job, e, worker_id)
+        except Exception as e:
+            if job.get("attempts", 1) >= self.max_attempts:
+                self._fail(job, e, worker_id)
+            else:
+                self._retry(job, e, worker_id)
+        finally:
+            done.set()
+            self.collection.update_one(
+                {"_id": job["_id"], "worker_id": worker_id},
+                {"$unset": {"worker_id": "", "lease_expires_at": ""}}
+            )
+
+    def _heartbeat_loop(self, job_id, worker_id: str, done: threading.Event):
+        while not done.wait(self.lease.total_seconds() / 3):
+            now = datetime.now(timezone.utc)
+            try:
+                result = self.collection.update_one(
+                    {"_id": job_id, "worker_id": worker_id, "status": "processing"},
+                    {"$set": {"lease_expires_at": now + self.lease, "heartbeat_at": now}}
+                )
+                if result.matched_count == 0:
+                    print(f"Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                print(f"Job heartbeat failed: {e}")
+
+    def _retry(self, job: dict, error: Exception, worker_id: str):
+        attempts = job.get("attempts", 1)
+        delay = min(self.backoff_seconds * (2 ** (attempts - 1)), self.max_backoff_seconds)
+        self.collection.update_one(
+            {"_id": job["_id"], "worker_id": worker_id},
+            {"$set": {
+                "status": "pending",
+                "available_at": datetime.now(timezone.utc) + timedelta(seconds=delay),
+                "last_error": str(error),
+            }}
+        )
+        if self.notify:
+            self.notify(str(job["_id"]))
+
+    def _fail(self, job: dict, error: Exception, worker_id):
+        if self.on_failure:
+            try:
+                self.on_failure(job, error)
+                return
+            except Exception as e:
+                print(f"Job failure handler raised: {e}")
+        query = {"_id": job["_id"]}
+        if worker_id:
+            query["worker_id"] = worker_id
+        self.collection.update_one(query, {"$set": {"status": "failed", "error": str(error)}})
@@ -1,9 +1,34 @@
-import os
-import subprocess
-import tempfile
-import importlib.util
 import re
-from pathlib import Path
+import unicodedata
+from concurrent.futures import Future
+from pdf_cache import get_pdf_cache
+from latex_service import get_compile_service, CompileQueueFullError
+from template_registry import get_template_registry
+
+# LaTeX special characters and typographic quotes, escaped in a single regex pass
+LATEX_ESCAPES = {
+    '\\': r'\textbackslash{}',
+    '{': r'\{',
+    '}': r'\}',
+    '$': r'\$',
+    '&': r'\&',
+    '%': r'\%',
+    '#': r'\#',
+    '^': r'\textasciicircum{}',
+    '_': r'\_',
+    '~': r'\textasciitilde{}',
+    '"': "''",
+    '\u201c': "``",  # left double quote
+    '\u201d': "''",  # right double quote
+    '\u2018': "`",   # left single quote
+    '\u2019': "'",   # right single quote / apostrophe
+}
+LATEX_SPECIAL_REGEX = re.compile("[" + re.escape("".join(LATEX_ESCAPES)) + "]")
+
+
+def _escape_match(match):
+    return LATEX_ESCAPES[match.group()]
+
 
 class LaTeXCompiler:
     """
@@ -11,69 +36,26 @@ class LaTeXCompiler:
     """
     
     def __init__(self):
-        self.templates_dir = Path(__file__).parent / "latex_templates"
-        self.base_template_path = self.templates_dir / "base_template.tex"
-        self.two_column_template_path = self.templates_dir / "two_column_template.tex"
+        self.templates = get_template_registry()
     
     def escape_latex_text(self, text):
         """Escape special LaTeX characters in text content"""
         if not text:
             return ""
         
-        # Convert to string if not already
-        text = str(text)
-        
-        # Dictionary of LaTeX special characters and their escaped versions
-        latex_special_chars = {
-            '\\': r'\textbackslash{}',
-            '{': r'\{',
-            '}': r'\}',
-            '$': r'\$',
-            '&': r'\&',
-            '%': r'\%',
-            '#': r'\#',
-            '^': r'\textasciicircum{}',
-            '_': r'\_',
-            '~': r'\textasciitilde{}',
-        }
-        
-        # Escape special characters
-        for char, escaped in latex_special_chars.items():
-            text = text.replace(char, escaped)
+        # Compose accents (e.g. e + combining acute) so they map to single glyphs
+        text = unicodedata.normalize("NFC", str(text))
         
-        # Handle quotes
-        text = text.replace('"', "''")
-        text = text.replace('"', "''")
-        text = text.replace('"', "''")
-        text = text.replace("'", "'")
-        text = text.replace("'", "'")
-        
-        return text
+        # Most fields have nothing to escape; only those that do pay for the substitution
+        if not LATEX_SPECIAL_REGEX.search(text):
+            return text
+        return LATEX_SPECIAL_REGEX.sub(_escape_match, text)
 
     def get_template_config(self, template_id="default"):
-        """Load template configuration"""
-        try:
-            # Extract base template name (remove _1col or _2col suffix)
-            base_template = template_id.replace('_1col', '').replace('_2col', '')
-            
-            config_path = self.templates_dir / f"{base_template}.py"
-            if not config_path.exists():
-                config_path = self.templates_dir / "default.py"
-            
-            spec = importlib.util.spec_from_file_location("template_config", config_path)
-            config = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(config)
-            return config
-        except Exception as e:
-            print(f"Error loading template config: {e}")
-            # Return default config
-            class DefaultConfig:
-                TEMPLATE_CUSTOMIZATIONS = ""
-                SECTION_COLOR = ""
-                SECTION_UNDERLINE_COLOR = "\\color{black}"
-                NAME_STYLE = "\\Huge \\scshape"
-                FONT_PACKAGES = ""
-            return DefaultConfig()
+        """Template configuration, served from the preloaded registry"""
+        # Extract base template name (remove _1col or _2col suffix)
+        base_template = template_id.replace('_1col', '').replace('_2col', '')
+        return self.templates.get_config(base_template)
     
     def is_two_column_template(self, template_id):
         """Check if template is a two-column variant"""
@@ -242,17 +224,14 @@ class LaTeXCompiler:
         # Determine if this is a two-column template
         is_two_col = self.is_two_column_template(template_id)
         
-        # Read appropriate template
+        # Precompiled layout for the template type
+        template = self.templates.get_layout(is_two_col)
         if is_two_col:
-            with open(self.two_column_template_path, 'r') as f:
-                template_content = f.read()
-            return self.generate_two_column_latex_content(resume_data, template_id, config, template_content)
+            return self.generate_two_column_latex_content(resume_data, template_id, config, template)
         else:
-            with open(self.base_template_path, 'r') as f:
-                template_content = f.read()
-            return self.generate_single_column_latex_content(resume_data, template_id, config, template_content)
+            return self.generate_single_column_latex_content(resume_data, template_id, config, template)
     
-    def generate_single_column_latex_content(self, resume_data, template_id, config, template_content):
+    def generate_single_column_latex_content(self, resume_data, template_id, config, template):
         """Generate single-column LaTeX content from resume data"""
         first_name = self.escape_latex_text(resume_data.get('first_name', ''))
         last_name = self.escape_latex_text(resume_data.get('last_name', ''))
@@ -287,27 +266,24 @@ class LaTeXCompiler:
         
         # Replace template variables
         replacements = {
-            '{{TEMPLATE_CUSTOMIZATIONS}}': config.TEMPLATE_CUSTOMIZATIONS,
-            '{{SECTION_COLOR}}': config.SECTION_COLOR,
-            '{{SECTION_UNDERLINE_COLOR}}': config.SECTION_UNDERLINE_COLOR,
-            '{{NAME_STYLE}}': config.NAME_STYLE,
-            '{{FULL_NAME}}': full_name,
-            '{{PHONE}}': phone,
-            '{{EMAIL}}': email,
-            '{{LINKEDIN_GITHUB_SECTION}}': linkedin_github,
-            '{{CAREER_OBJECTIVE_SECTION}}': career_objective_section,
-            '{{EDUCATION_SECTION}}': education_section,
-            '{{EXPERIENCE_SECTION}}': experience_section,
-            '{{SKILLS_SECTION}}': skills_section,
+            'TEMPLATE_CUSTOMIZATIONS': config.TEMPLATE_CUSTOMIZATIONS,
+            'SECTION_COLOR': config.SECTION_COLOR,
+            'SECTION_UNDERLINE_COLOR': config.SECTION_UNDERLINE_COLOR,
+            'NAME_STYLE': config.NAME_STYLE,
+            'FULL_NAME': full_name,
+            'PHONE': phone,
+            'EMAIL': email,
+            'LINKEDIN_GITHUB_SECTION': linkedin_github,
+            'CAREER_OBJECTIVE_SECTION': career_objective_section,
+            'EDUCATION_SECTION': education_section,
+            'EXPERIENCE_SECTION': experience_section,
+            'SKILLS_SECTION': skills_section,
         }
         
-        # Apply replacements
-        for placeholder, value in replacements.items():
-            template_content = template_content.replace(placeholder, value)
-        
-        return template_content
+        # Apply replacements in a single pass over the pre-split template
+        return template.render(replacements)
     
-    def generate_two_column_latex_content(self, resume_data, template_id, config, template_content):
+    def generate_two_column_latex_content(self, resume_data, template_id, config, template):
         """Generate two-column LaTeX content from resume data"""
         # Extract data with fallbacks
         first_name = self.escape_latex_text(resume_data.get('first_name', ''))
@@ -343,102 +319,54 @@ class LaTeXCompiler:
         
         # Replace template variables - using same logic as single column
         replacements = {
-            '{{TEMPLATE_CUSTOMIZATIONS}}': config.TEMPLATE_CUSTOMIZATIONS,
-            '{{SECTION_COLOR}}': config.SECTION_COLOR,
-            '{{SECTION_UNDERLINE_COLOR}}': config.SECTION_UNDERLINE_COLOR,
-            '{{NAME_STYLE}}': config.NAME_STYLE,
-            '{{FULL_NAME}}': full_name,
-            '{{PHONE}}': phone,
-            '{{EMAIL}}': email,
-            '{{LINKEDIN_GITHUB_SECTION}}': linkedin_github,
-            '{{CAREER_OBJECTIVE_SECTION}}': career_objective_section,
-            '{{EDUCATION_SECTION}}': education_section,
-            '{{EXPERIENCE_SECTION}}': experience_section,
-            '{{SKILLS_SECTION}}': skills_section,
+            'TEMPLATE_CUSTOMIZATIONS': config.TEMPLATE_CUSTOMIZATIONS,
+            'SECTION_COLOR': config.SECTION_COLOR,
+            'SECTION_UNDERLINE_COLOR': config.SECTION_UNDERLINE_COLOR,
+            'NAME_STYLE': config.NAME_STYLE,
+            'FULL_NAME': full_name,
+            'PHONE': phone,
+            'EMAIL': email,
+            'LINKEDIN_GITHUB_SECTION': linkedin_github,
+            'CAREER_OBJECTIVE_SECTION': career_objective_section,
+            'EDUCATION_SECTION': education_section,
+            'EXPERIENCE_SECTION': experience_section,
+            'SKILLS_SECTION': skills_section,
         }
         
-        # Apply replacements
-        for placeholder, value in replacements.items():
-            template_content = template_content.replace(placeholder, value)
-        
-        return template_content
+        # Apply replacements in a single pass over the pre-split template
+        return template.render(replacements)
+
+    def submit_pdf(self, latex_content, template_id="default"):
+        """
+        Start compiling LaTeX content to PDF on the bounded compile pool and return
+        a future; a cached PDF for identical source comes back already completed.
+        """
+        # Choose compiler based on template type
+        is_two_col = self.is_two_column_template(template_id)
+        primary_compiler = 'xelatex' if is_two_col else 'pdflatex'
+        fallback_compiler = 'pdflatex'
+        
+        # List of compilers to try in order
+        compilers_to_try = [primary_compiler]
+        if primary_compiler != fallback_compiler:
+            compilers_to_try.append(fallback_compiler)
+        
+        cache = get_pdf_cache()
+        cache_key = cache.make_key(latex_content, compilers_to_try)
+        pdf_data = cache.get(cache_key)
+        if pdf_data is not None:
+            future = Future()
+            future.set_result(pdf_data)
+            return future
+        
+        # Runs on the bounded compile pool with preloaded formats
+        future = get_compile_service().submit(latex_content, compilers_to_try)
+        future.add_done_callback(lambda f: f.exception() is None and cache.put(cache_key, f.result()))
+        return future
 
     def compile_pdf(self, latex_content, template_id="default"):
-        """Compile LaTeX content to PDF"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Write LaTeX content to file
-            tex_file = temp_path / "resume.tex"
-            with open(tex_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            
-            # Choose compiler based on template type
-            is_two_col = self.is_two_column_template(template_id)
-            primary_compiler = 'xelatex' if is_two_col else 'pdflatex'
-            fallback_compiler = 'pdflatex'
-            
-            # List of compilers to try in order
-            compilers_to_try = [primary_compiler]
-            if primary_compiler != fallback_compiler:
-                compilers_to_try.append(fallback_compiler)
-            
-            last_error = None
-            
-            for compiler in compilers_to_try:
-                try:
-                    print(f"Attempting compilation with {compiler}...")
-                    
-                    # Check if compiler exists
-                    compiler_check = subprocess.run(['which', compiler], capture_output=True, text=True)
-                    if compiler_check.returncode != 0:
-                        print(f"{compiler} not found, skipping...")
-                        continue
-                    
-                    # Compile LaTeX to PDF
-                    result = subprocess.run([
-                        compiler, 
-                        '-output-directory', str(temp_path),
-                        '-interaction=nonstopmode',
-                        str(tex_file)
-                    ], capture_output=True, text=True, cwd=temp_dir)
-                    
-                    if result.returncode == 0:
-                        # Check if PDF was generated
-                        pdf_file = temp_path / "resume.pdf"
-                        if pdf_file.exists():
-                            print(f"✅ Successfully compiled with {compiler}")
-                            with open(pdf_file, 'rb') as f:
-                                pdf_data = f.read()
-                            return pdf_data
-                        else:
-                            print(f"❌ {compiler} completed but no PDF generated")
-                    else:
-                        print(f"❌ {compiler} compilation failed with return code {result.returncode}")
-                        
-                        # Read LaTeX log for debugging
-                        log_file = temp_path / "resume.log"
-                        log_content = ""
-                        if log_file.exists():
-                            with open(log_file, 'r') as f:
-                                log_content = f.read()
-                        
-                        last_error = f"LaTeX compilation failed with {compiler}.\nSTDERR: {result.stderr}\nSTDOUT: {result.stdout}\nLog excerpt: {log_content[-1000:] if log_content else 'No log available'}"
-                        
-                except FileNotFoundError:
-                    last_error = f"{compiler} not found on system"
-                    print(f"❌ {last_error}")
-                    continue
-                except Exception as e:
-                    last_error = f"Unexpected error with {compiler}: {str(e)}"
-                    print(f"❌ {last_error}")
-                    continue
-            
-            # If we get here, all compilers failed
-            if last_error:
-                raise Exception(f"All LaTeX compilation attempts failed. Last error: {last_error}\n\nGenerated LaTeX content:\n{latex_content[:2000]}...")
-            else:
-                raise Exception("No suitable LaTeX compiler found. Please install pdflatex or xelatex.")
+        """Compile LaTeX content to PDF, reusing a cached PDF for identical source"""
+        return self.submit_pdf(latex_content, template_id).result()
     
     def generate_resume_pdf(self, resume_data, template_id="default"):
         """Main method to generate PDF from resume data"""
@@ -451,6 +379,8 @@ class LaTeXCompiler:
             
             return pdf_data
             
+        except CompileQueueFullError:
+            raise
         except Exception as e:
             raise Exception(f"Resume generation failed: {str(e)}")
     
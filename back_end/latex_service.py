@@ -0,0 +1,232 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+LATEX_WORKERS = int(os.getenv("LATEX_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+LATEX_QUEUE_LIMIT = int(os.getenv("LATEX_QUEUE_LIMIT", "32"))
+LATEX_TIMEOUT = int(os.getenv("LATEX_TIMEOUT", "60"))
+LATEX_FORMAT_DIR = os.getenv("LATEX_FORMAT_DIR", os.path.join(tempfile.gettempdir(), "fiveguys_latex_formats"))
+LATEX_PRECOMPILE_FORMATS = os.getenv("LATEX_PRECOMPILE_FORMATS", "true").lower() != "false"
+
+BEGIN_DOCUMENT = "\\begin{document}"
+
+
+class CompileQueueFullError(Exception):
+    """Raised when too many compiles are already queued or running."""
+    pass
+
+
+class LaTeXCompileService:
+    """
+    Bounded pool of LaTeX compile workers.
+
+    Compiler paths are resolved once. Each distinct preamble (one per template)
+    is dumped into a precompiled format file with mylatexformat the first time
+    it is seen, so later compiles skip loading every package. Preambles that
+    cannot be dumped, e.g. xelatex with system fonts, fall back to a normal
+    compile. At most `workers` compiles run at once, at most `queue_limit` wait,
+    and every compiler run is killed after `timeout` seconds.
+    """
+
+    def __init__(self, workers: int = LATEX_WORKERS, queue_limit: int = LATEX_QUEUE_LIMIT,
+                 timeout: int = LATEX_TIMEOUT, format_dir: str = LATEX_FORMAT_DIR,
+                 use_formats: bool = LATEX_PRECOMPILE_FORMATS):
+        self.timeout = timeout
+        self.format_dir = Path(format_dir)
+        self.use_formats = use_formats
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latex")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._paths = {}
+        self._formats = {}  # format name -> True (built) / False (unusable)
+        self._format_locks = {}
+        self._lock = threading.Lock()
+
+    def compiler_path(self, compiler: str):
+        """Absolute path of a compiler (or other TeX tool) binary, or None if not installed (resolved once)."""
+        with self._lock:
+            if compiler not in self._paths:
+                self._paths[compiler] = shutil.which(compiler)
+            return self._paths[compiler]
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise CompileQueueFullError("Too many resume compiles in progress, please retry shortly")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def submit(self, latex_content: str, compilers: list) -> Future:
+        """Queue a compile on the pool and return its future; raises CompileQueueFullError if the queue is full."""
+        return self._submit(self._compile, latex_content, compilers)
+
+    def compile(self, latex_content: str, compilers: list) -> bytes:
+        """Compile on a pool worker, trying compilers in order; raises on failure or a full queue."""
+        return self.submit(latex_content, compilers).result()
+
+    # ── precompiled formats ───────────────────────────────────
+
+    def _format_name(self, compiler: str, latex_content: str):
+        if not self.use_formats or BEGIN_DOCUMENT not in latex_content:
+            return None
+        preamble = latex_content.split(BEGIN_DOCUMENT, 1)[0]
+        digest = hashlib.sha256(f"{compiler}\0{preamble}".encode("utf-8")).hexdigest()[:24]
+        return f"{compiler}-{digest}"
+
+    def _ensure_format(self, compiler: str, path: str, latex_content: str):
+        """Name of a dumped format for this document's preamble, building it if needed; None if unusable."""
+        name = self._format_name(compiler, latex_content)
+        if name is None:
+            return None
+
+        with self._lock:
+            state = self._formats.get(name)
+            if state is None and (self.format_dir / f"{name}.fmt").exists():
+                state = self._formats[name] = True
+            if state is not None:
+                return name if state else None
+            build_lock = self._format_locks.setdefault(name, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                if name in self._formats:
+                    return name if self._formats[name] else None
+            built = self._build_format(compiler, path, name, latex_content)
+            with self._lock:
+                self._formats[name] = built
+            return name if built else None
+
+    def _build_format(self, compiler: str, path: str, name: str, latex_content: str) -> bool:
+        self.format_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tex_file = Path(temp_dir) / f"{name}.tex"
+            tex_file.write_text(latex_content, encoding="utf-8")
+            try:
+                result = subprocess.run([
+                    path, '-ini', f'-jobname={name}', '-interaction=nonstopmode',
+                    f'&{compiler}', 'mylatexformat.ltx', str(tex_file)
+                ], capture_output=True, text=True, cwd=temp_dir, timeout=self.timeout)
+            except (subprocess.TimeoutExpired, OSError) as e:
+                print(f"Format dump for {name} failed: {e}")
+                return False
+
+            fmt_file = Path(temp_dir) / f"{name}.fmt"
+            if result.returncode != 0 or not fmt_file.exists():
+                print(f"Format dump for {name} failed, compiling without it")
+                return False
+            # Move into place atomically so concurrent processes never see a partial file
+            staged = self.format_dir / f"{name}.fmt.{os.getpid()}"
+            shutil.move(str(fmt_file), staged)
+            os.replace(staged, self.format_dir / f"{name}.fmt")
+        print(f"Built LaTeX format {name}")
+        return True
+
+    def _forget_format(self, name: str):
+        with self._lock:
+            self._formats[name] = False
+
+    # ── compiling ─────────────────────────────────────────────
+
+    def _run(self, path: str, temp_dir: str, tex_file: Path, fmt: str = None):
+        args = [path]
+        env = None
+        if fmt:
+            args.append(f'-fmt={fmt}')
+            # Trailing separator keeps the default format search path after ours
+            env = {**os.environ, "TEXFORMATS": f"{self.format_dir}{os.pathsep}"}
+        args += ['-output-directory', temp_dir, '-interaction=nonstopmode', str(tex_file)]
+        return subprocess.run(args, capture_output=True, text=True, cwd=temp_dir, env=env,
+                              timeout=self.timeout)
+
+    def _compile(self, latex_content: str, compilers: list) -> bytes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            tex_file = temp_path / "resume.tex"
+            tex_file.write_text(latex_content, encoding="utf-8")
+            pdf_file = temp_path / "resume.pdf"
+
+            last_error = None
+            for compiler in compilers:
+                path = self.compiler_path(compiler)
+                if not path:
+                    print(f"{compiler} not found, skipping...")
+                    continue
+
+                try:
+                    fmt = self._ensure_format(compiler, path, latex_content)
+                    result = self._run(path, temp_dir, tex_file, fmt)
+                    if fmt and (result.returncode != 0 or not pdf_file.exists()):
+                        # The dumped preamble does not work for this document; stop using it
+                        print(f"Compiling with format {fmt} failed, retrying without it")
+                        self._forget_format(fmt)
+                        result = self._run(path, temp_dir, tex_file)
+                except subprocess.TimeoutExpired:
+                    last_error = f"{compiler} timed out after {self.timeout}s"
+                    print(f"❌ {last_error}")
+                    continue
+                except Exception as e:
+                    last_error = f"Unexpected error with {compiler}: {str(e)}"
+                    print(f"❌ {last_error}")
+                    continue
+
+                if result.returncode == 0 and pdf_file.exists():
+                    print(f"✅ Successfully compiled with {compiler}")
+                    return pdf_file.read_bytes()
+
+                if result.returncode == 0:
+                    print(f"❌ {compiler} completed but no PDF generated")
+                    continue
+
+                print(f"❌ {compiler} compilation failed with return code {result.returncode}")
+                # Read LaTeX log for debugging
+                log_file = temp_path / "resume.log"
+                log_content = log_file.read_text(errors="replace") if log_file.exists() else ""
+                last_error = f"LaTeX compilation failed with {compiler}.\nSTDERR: {result.stderr}\nSTDOUT: {result.stdout}\nLog excerpt: {log_content[-1000:] if log_content else 'No log available'}"
+
+            # If we get here, all compilers failed
+            if last_error:
+                raise Exception(f"All LaTeX compilation attempts failed. Last error: {last_error}\n\nGenerated LaTeX content:\n{latex_content[:2000]}...")
+            raise Exception("No suitable LaTeX compiler found. Please install pdflatex or xelatex.")
+
+    def render_thumbnail(self, pdf_data: bytes, dpi: int = 40):
+        """PNG of the first page via pdftoppm on a pool worker, or None when poppler is not installed."""
+        path = self.compiler_path("pdftoppm")
+        if not path:
+            return None
+        return self._submit(self._render_thumbnail, path, pdf_data, dpi).result()
+
+    def _render_thumbnail(self, path: str, pdf_data: bytes, dpi: int):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_file = Path(temp_dir) / "page.pdf"
+            pdf_file.write_bytes(pdf_data)
+            try:
+                subprocess.run([
+                    path, '-png', '-f', '1', '-l', '1', '-r', str(dpi), '-singlefile',
+                    str(pdf_file), str(Path(temp_dir) / "page")
+                ], capture_output=True, check=True, timeout=self.timeout)
+            except (subprocess.SubprocessError, OSError) as e:
+                print(f"Thumbnail rendering failed: {e}")
+                return None
+            png_file = Path(temp_dir) / "page.png"
+            return png_file.read_bytes() if png_file.exists() else None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_compile_service() -> LaTeXCompileService:
+    """Process-wide compile service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = LaTeXCompileService()
+        return _service
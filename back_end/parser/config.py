@@ -5,4 +5,29 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path='.env.local')
 
 # Key name expected in environment
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+# Extraction budgets for PDF uploads (0 disables the limit)
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '10'))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '60000'))
+
+# Extraction worker pool (see parser/extractors/service.py)
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '4'))
+EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', '30'))  # seconds per file
+EXTRACTION_MEMORY_MB = int(os.getenv('EXTRACTION_MEMORY_MB', '1024'))  # address-space cap per worker
+EXTRACTION_JOBS_PER_WORKER = int(os.getenv('EXTRACTION_JOBS_PER_WORKER', '50'))  # recycle after N jobs
+
+# Shared OpenAI HTTP client (see parser.parser.get_openai_client)
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', '20'))
+OPENAI_MAX_KEEPALIVE = int(os.getenv('OPENAI_MAX_KEEPALIVE', '10'))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', '60'))  # seconds
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '120'))  # seconds per request
+OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', '10'))
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '2'))
+
+# Deterministic LLM response cache (see parser/llm_cache.py)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '50000'))  # persisted entries
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', '256'))  # in-process LRU
+LLM_CACHE_STATS_EVERY = int(os.getenv('LLM_CACHE_STATS_EVERY', '100'))  # lookups between hit-rate log lines, 0 = off
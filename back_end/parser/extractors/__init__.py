@@ -1,16 +1,23 @@
-from .base import extract_text, UnsupportedFileTypeError
+from .base import extract_text, extract_bytes, UnsupportedFileTypeError, EXTRACTOR_VERSION
 from .pdf  import extract as extract_pdf
 from .txt  import extract as extract_txt
 from .md   import extract as extract_md
 from .docx import extract as extract_docx
 from .odt  import extract as extract_odt
+from .service import ExtractionService, ExtractionError, ExtractionTimeoutError, get_extraction_service
 
 __all__ = [
     "extract_text",
+    "extract_bytes",
     "UnsupportedFileTypeError",
+    "EXTRACTOR_VERSION",
     "extract_pdf",
     "extract_txt",
     "extract_md",
     "extract_docx",
     "extract_odt",
+    "ExtractionService",
+    "ExtractionError",
+    "ExtractionTimeoutError",
+    "get_extraction_service",
 ]
\ No newline at end of file
@@ -2,11 +2,35 @@ from pathlib import Path
 from typing import Union
 from parser.extractors import pdf, txt, md, docx, odt
 
+# Bump whenever an extractor's output changes so cached extractions are redone.
+EXTRACTOR_VERSION = "2"
+
+
 class UnsupportedFileTypeError(Exception):
     """Raised when an unsupported file extension is encountered."""
     pass
 
 
+EXTRACTORS = {
+    'pdf': pdf.extract,
+    'txt': txt.extract,
+    'md': md.extract,
+    'docx': docx.extract,
+    'odt': odt.extract,
+}
+
+
+def extract_bytes(data: bytes, file_type: str) -> str:
+    """
+    Extract text from in-memory file contents, dispatching on the file type
+    (an extension such as "pdf" or ".docx").
+    """
+    ext = (file_type or '').lower().lstrip('.')
+    if ext not in EXTRACTORS:
+        raise UnsupportedFileTypeError(f"Unsupported file extension: .{ext}")
+    return EXTRACTORS[ext](bytes(data))
+
+
 def extract_text(src: Union[str, Path, bytes]) -> str:
     """
     Dispatch to the appropriate extractor based on file extension.
@@ -14,18 +38,7 @@ def extract_text(src: Union[str, Path, bytes]) -> str:
 
     # raw bytes → try PDF
     if isinstance(src, (bytes, bytearray)):
-        return pdf.extract(src)
+        return pdf.extract(bytes(src))
 
     path = Path(src)
-    data = path.read_bytes()
-    ext = path.suffix.lower().lstrip('.')
-    mapping = {
-        'pdf': pdf.extract,
-        'txt': txt.extract,
-        'md': md.extract,
-        'docx': docx.extract,
-        'odt': odt.extract,
-    }
-    if ext not in mapping:
-        raise UnsupportedFileTypeError(f"Unsupported file extension: .{ext}")
-    return mapping[ext](data if ext in ('pdf', 'txt', 'md') else path)
\ No newline at end of file
+    return extract_bytes(path.read_bytes(), path.suffix)
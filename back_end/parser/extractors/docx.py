@@ -1,7 +1,7 @@
+from io import BytesIO
 import docx2txt
-from pathlib import Path
 
 
-def extract(path: Path) -> str:
-    """Extract text from a DOCX file path."""
-    return docx2txt.process(str(path))
\ No newline at end of file
+def extract(data: bytes) -> str:
+    """Extract text from DOCX bytes."""
+    return docx2txt.process(BytesIO(data))
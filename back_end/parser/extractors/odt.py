@@ -1,10 +1,11 @@
+from io import BytesIO
 from odf.opendocument import load
 from odf import text as odf_text
 from odf import teletype
 
 
-def extract(path):
-    """Extract text from an ODT file path."""
-    doc = load(str(path))
+def extract(data: bytes) -> str:
+    """Extract text from ODT bytes."""
+    doc = load(BytesIO(data))
     paras = [teletype.extractText(n) for n in doc.getElementsByType(odf_text.P)]
-    return "\n".join(paras)
\ No newline at end of file
+    return "\n".join(paras)
@@ -1,16 +1,60 @@
+from contextlib import closing
 from io import BytesIO
+from typing import Iterator, Optional
 import pdfplumber
-import pdfminer.high_level as pdfminer
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
+from parser.config import PDF_MAX_PAGES, PDF_MAX_CHARS
 
 
-def extract(data: bytes) -> str:
-    """Extract text from PDF bytes, trying pdfminer first then pdfplumber."""
+def _plumber_page_text(plumber, index: int) -> str:
+    if index >= len(plumber.pages):
+        return ""
+    return plumber.pages[index].extract_text() or ""
+
+
+def iter_pages(data: bytes, max_pages: Optional[int] = PDF_MAX_PAGES) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, up to max_pages (None or 0 = all).
+
+    Pages are laid out with pdfminer one at a time; a page that comes back empty,
+    or every remaining page if pdfminer fails outright, is re-read with pdfplumber.
+    """
+    plumber = None
+    index = 0
     try:
-        text = pdfminer.extract_text(BytesIO(data))
-        if text and text.strip():
-            return text
-    except Exception:
-        pass
-    with pdfplumber.open(BytesIO(data)) as pdf:
-        pages = [p.extract_text() or "" for p in pdf.pages]
-    return "\n".join(pages)
\ No newline at end of file
+        try:
+            for layout in extract_pages(BytesIO(data), maxpages=max_pages or 0):
+                text = "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+                if not text.strip():
+                    plumber = plumber or pdfplumber.open(BytesIO(data))
+                    text = _plumber_page_text(plumber, index)
+                index += 1
+                yield text
+            return
+        except Exception:
+            pass
+
+        # pdfminer gave up part-way: let pdfplumber finish from the failing page
+        plumber = plumber or pdfplumber.open(BytesIO(data))
+        last = len(plumber.pages) if not max_pages else min(max_pages, len(plumber.pages))
+        for i in range(index, last):
+            yield _plumber_page_text(plumber, i)
+    finally:
+        if plumber is not None:
+            plumber.close()
+
+
+def extract(data: bytes, max_pages: Optional[int] = PDF_MAX_PAGES,
+            max_chars: Optional[int] = PDF_MAX_CHARS) -> str:
+    """Extract text from PDF bytes page by page, stopping at the page or character budget."""
+    pages = []
+    total = 0
+    with closing(iter_pages(data, max_pages)) as page_texts:
+        for text in page_texts:
+            pages.append(text)
+            total += len(text) + 1
+            if max_chars and total >= max_chars:
+                break
+    text = "\n".join(pages)
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,248 @@
+import math
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Union
+from parser.config import (
+    EXTRACTION_WORKERS,
+    EXTRACTION_TIMEOUT,
+    EXTRACTION_MEMORY_MB,
+    EXTRACTION_JOBS_PER_WORKER,
+)
+from parser.extractors import base
+
+try:
+    import resource
+except ImportError:  # rlimits are POSIX-only
+    resource = None
+
+
+class ExtractionError(Exception):
+    """Raised when a worker could not extract text from an upload."""
+    pass
+
+
+class ExtractionTimeoutError(ExtractionError):
+    """Raised when an extraction job exceeds its time budget."""
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise ExtractionTimeoutError("Extraction exceeded its time budget")
+
+
+def _init_worker(memory_mb: int, cpu_seconds: int):
+    """Apply resource limits inside a freshly started worker."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is None:
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        # Cumulative over the worker's lifetime; recycling keeps it bounded
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+
+
+def _run_job(data: bytes, file_type: str, timeout: float) -> str:
+    """Worker-side job: extract with a wall-clock alarm so a stuck job frees its worker."""
+    use_alarm = hasattr(signal, "SIGALRM") and timeout
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.alarm(max(1, math.ceil(timeout)))
+    try:
+        return base.extract_bytes(data, file_type)
+    except MemoryError:
+        raise ExtractionError("Extraction exceeded the worker memory limit")
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+def _worker_main(conn, memory_mb: int, cpu_seconds: int):
+    """Worker process loop: one (data, file_type, timeout) job in, one (ok, text or error) reply out."""
+    _init_worker(memory_mb, cpu_seconds)
+    while True:
+        try:
+            data, file_type, timeout = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, _run_job(data, file_type, timeout))
+        except (base.UnsupportedFileTypeError, ExtractionError) as e:
+            reply = (False, e)
+        except Exception as e:
+            reply = (False, ExtractionError(str(e)))
+        conn.send(reply)
+
+
+def _mp_context():
+    """
+    Workers are never forked from the server process, which runs threads and
+    holds Mongo clients. forkserver forks them from a clean helper process with
+    the extractors preloaded; spawn is the fallback where it is unavailable.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["parser.extractors.service"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    """One extraction process and the pipe it takes jobs from."""
+
+    def __init__(self, ctx, memory_mb: int, cpu_seconds: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_mb, cpu_seconds),
+            name="extraction-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def run(self, data: bytes, file_type: str, timeout: float) -> str:
+        """Run one job; the deadline starts when the job is handed to this process."""
+        self.jobs += 1
+        try:
+            self.conn.send((data, file_type, timeout))
+        except OSError:
+            raise ExtractionError("Extraction worker exited before the job")
+        # Small grace period on top of the worker-side alarm for IPC overhead
+        if not self.conn.poll(timeout + 5 if timeout else None):
+            raise ExtractionTimeoutError("Extraction worker did not respond in time")
+        try:
+            ok, value = self.conn.recv()
+        except (EOFError, OSError):
+            # Killed by its rlimits (SIGXCPU, out of memory) or crashed
+            raise ExtractionError("Extraction worker exited during the job")
+        if not ok:
+            raise value
+        return value
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        self.conn.close()
+        self.process.kill()
+        self.process.join(5)
+
+    def close(self):
+        """Let an idle worker exit on its own (it sees EOF on its pipe)."""
+        self.conn.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class ExtractionJob:
+    """Handle for an extraction submitted to the service."""
+
+    def __init__(self, future):
+        self._future = future
+
+    def get(self) -> str:
+        # The dispatcher enforces the deadline, so this never waits forever
+        return self._future.result()
+
+
+class ExtractionService:
+    """
+    Extraction worker processes with per-job timeouts, memory and CPU rlimits,
+    and worker recycling after a fixed number of jobs. Jobs wait for a free
+    worker in a dispatcher queue; their time budget only starts once a worker
+    picks them up. A pathological upload can only stall or kill its own worker,
+    which is killed and replaced without touching jobs running on the others.
+    """
+
+    def __init__(self, workers: int = EXTRACTION_WORKERS, timeout: float = EXTRACTION_TIMEOUT,
+                 memory_mb: int = EXTRACTION_MEMORY_MB, jobs_per_worker: int = EXTRACTION_JOBS_PER_WORKER):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.jobs_per_worker = jobs_per_worker
+        self.cpu_seconds = math.ceil(timeout * jobs_per_worker) if timeout and jobs_per_worker else 0
+        self._context = _mp_context()
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._local = None
+        self._pid = None
+
+    def _get_dispatcher(self) -> ThreadPoolExecutor:
+        with self._lock:
+            # Dispatcher threads and their workers do not survive fork()
+            if self._dispatcher is None or self._pid != os.getpid():
+                # One dispatcher thread per worker process; each thread owns its worker
+                self._dispatcher = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extraction")
+                self._local = threading.local()
+                self._pid = os.getpid()
+            return self._dispatcher
+
+    def _dispatch(self, local, data: bytes, file_type: str) -> str:
+        """Dispatcher-thread side of a job: run it on this thread's worker, replacing the worker as needed."""
+        worker = getattr(local, "worker", None)
+        if worker is None or not worker.alive():
+            worker = local.worker = _Worker(self._context, self.memory_mb, self.cpu_seconds)
+        try:
+            return worker.run(data, file_type, self.timeout)
+        except ExtractionTimeoutError:
+            # Stuck in C code past its alarm; only this worker is killed
+            local.worker = None
+            worker.kill()
+            raise
+        except ExtractionError:
+            if not worker.alive():
+                local.worker = None
+                worker.kill()
+            raise
+        finally:
+            if local.worker is worker and self.jobs_per_worker and worker.jobs >= self.jobs_per_worker:
+                local.worker = None
+                worker.close()
+
+    def submit(self, data: bytes, file_type: str) -> ExtractionJob:
+        """Queue an extraction and return a handle whose get() yields the text."""
+        dispatcher = self._get_dispatcher()
+        return ExtractionJob(dispatcher.submit(self._dispatch, self._local, bytes(data), file_type))
+
+    def extract_bytes(self, data: bytes, file_type: str) -> str:
+        """Same contract as parser.extractors.extract_bytes, run in a worker."""
+        ext = (file_type or '').lower().lstrip('.')
+        if ext not in base.EXTRACTORS:
+            raise base.UnsupportedFileTypeError(f"Unsupported file extension: .{ext}")
+        return self.submit(data, ext).get()
+
+    def extract_text(self, src: Union[str, Path, bytes]) -> str:
+        """Same contract as parser.extractors.extract_text, run in a worker."""
+        if isinstance(src, (bytes, bytearray)):
+            return self.extract_bytes(src, 'pdf')
+        path = Path(src)
+        return self.extract_bytes(path.read_bytes(), path.suffix)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_extraction_service() -> ExtractionService:
+    """Process-wide extraction service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ExtractionService()
+        return _service
+
+
+def extract_bytes(data: bytes, file_type: str) -> str:
+    return get_extraction_service().extract_bytes(data, file_type)
+
+
+def extract_text(src: Union[str, Path, bytes]) -> str:
+    return get_extraction_service().extract_text(src)
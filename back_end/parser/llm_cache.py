@@ -0,0 +1,179 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from parser.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_STATS_EVERY,
+)
+
+# How many persisted writes between size-bound checks on the Mongo collection
+TRIM_EVERY = 100
+
+
+def normalize_input(payload) -> str:
+    """
+    Canonical form of an LLM input: text with surrounding whitespace and line
+    ending differences removed, or key-sorted JSON. Whitespace inside the text is
+    kept since the model sees it (indentation, blank lines between sections).
+    """
+    if isinstance(payload, str):
+        return payload.strip().replace("\r\n", "\n").replace("\r", "\n")
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class LLMResponseCache:
+    """
+    Cache for deterministic LLM completions keyed by model, prompt version,
+    temperature and a hash of the normalized input. A small in-process LRU sits
+    in front of an optional Mongo collection whose entries expire after a TTL
+    and are trimmed oldest-first past a maximum size.
+    """
+
+    def __init__(self, collection=None, ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, memory_entries: int = LLM_CACHE_MEMORY_ENTRIES):
+        self.collection = collection
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def ensure_indexes(self):
+        """TTL index so Mongo expires entries itself, plus the ordering used by trimming."""
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("created_at")
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, temperature: float, payload) -> str:
+        digest = hashlib.sha256(normalize_input(payload).encode("utf-8")).hexdigest()
+        return f"{model}:{prompt_version}:{temperature}:{digest}"
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, raw: str):
+        with self._lock:
+            self._memory[key] = raw
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """Return a fresh copy of the cached value, or None on a miss."""
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+
+        if raw is None and self.collection is not None:
+            try:
+                doc = self.collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+                    {"value": 1}
+                )
+            except Exception as e:
+                print(f"LLM cache lookup failed: {e}")
+                doc = None
+            if doc:
+                raw = doc["value"]
+                self._remember(key, raw)
+
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            log_stats = LLM_CACHE_STATS_EVERY > 0 and (self.hits + self.misses) % LLM_CACHE_STATS_EVERY == 0
+        if log_stats:
+            print(f"LLM cache stats: {self.stats()}")
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value):
+        # Stored as JSON text so LLM output keys never clash with Mongo field rules
+        raw = json.dumps(value)
+        self._remember(key, raw)
+        if self.collection is None:
+            return
+
+        now = datetime.utcnow()
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                {"$set": {"value": raw, "created_at": now, "expires_at": now + self.ttl}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_trim = self._writes % TRIM_EVERY == 0
+        if should_trim:
+            self._trim()
+
+    def _trim(self):
+        """Evict the oldest persisted entries once the collection exceeds max_entries."""
+        try:
+            excess = self.collection.estimated_document_count() - self.max_entries
+            if excess <= 0:
+                return
+            oldest = self.collection.find({}, {"_id": 1}).sort("created_at", 1).limit(excess)
+            self.collection.delete_many({"_id": {"$in": [d["_id"] for d in oldest]}})
+        except Exception as e:
+            print(f"LLM cache trim failed: {e}")
+
+    def get_or_compute(self, model: str, prompt_version: str, temperature: float, payload, compute):
+        """Return the cached response for this call, running compute() on a miss."""
+        key = self.make_key(model, prompt_version, temperature, payload)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.set(key, value)
+        return value
+
+
+class _DisabledCache(LLMResponseCache):
+    def get_or_compute(self, model, prompt_version, temperature, payload, compute):
+        return compute()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure_llm_cache(collection=None) -> LLMResponseCache:
+    """Install the process-wide cache, optionally persisted to a Mongo collection."""
+    global _cache
+    with _cache_lock:
+        _cache = LLMResponseCache(collection) if LLM_CACHE_ENABLED else _DisabledCache()
+        if collection is not None and LLM_CACHE_ENABLED:
+            try:
+                _cache.ensure_indexes()
+            except Exception as e:
+                print(f"LLM cache index setup failed: {e}")
+        return _cache
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache; memory-only until configure_llm_cache() is called."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache() if LLM_CACHE_ENABLED else _DisabledCache()
+        return _cache
@@ -1,20 +1,80 @@
 import json
-from openai import OpenAI
-from parser.config import OPENAI_API_KEY
+import os
+import threading
+import httpx
+from openai import OpenAI, DefaultHttpxClient
+from parser.config import (
+    OPENAI_API_KEY,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE,
+    OPENAI_KEEPALIVE_EXPIRY,
+    OPENAI_TIMEOUT,
+    OPENAI_CONNECT_TIMEOUT,
+    OPENAI_MAX_RETRIES,
+)
+from parser.llm_cache import get_llm_cache
+
+_clients = {}
+_clients_lock = threading.Lock()
+_clients_pid = os.getpid()
+
+
+def get_openai_client(api_key: str = None) -> OpenAI:
+    """
+    Return the process-wide OpenAI client for this key, creating it on first use.
+    All parsers share its keep-alive connection pool, so requests skip the TLS handshake.
+    """
+    global _clients_pid
+    key = api_key or OPENAI_API_KEY
+    if not key:
+        raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
+
+    with _clients_lock:
+        if _clients_pid != os.getpid():
+            # Pooled sockets inherited across fork() belong to the parent; start fresh
+            _clients.clear()
+            _clients_pid = os.getpid()
+
+        client = _clients.get(key)
+        if client is None:
+            http_client = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+                    keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+            )
+            client = OpenAI(
+                api_key=key,
+                http_client=http_client,
+                timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+                max_retries=OPENAI_MAX_RETRIES,
+            )
+            _clients[key] = client
+        return client
+
 
 class ResumeParser:
     """
     Wrap OpenAI chat API to parse resume text into structured JSON.
     """
+    MODEL = "gpt-4o-mini"
+    TEMPERATURE = 0.0
+    PROMPT_VERSION = "1"  # bump whenever the prompt changes to invalidate cached responses
+
     def __init__(self, api_key: str = None):
-        key = api_key or OPENAI_API_KEY
-        if not key:
-            raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
-        self.client = OpenAI(api_key=key)
+        self.client = get_openai_client(api_key)
 
     def parse(self, text: str) -> dict:
+        return get_llm_cache().get_or_compute(
+            self.MODEL, self.PROMPT_VERSION, self.TEMPERATURE, text,
+            lambda: self._parse(text)
+        )
+
+    def _parse(self, text: str) -> dict:
         resp = self.client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=self.MODEL,
             response_format={"type": "json_object"},
             messages=[
                 {
@@ -52,7 +112,7 @@ class ResumeParser:
                 },
                 {"role": "user", "content": text},
             ],
-            temperature=0.0,
+            temperature=self.TEMPERATURE,
         )
         return json.loads(resp.choices[0].message.content)
     
@@ -60,15 +120,22 @@ class JobAdParser:
     """
     Wrap OpenAI chat API to parse job ad text into structured JSON.
     """
+    MODEL = "gpt-4o-mini"
+    TEMPERATURE = 0.0
+    PROMPT_VERSION = "1"  # bump whenever the prompt changes to invalidate cached responses
+
     def __init__(self, api_key: str = None):
-        key = api_key or OPENAI_API_KEY
-        if not key:
-            raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
-        self.client = OpenAI(api_key=key)
+        self.client = get_openai_client(api_key)
 
     def parse(self, text: str) -> dict:
+        return get_llm_cache().get_or_compute(
+            self.MODEL, self.PROMPT_VERSION, self.TEMPERATURE, text,
+            lambda: self._parse(text)
+        )
+
+    def _parse(self, text: str) -> dict:
         resp = self.client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=self.MODEL,
             response_format={"type": "json_object"},
             messages=[
                 {
@@ -97,7 +164,7 @@ class JobAdParser:
                 },
                 {"role": "user", "content": text},
             ],
-            temperature=0.0,
+            temperature=self.TEMPERATURE,
         )
         return json.loads(resp.choices[0].message.content)
 
@@ -107,10 +174,7 @@ class ResumeTailoringParser:
     Only handles tailoring - scoring and advice are handled by separate classes.
     """
     def __init__(self, api_key: str = None):
-        key = api_key or OPENAI_API_KEY
-        if not key:
-            raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
-        self.client = OpenAI(api_key=key)
+        self.client = get_openai_client(api_key)
 
     def tailor_resume(self, resume_data: dict, job_ad_data: dict) -> dict:
         """
@@ -170,15 +234,17 @@ class ResumeScorer:
     """
     Deterministic resume scoring system that evaluates resume-job match.
     """
+    MODEL = "gpt-4o-mini"
+    TEMPERATURE = 0.1
+    PROMPT_VERSION = "1"  # bump whenever the rubric changes to invalidate cached scores
+
     def __init__(self, api_key: str = None):
-        key = api_key or OPENAI_API_KEY
-        if not key:
-            raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
-        self.client = OpenAI(api_key=key)
+        self.client = get_openai_client(api_key)
 
     def score_resume(self, resume_data: dict, job_ad_data: dict) -> dict:
         """
         Score a resume against a job ad using deterministic criteria.
+        Identical resume/job pairs are served from the LLM response cache.
         
         Args:
             resume_data: Parsed resume data
@@ -187,11 +253,18 @@ class ResumeScorer:
         Returns:
             Dict with overall score, category scores, strengths, and gaps
         """
+        return get_llm_cache().get_or_compute(
+            self.MODEL, self.PROMPT_VERSION, self.TEMPERATURE,
+            {"resume": resume_data, "job_ad": job_ad_data},
+            lambda: self._score_resume(resume_data, job_ad_data)
+        )
+
+    def _score_resume(self, resume_data: dict, job_ad_data: dict) -> dict:
         resume_json = json.dumps(resume_data, indent=2)
         job_ad_json = json.dumps(job_ad_data, indent=2)
         
         resp = self.client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=self.MODEL,
             response_format={"type": "json_object"},
             messages=[
                 {
@@ -278,7 +351,7 @@ class ResumeScorer:
                     "content": f"Score this resume against this job ad:\n\nRESUME:\n{resume_json}\n\nJOB AD:\n{job_ad_json}"
                 }
             ],
-            temperature=0.1,
+            temperature=self.TEMPERATURE,
         )
         
         # Parse the response and fix the math
@@ -304,10 +377,7 @@ class ResumeAdviceGenerator:
     Generate tailored advice for improving resume-job match.
     """
     def __init__(self, api_key: str = None):
-        key = api_key or OPENAI_API_KEY
-        if not key:
-            raise ValueError("OpenAI API key must be set in OPENAI_API_KEY")
-        self.client = OpenAI(api_key=key)
+        self.client = get_openai_client(api_key)
 
     def generate_advice(self, resume_data: dict, job_ad_data: dict, score_data: dict = None) -> dict:
         """
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+PDF_CACHE_ENABLED = os.getenv("PDF_CACHE_ENABLED", "true").lower() != "false"
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "fiveguys_pdf_cache"))
+PDF_CACHE_MAX_MB = int(os.getenv("PDF_CACHE_MAX_MB", "256"))
+PDF_CACHE_STATS_EVERY = int(os.getenv("PDF_CACHE_STATS_EVERY", "100"))  # lookups between hit-rate log lines, 0 = off
+
+
+class PDFRenderCache:
+    """
+    On-disk cache of compiled resume PDFs keyed by a hash of the LaTeX source
+    and the compilers used. Hits refresh the file's mtime, and the least
+    recently used files are evicted once the directory exceeds max_bytes.
+    The same store holds other rendered artifacts under a different suffix.
+    """
+
+    def __init__(self, directory: str = PDF_CACHE_DIR, max_bytes: int = PDF_CACHE_MAX_MB * 1024 * 1024,
+                 suffix: str = ".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(suffix))
+
+    @staticmethod
+    def make_key(latex_content: str, compilers) -> str:
+        digest = hashlib.sha256()
+        digest.update("\0".join(compilers).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(latex_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "size_bytes": self._size,
+        }
+
+    def get(self, key: str):
+        """Return the cached PDF bytes, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            log_stats = PDF_CACHE_STATS_EVERY > 0 and (self.hits + self.misses) % PDF_CACHE_STATS_EVERY == 0
+        if log_stats:
+            print(f"PDF cache stats ({self.directory}): {self.stats()}")
+        return data
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            existed = os.path.exists(path)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"PDF cache write failed: {e}")
+            return
+
+        with self._lock:
+            if not existed:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used files until the cache is back under 90% of max_bytes."""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+            size = sum(e[1] for e in entries)
+            target = self.max_bytes * 0.9
+            for _, file_size, path in sorted(entries):
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                    size -= file_size
+                except OSError:
+                    pass
+            self._size = size
+
+
+class _DisabledCache(PDFRenderCache):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+
+    def get(self, key):
+        return None
+
+    def put(self, key, data):
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PDFRenderCache:
+    """Process-wide PDF cache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = PDFRenderCache() if PDF_CACHE_ENABLED else _DisabledCache()
+            except OSError as e:
+                print(f"PDF cache unavailable: {e}")
+                _cache = _DisabledCache()
+        return _cache
+
+
+_thumbnail_cache = None
+
+
+def get_thumbnail_cache() -> PDFRenderCache:
+    """Process-wide cache of page-1 PNG thumbnails keyed by PDF hash and resolution."""
+    global _thumbnail_cache
+    with _cache_lock:
+        if _thumbnail_cache is None:
+            try:
+                _thumbnail_cache = (PDFRenderCache(os.path.join(PDF_CACHE_DIR, "thumbnails"),
+                                                   max_bytes=PDF_CACHE_MAX_MB * 1024 * 1024 // 4, suffix=".png")
+                                    if PDF_CACHE_ENABLED else _DisabledCache())
+            except OSError as e:
+                print(f"Thumbnail cache unavailable: {e}")
+                _thumbnail_cache = _DisabledCache()
+        return _thumbnail_cache
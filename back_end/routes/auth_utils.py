@@ -1,6 +1,67 @@
 from functools import wraps
 from flask import request, jsonify
+from collections import OrderedDict
 from firebase_admin import auth
+import hashlib
+import os
+import threading
+import time
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """
+    LRU of decoded ID tokens keyed by the token's SHA-256, each entry valid until
+    the token's own exp claim. Verification does not check revocation, so a
+    cached result is exactly as trustworthy as re-verifying the signature.
+    """
+
+    def __init__(self, max_entries: int = AUTH_TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(id_token: str) -> str:
+        return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+    def get(self, id_token: str):
+        key = self._key(id_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            decoded, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return decoded
+
+    def put(self, id_token: str, decoded: dict):
+        expires_at = decoded.get("exp")
+        if not expires_at or self.max_entries <= 0:
+            return
+        key = self._key(id_token)
+        with self._lock:
+            self._entries[key] = (decoded, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_token_cache = VerifiedTokenCache()
+
+
+def verify_token(id_token: str) -> dict:
+    """Decoded claims of a Firebase ID token, verified once and then served from cache until exp."""
+    decoded = _token_cache.get(id_token)
+    if decoded is None:
+        decoded = auth.verify_id_token(id_token)
+        _token_cache.put(id_token, decoded)
+    return decoded
+
 
 def require_firebase_auth(f):
     @wraps(f)
@@ -11,9 +72,9 @@ def require_firebase_auth(f):
         if id_token.startswith("Bearer "):
             id_token = id_token.split(" ", 1)[1]
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = verify_token(id_token)
             request.user_id = decoded_token["uid"]
         except Exception:
             return jsonify({"error": "Invalid or expired token"}), 401
         return f(*args, **kwargs)
-    return decorated
\ No newline at end of file
+    return decorated
@@ -1,11 +1,68 @@
 from flask import Blueprint, jsonify, request
 from .auth_utils import require_firebase_auth
+from .format import formatted_pdf_url
+from .field_utils import requested_fields, sparse_projection, sparse_payload, UnknownFieldError
+from .pagination_utils import fetch_page, paged_response, InvalidCursorError, PAGE_SIZE_MAX
 from db import completed_resumes_collection
 from bson import ObjectId
 from parser.parser import ResumeAdviceGenerator
 
 completed_resumes_bp = Blueprint("completed_resumes", __name__)
 
+# Whether a document still holds an old base64 data: URL PDF, without loading it
+HAS_LEGACY_PDF = {"$eq": [{"$substrCP": [{"$ifNull": ["$formatted_pdf_url", ""]}, 0, 5]}, "data:"]}
+
+# Fields of the applications list; legacy data: URL PDFs are left to the detail view
+# and `python blob_store.py --migrate`
+LIST_PROJECTION = {
+    "job_title": 1,
+    "company": 1,
+    "created_at": 1,
+    "applied_at": 1,
+    "source_resume_ids": 1,
+    "source_resume_names": 1,
+    "job_ad_id": 1,
+    "job_ad_data.job_title": 1,
+    "job_ad_data.company": 1,
+    "formatted_pdf_ref": 1,
+}
+
+# Fields of the single application view
+DETAIL_PROJECTION = {
+    "job_title": 1,
+    "company": 1,
+    "created_at": 1,
+    "tailored_resume": 1,
+    "score_data": 1,
+    "source_resume_ids": 1,
+    "source_resume_names": 1,
+    "job_ad_data": 1,
+    "status": 1,
+    "applied_at": 1,
+    "formatted_pdf_ref": 1,
+    "has_legacy_pdf": HAS_LEGACY_PDF,
+}
+# Response keys built from document paths other than their own name
+DETAIL_FIELD_PATHS = {
+    "score": ["tailored_resume.score"],
+    "formatted_pdf_url": ["formatted_pdf_ref", "has_legacy_pdf"],
+}
+DETAIL_FIELDS = (set(DETAIL_PROJECTION) - {"has_legacy_pdf"}) | set(DETAIL_FIELD_PATHS)
+
+
+def _pdf_url(doc: dict):
+    """
+    Download URL of a single completed resume's PDF. Reads never write: a legacy
+    data: URL is returned as stored until `python blob_store.py --migrate` moves
+    it to the blob store or the resume is formatted again.
+    """
+    if doc.get("formatted_pdf_ref"):
+        return formatted_pdf_url(doc["formatted_pdf_ref"])
+    if doc.get("has_legacy_pdf"):
+        legacy = completed_resumes_collection.find_one({"_id": doc["_id"]}, {"formatted_pdf_url": 1})
+        return legacy.get("formatted_pdf_url") if legacy else None
+    return None
+
 @completed_resumes_bp.route("/completed_resumes/<completed_resume_id>", methods=["GET"])
 @require_firebase_auth
 def get_completed_resume(completed_resume_id):
@@ -16,10 +73,15 @@ def get_completed_resume(completed_resume_id):
         if not ObjectId.is_valid(completed_resume_id):
             return jsonify({"error": "Invalid completed resume ID"}), 400
         
+        try:
+            fields = requested_fields(DETAIL_FIELDS)
+        except UnknownFieldError as e:
+            return jsonify({"error": str(e)}), 400
+
         doc = completed_resumes_collection.find_one({
             "_id": ObjectId(completed_resume_id),
             "user_id": request.user_id
-        })
+        }, sparse_projection(fields, DETAIL_PROJECTION, DETAIL_FIELD_PATHS))
         
         if not doc:
             return jsonify({"error": "Completed resume not found"}), 404
@@ -28,21 +90,26 @@ def get_completed_resume(completed_resume_id):
         score = tailored_resume.get("score")
         score_data = doc.get("score_data", {})
         
-        return jsonify({
+        payload = {
             "_id": str(doc["_id"]),
-            "job_title": doc["job_title"],
-            "company": doc["company"],
-            "created_at": doc["created_at"].isoformat(),
+            "job_title": doc.get("job_title"),
+            "company": doc.get("company"),
+            "created_at": doc["created_at"].isoformat() if doc.get("created_at") else None,
             "tailored_resume": tailored_resume,
             "score": score,
             "score_data": score_data,  # Include detailed score data
             "source_resume_ids": doc.get("source_resume_ids", []),
             "source_resume_names": doc.get("source_resume_names", []),
-            "job_ad_data": doc["job_ad_data"],
+            "job_ad_data": doc.get("job_ad_data"),
             "status": doc.get("status"),
             "applied_at": doc.get("applied_at").isoformat() if doc.get("applied_at") else None,
-            "formatted_pdf_url": doc.get("formatted_pdf_url")
-        }), 200
+            "formatted_pdf_ref": doc.get("formatted_pdf_ref"),
+        }
+        # Resolving the URL may migrate a legacy PDF, so only do it when asked for
+        if fields is None or "formatted_pdf_url" in {f.split(".", 1)[0] for f in fields}:
+            payload["formatted_pdf_url"] = _pdf_url(doc)
+        
+        return jsonify(sparse_payload(payload, fields)), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -59,7 +126,7 @@ def get_resume_advice(completed_resume_id):
     doc = completed_resumes_collection.find_one({
         "_id": ObjectId(completed_resume_id),
         "user_id": request.user_id
-    })
+    }, {"tailored_resume": 1, "job_ad_data": 1, "score_data": 1})
 
     if not doc:
         return jsonify({"error": "Completed resume not found"}), 404
@@ -77,15 +144,20 @@ def get_resume_advice(completed_resume_id):
 @require_firebase_auth
 def get_all_completed_resumes():
     """
-    Get all completed resumes (job applications) for the authenticated user.
+    Get the completed resumes (job applications) of the authenticated user, newest
+    application first, one page per ?cursor=.
     Returns resumes that have been marked as "applied" (user pressed Continue/Quick Format).
     """
     try:
-        # Get completed resumes that are marked as applied
-        docs = completed_resumes_collection.find({
-            "user_id": request.user_id,
-            "status": "applied"  # Only show ones marked as applied
-        }).sort("applied_at", -1)  # Sort by newest application first
+        docs, next_cursor = fetch_page(
+            completed_resumes_collection,
+            {
+                "user_id": request.user_id,
+                "status": "applied"  # Only show ones marked as applied
+            },
+            LIST_PROJECTION,
+            "applied_at",
+        )
         
         results = []
         for doc in docs:
@@ -97,7 +169,8 @@ def get_all_completed_resumes():
                 "applied_at": doc.get("applied_at", doc["created_at"]).isoformat(),
                 "source_resume_ids": doc.get("source_resume_ids", []),
                 "source_resume_names": doc.get("source_resume_names", []),
-                "formatted_pdf_url": doc.get("formatted_pdf_url"),
+                "formatted_pdf_ref": doc.get("formatted_pdf_ref"),
+                "formatted_pdf_url": formatted_pdf_url(doc["formatted_pdf_ref"]) if doc.get("formatted_pdf_ref") else None,
                 "job_ad_id": doc.get("job_ad_id"),  # Include job_ad_id for applied job tracking
                 # Include limited job_ad_data for overview
                 "job_ad_data": {
@@ -106,11 +179,32 @@ def get_all_completed_resumes():
                 }
             })
         
-        return jsonify(results), 200
+        return paged_response(results, next_cursor)
         
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@completed_resumes_bp.route("/completed_resumes/applied_job_ads", methods=["GET"])
+@require_firebase_auth
+def get_applied_job_ads():
+    """
+    Which of the job ads in ?job_ad_ids= (comma separated, one page's worth) the
+    user has applied to, so the job ads list can badge a page without loading
+    every application.
+    """
+    job_ad_ids = [i for i in request.args.get("job_ad_ids", "").split(",") if i]
+    if len(job_ad_ids) > PAGE_SIZE_MAX:
+        return jsonify({"error": f"At most {PAGE_SIZE_MAX} job_ad_ids per request"}), 400
+
+    applied = completed_resumes_collection.distinct("job_ad_id", {
+        "user_id": request.user_id,
+        "status": "applied",
+        "job_ad_id": {"$in": job_ad_ids},
+    }) if job_ad_ids else []
+    return jsonify({"job_ad_ids": applied}), 200
+
 @completed_resumes_bp.route("/completed_resumes/<completed_resume_id>/apply", methods=["POST"])
 @require_firebase_auth
 def mark_resume_as_applied(completed_resume_id):
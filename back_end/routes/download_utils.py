@@ -0,0 +1,36 @@
+from flask import request, Response
+from werkzeug.wsgi import wrap_file
+
+
+def not_modified(etag: str):
+    """304 for a conditional GET whose If-None-Match already names this ETag, else None."""
+    if etag and request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def stream_file(fh, size: int, content_type: str, etag: str = None, immutable: bool = False,
+                filename: str = None, attachment: bool = False):
+    """
+    Stream a seekable file object with its length, ETag and Range support.
+    Range requests are answered with 206 by seeking instead of reading it all.
+    """
+    response = Response(wrap_file(request.environ, fh), content_type=content_type, direct_passthrough=True)
+    response.content_length = size
+    disposition = "attachment" if attachment else "inline"
+    if filename:
+        response.headers.set("Content-Disposition", disposition, filename=filename)
+    else:
+        response.headers["Content-Disposition"] = disposition
+    response.cache_control.private = True
+    if immutable:
+        # Content-addressed URL: the bytes behind it can never change
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    if etag:
+        response.set_etag(etag)
+    return response.make_conditional(request, accept_ranges=True, complete_length=size)
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import datetime
+from db import extracted_texts_collection
+from blob_store import load_upload_bytes
+from parser.extractors import EXTRACTOR_VERSION, get_extraction_service
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest used to content-address stored uploads."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_key(sha256: str, file_type: str) -> str:
+    return f"{sha256}:{file_type.lower().lstrip('.')}"
+
+
+def get_cached_text(sha256: str, file_type: str):
+    """Return a previously extracted text for these bytes, or None on a miss."""
+    try:
+        cached = extracted_texts_collection.find_one(
+            {"_id": _cache_key(sha256, file_type), "extractor_version": EXTRACTOR_VERSION},
+            {"text": 1}
+        )
+    except Exception:
+        return None
+    return cached["text"] if cached else None
+
+
+def store_cached_text(sha256: str, file_type: str, text: str):
+    """Persist an extraction, replacing any entry left by an older extractor version."""
+    try:
+        extracted_texts_collection.update_one(
+            {"_id": _cache_key(sha256, file_type)},
+            {"$set": {
+                "text": text,
+                "extractor_version": EXTRACTOR_VERSION,
+                "extracted_at": datetime.utcnow(),
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Failed to cache extracted text: {e}")
+
+
+def extract_cached(data: bytes, file_type: str, sha256: str = None) -> str:
+    """
+    Extract text from upload bytes, reusing the stored extraction when the same
+    bytes were already run through the current extractor version.
+    """
+    sha256 = sha256 or content_hash(data)
+    text = get_cached_text(sha256, file_type)
+    if text is None:
+        # Runs in the isolated worker pool, never in the request thread
+        text = get_extraction_service().extract_bytes(data, file_type)
+        store_cached_text(sha256, file_type, text)
+    return text
+
+
+def extract_upload_text(doc: dict) -> str:
+    """
+    Extract (or fetch cached) text for a stored biography upload document.
+    The file bytes are only loaded from the blob store on a cache miss.
+    """
+    sha256 = doc.get("file_sha256")
+    if sha256:
+        text = get_cached_text(sha256, doc["file_type"])
+        if text is not None:
+            return text
+    return extract_cached(load_upload_bytes(doc), doc["file_type"], sha256)
+
+
+def collect_source_texts(docs: list) -> list:
+    """
+    Resolve the text of several biography uploads, extracting files in parallel.
+
+    Returns one entry per document in the same order: the pasted biography text,
+    the extracted file text, or None when the document has no usable source or
+    its extraction failed or timed out.
+    """
+    texts = [None] * len(docs)
+    pending = {}
+    service = get_extraction_service()
+
+    for i, doc in enumerate(docs):
+        if doc.get("biography_text"):
+            texts[i] = doc["biography_text"]
+        elif doc.get("file_type"):
+            sha256 = doc.get("file_sha256")
+            cached = get_cached_text(sha256, doc["file_type"]) if sha256 else None
+            if cached is not None:
+                texts[i] = cached
+                continue
+            try:
+                data = load_upload_bytes(doc)
+            except Exception as e:
+                print(f"Could not load file for upload {doc.get('_id')}: {e}")
+                continue
+            job = service.submit(data, doc["file_type"])
+            pending[i] = (job, sha256 or content_hash(data))
+
+    for i, (job, sha256) in pending.items():
+        try:
+            text = job.get()
+        except Exception as e:
+            print(f"Extraction failed for upload {docs[i].get('_id')}: {e}")
+            continue
+        store_cached_text(sha256, docs[i]["file_type"], text)
+        texts[i] = text
+
+    return texts
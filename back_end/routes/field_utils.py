@@ -0,0 +1,49 @@
+from flask import request
+
+
+class UnknownFieldError(ValueError):
+    """Raised when ?fields= names a field the endpoint does not return."""
+    pass
+
+
+def requested_fields(allowed):
+    """
+    Sparse fieldset from the ?fields= query parameter (comma separated), or None
+    when it is absent. A name may pick a sub-field with a dot ("parse_result.skills");
+    its first segment must be one of allowed.
+    """
+    raw = request.args.get("fields")
+    if raw is None:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    for field in fields:
+        if field.split(".", 1)[0] not in allowed:
+            raise UnknownFieldError(f"Unknown field: {field}")
+    return fields
+
+
+def sparse_projection(fields, base: dict, paths: dict = None) -> dict:
+    """
+    Mongo projection for a sparse fieldset. base is the endpoint's full projection,
+    used as-is when fields is None; paths maps response keys to the document
+    paths they are built from where those differ from the key itself.
+    """
+    if fields is None:
+        return base
+    paths = paths or {}
+    wanted = set()
+    for field in fields:
+        top, _, rest = field.partition(".")
+        for path in paths.get(top, [top]):
+            wanted.add(f"{path}.{rest}" if rest else path)
+    # A parent and its own sub-field in one projection is a path collision
+    wanted = {p for p in wanted if not any(p.startswith(f"{other}.") for other in wanted)}
+    return {path: base.get(path, 1) for path in wanted}
+
+
+def sparse_payload(payload: dict, fields, always=("_id", "id")) -> dict:
+    """Drop top-level response keys outside the requested fieldset (ids are always kept)."""
+    if fields is None:
+        return payload
+    keep = {f.split(".", 1)[0] for f in fields} | set(always)
+    return {k: v for k, v in payload.items() if k in keep}
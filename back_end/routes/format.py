@@ -1,10 +1,80 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from routes.auth_utils import require_firebase_auth
+from routes.download_utils import not_modified, stream_file
+from routes.templates import LATEX_TEMPLATES
 from latex_compiler import LaTeXCompiler
-import base64
+from latex_service import CompileQueueFullError, get_compile_service, LATEX_WORKERS
+from blob_store import get_blob_store, BlobNotFoundError, FORMATTED_PDFS_BUCKET
+from pdf_cache import get_thumbnail_cache
+from job_queue import MongoJobQueue
+from db import completed_resumes_collection, format_batch_jobs_collection
+from bson import ObjectId
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+import hashlib
+import hmac
+import io
+import os
+import re
+import time
+import zipfile
 
 format_bp = Blueprint("format", __name__)
 
+PDF_REF_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+# Formatted PDF links are signed and expire; they are only handed out to the owner
+# by authenticated endpoints. The secret is required configuration (app.py refuses
+# to start without it) so links verify on every worker and survive restarts.
+FORMATTED_PDF_URL_SECRET = os.getenv("FORMATTED_PDF_URL_SECRET")
+FORMATTED_PDF_URL_TTL_SECONDS = int(os.getenv("FORMATTED_PDF_URL_TTL_SECONDS", "3600"))
+
+# Template previews: PDFs go to the blob store, page-1 PNGs to the thumbnail cache
+PREVIEW_THUMBNAIL_DPI = int(os.getenv("PREVIEW_THUMBNAIL_DPI", "40"))
+
+
+def _pdf_signature(ref: str, expires: int) -> str:
+    if not FORMATTED_PDF_URL_SECRET:
+        raise RuntimeError("FORMATTED_PDF_URL_SECRET is not set")
+    message = f"{ref}:{expires}".encode("utf-8")
+    return hmac.new(FORMATTED_PDF_URL_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def formatted_pdf_url(ref: str, endpoint: str = "format.get_formatted_pdf") -> str:
+    """
+    Signed download URL for a stored PDF, valid for one to two TTLs. Expiry is
+    rounded to the TTL so repeated reads hand out the same, browser-cacheable URL.
+    """
+    ttl = FORMATTED_PDF_URL_TTL_SECONDS
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return url_for(endpoint, ref=ref, expires=expires,
+                   sig=_pdf_signature(ref, expires), _external=True)
+
+
+def _check_pdf_link(ref: str):
+    """Error response for a malformed, forged or expired formatted PDF link, else None."""
+    if not PDF_REF_REGEX.match(ref):
+        return jsonify({"error": "Invalid PDF reference"}), 400
+
+    expires = request.args.get("expires", type=int)
+    signature = request.args.get("sig", "")
+    if expires is None or not hmac.compare_digest(signature, _pdf_signature(ref, expires)):
+        return jsonify({"error": "Invalid PDF link"}), 403
+    if expires < time.time():
+        return jsonify({"error": "PDF link expired"}), 403
+    return None
+
+
+def resume_filename(resume_data, job_title, template_id) -> str:
+    """Download filename from the candidate name, or the job title when there is none."""
+    candidate_name = f"{resume_data.get('first_name', '')} {resume_data.get('last_name', '')}".strip()
+    if candidate_name:
+        safe_name = candidate_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        return f"{safe_name}_{template_id}_resume.pdf"
+    safe_job_title = (job_title or "Resume").replace(' ', '_').replace('/', '_').replace('\\', '_')
+    return f"{safe_job_title}_{template_id}_resume.pdf"
+
+
 @format_bp.route("/format_resume", methods=["POST"])
 @require_firebase_auth
 def format_resume():
@@ -33,36 +103,396 @@ def format_resume():
         if not pdf_bytes:
             return jsonify({"error": "Failed to generate PDF"}), 500
         
-        # Return PDF as base64 data URL for immediate download
-        pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-        download_url = f"data:application/pdf;base64,{pdf_base64}"
+        # Store the PDF once by content hash and hand out a short URL to it
+        pdf_ref = get_blob_store(FORMATTED_PDFS_BUCKET).put(pdf_bytes)
+        download_url = formatted_pdf_url(pdf_ref)
         
-        # Create filename from job title and candidate name
-        candidate_name = f"{resume_data.get('first_name', '')} {resume_data.get('last_name', '')}".strip()
-        if candidate_name:
-            safe_name = candidate_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-            filename = f"{safe_name}_{template_id}_resume.pdf"
-        else:
-            safe_job_title = job_title.replace(' ', '_').replace('/', '_').replace('\\', '_')
-            filename = f"{safe_job_title}_{template_id}_resume.pdf"
+        filename = resume_filename(resume_data, job_title, template_id)
         
         # If completed_resume_id provided, update the document with the PDF URL
         if completed_resume_id:
-            from db import completed_resumes_collection
-            from bson import ObjectId
-            
             if ObjectId.is_valid(completed_resume_id):
                 completed_resumes_collection.update_one(
                     {"_id": ObjectId(completed_resume_id), "user_id": request.user_id},
-                    {"$set": {"formatted_pdf_url": download_url, "formatted_filename": filename}}
+                    {"$set": {"formatted_pdf_ref": pdf_ref, "formatted_filename": filename},
+                     "$unset": {"formatted_pdf_url": ""}}
                 )
         
         return jsonify({
             "message": "Resume formatted successfully",
             "downloadUrl": download_url,
+            "pdf_ref": pdf_ref,
             "filename": filename,
             "template_used": template_id
         }), 200
         
+    except CompileQueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"Failed to format resume: {str(e)}"}), 500
+
+@format_bp.route("/formatted_pdfs/<ref>.pdf", methods=["GET"])
+def get_formatted_pdf(ref):
+    """
+    Stream a generated PDF. Takes no Authorization header so the URL works as an
+    iframe src or link href; instead it must carry an unexpired signature from
+    formatted_pdf_url, which only authenticated owners are given.
+    """
+    invalid = _check_pdf_link(ref)
+    if invalid:
+        return invalid
+
+    cached = not_modified(ref)
+    if cached:
+        return cached
+
+    try:
+        fh, size = get_blob_store(FORMATTED_PDFS_BUCKET).open(ref)
+    except BlobNotFoundError:
+        return jsonify({"error": "PDF not found"}), 404
+    except Exception as e:
+        return jsonify({"error": f"File storage error: {str(e)}"}), 500
+
+    # ?download=<name> saves instead of previewing; the download attribute is ignored cross-origin
+    download_name = request.args.get("download")
+    return stream_file(fh, size, "application/pdf", etag=ref, immutable=True,
+                       filename=download_name, attachment=download_name is not None)
+
+
+@format_bp.route("/formatted_pdfs/<ref>.png", methods=["GET"])
+def get_formatted_pdf_thumbnail(ref):
+    """
+    Stream a PNG of page 1 of a generated PDF, signed like the PDF link itself.
+    Thumbnails are rendered on the LaTeX compile pool on first request and kept
+    in the on-disk thumbnail cache.
+    """
+    invalid = _check_pdf_link(ref)
+    if invalid:
+        return invalid
+
+    thumb_key = f"{ref}-{PREVIEW_THUMBNAIL_DPI}"
+    cached = not_modified(thumb_key)
+    if cached:
+        return cached
+
+    thumbnails = get_thumbnail_cache()
+    png = thumbnails.get(thumb_key)
+    if png is None:
+        try:
+            pdf_bytes = get_blob_store(FORMATTED_PDFS_BUCKET).get(ref)
+        except BlobNotFoundError:
+            return jsonify({"error": "PDF not found"}), 404
+        except Exception as e:
+            return jsonify({"error": f"File storage error: {str(e)}"}), 500
+        try:
+            png = get_compile_service().render_thumbnail(pdf_bytes, PREVIEW_THUMBNAIL_DPI)
+        except CompileQueueFullError as e:
+            return jsonify({"error": str(e)}), 503
+        if png is None:
+            return jsonify({"error": "Thumbnail rendering is not available"}), 404
+        thumbnails.put(thumb_key, png)
+
+    return stream_file(io.BytesIO(png), len(png), "image/png", etag=thumb_key, immutable=True)
+
+
+@format_bp.route("/format_resume/previews", methods=["POST"])
+@require_firebase_auth
+def preview_templates():
+    """
+    Render a resume with several templates at once for side-by-side comparison.
+    Returns per template the URL of the full PDF and, when pdftoppm is installed,
+    of a PNG thumbnail of page 1. Compiles run on the LaTeX compile pool and
+    identical renders are served from the PDF cache.
+    """
+    data = request.get_json(silent=True) or {}
+    resume_data = data.get("resume_data")
+    if not resume_data:
+        return jsonify({"error": "Missing resume_data"}), 400
+
+    known_ids = [t["id"] for t in LATEX_TEMPLATES]
+    template_ids = data.get("template_ids") or known_ids
+    unknown = [t for t in template_ids if t not in known_ids]
+    if unknown:
+        return jsonify({"error": f"Unknown template_ids: {', '.join(map(str, unknown))}"}), 400
+
+    # Queue every compile before waiting on any so the pool renders them side by side
+    latex_compiler = LaTeXCompiler()
+    renders = {}
+    for template_id in template_ids:
+        try:
+            latex_content = latex_compiler.generate_latex_content(resume_data, template_id)
+            renders[template_id] = latex_compiler.submit_pdf(latex_content, template_id)
+        except Exception as e:
+            renders[template_id] = Future()
+            renders[template_id].set_exception(e)
+
+    has_thumbnails = get_compile_service().compiler_path("pdftoppm") is not None
+    store = get_blob_store(FORMATTED_PDFS_BUCKET)
+    previews = []
+    for template_id, render in renders.items():
+        try:
+            pdf_ref = store.put(render.result())
+        except Exception as e:
+            previews.append({"template_id": template_id, "error": str(e)})
+            continue
+        previews.append({
+            "template_id": template_id,
+            "pdf_url": formatted_pdf_url(pdf_ref),
+            "thumbnail_url": formatted_pdf_url(pdf_ref, "format.get_formatted_pdf_thumbnail") if has_thumbnails else None,
+        })
+
+    return jsonify({"previews": previews}), 200
+
+
+# ── batch formatting ─────────────────────────────────────────
+# A batch is a job document in format_batch_jobs drained by a MongoJobQueue.
+# Its renders share one bounded pool, so concurrent batches cannot crowd out
+# interactive /format_resume calls on the LaTeX compile pool.
+
+FORMAT_BATCH_MAX_ITEMS = int(os.getenv("FORMAT_BATCH_MAX_ITEMS", "100"))
+FORMAT_BATCH_CONCURRENCY = int(os.getenv("FORMAT_BATCH_CONCURRENCY", str(max(1, LATEX_WORKERS // 2))))
+_batch_executor = ThreadPoolExecutor(max_workers=FORMAT_BATCH_CONCURRENCY, thread_name_prefix="format-batch")
+
+
+def _safe_name_part(text) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(text or "")).strip("_")
+
+
+def _render_batch_item(job_id, index, template_id, resume):
+    """
+    Render one completed resume of a batch and record the result on the job only;
+    the resume keeps the formatting its owner chose.
+    """
+    resume_data = resume.get("tailored_resume") or {}
+    pdf_bytes = LaTeXCompiler().generate_resume_pdf(resume_data, template_id)
+    pdf_ref = get_blob_store(FORMATTED_PDFS_BUCKET).put(pdf_bytes)
+    filename = resume_filename(resume_data, resume.get("job_title"), template_id)
+
+    format_batch_jobs_collection.update_one({"_id": job_id}, {"$set": {
+        f"items.{index}.status": "completed",
+        f"items.{index}.pdf_ref": pdf_ref,
+        f"items.{index}.filename": filename,
+        f"items.{index}.job_title": resume.get("job_title"),
+        f"items.{index}.company": resume.get("company"),
+    }, "$unset": {f"items.{index}.error": ""}})
+
+
+def _run_format_batch(job):
+    """Render every item not yet completed; items done by an earlier attempt are kept."""
+    pending = [(i, item) for i, item in enumerate(job["items"]) if item.get("status") != "completed"]
+    oids = [ObjectId(item["completed_resume_id"]) for _, item in pending]
+    resumes = {
+        doc["_id"]: doc for doc in completed_resumes_collection.find(
+            {"_id": {"$in": oids}, "user_id": job["user_id"]},
+            {"tailored_resume": 1, "job_title": 1, "company": 1}
+        )
+    }
+
+    futures = {}
+    for (index, item), oid in zip(pending, oids):
+        if oid not in resumes:
+            format_batch_jobs_collection.update_one({"_id": job["_id"]}, {"$set": {
+                f"items.{index}.status": "failed",
+                f"items.{index}.error": "Completed resume not found",
+            }})
+            continue
+        futures[index] = _batch_executor.submit(
+            _render_batch_item, job["_id"], index, job["template_id"], resumes[oid]
+        )
+
+    busy = False
+    for index, future in futures.items():
+        try:
+            future.result()
+        except CompileQueueFullError:
+            busy = True  # left pending for the retry
+        except Exception as e:
+            format_batch_jobs_collection.update_one({"_id": job["_id"]}, {"$set": {
+                f"items.{index}.status": "failed",
+                f"items.{index}.error": str(e),
+            }})
+
+    if busy:
+        raise Exception("LaTeX compile queue is full, retrying remaining items")
+
+    format_batch_jobs_collection.update_one(
+        {"_id": job["_id"]},
+        {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc)}}
+    )
+
+
+def _on_format_batch_failure(job, error):
+    """Out of attempts: the job and every item it did not get to are failed."""
+    format_batch_jobs_collection.update_one(
+        {"_id": job["_id"]},
+        {"$set": {
+            "status": "failed",
+            "error": str(error),
+            "completed_at": datetime.now(timezone.utc),
+            "items.$[left].status": "failed",
+            "items.$[left].error": str(error),
+        }},
+        array_filters=[{"left.status": "pending"}],
+    )
+
+
+format_batch_queue = MongoJobQueue(
+    format_batch_jobs_collection,
+    handler=_run_format_batch,
+    on_failure=_on_format_batch_failure,
+    workers=int(os.getenv("FORMAT_BATCH_WORKERS", "2")),
+    lease_seconds=int(os.getenv("FORMAT_BATCH_LEASE_SECONDS", "120")),
+    max_attempts=int(os.getenv("FORMAT_BATCH_MAX_ATTEMPTS", "5")),
+)
+
+
+def _batch_payload(job):
+    items = []
+    for item in job["items"]:
+        entry = {
+            "completed_resume_id": item["completed_resume_id"],
+            "status": item.get("status", "pending"),
+        }
+        if item.get("pdf_ref"):
+            entry.update({
+                "pdf_ref": item["pdf_ref"],
+                "download_url": formatted_pdf_url(item["pdf_ref"]),
+                "filename": item.get("filename"),
+            })
+        if item.get("error"):
+            entry["error"] = item["error"]
+        items.append(entry)
+
+    payload = {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "template_id": job["template_id"],
+        "created_at": job["created_at"].isoformat(),
+        "completed": sum(1 for i in items if i["status"] == "completed"),
+        "failed": sum(1 for i in items if i["status"] == "failed"),
+        "total": len(items),
+        "items": items,
+    }
+    if job.get("completed_at"):
+        payload["completed_at"] = job["completed_at"].isoformat()
+    if job.get("error"):
+        payload["error"] = job["error"]
+    if payload["completed"]:
+        payload["zip_url"] = url_for("format.download_format_batch", job_id=str(job["_id"]), _external=True)
+    return payload
+
+
+@format_bp.route("/format_resume/batch", methods=["POST"])
+@require_firebase_auth
+def create_format_batch():
+    """
+    Queue PDF rendering of many completed resumes with one template. Returns a
+    job id; poll GET /format_resume/batch/<job_id> for per-item PDF links and
+    fetch GET /format_resume/batch/<job_id>/zip for all of them at once.
+    """
+    data = request.get_json(silent=True) or {}
+    ids = data.get("completed_resume_ids")
+    template_id = data.get("template_id", "default")
+
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "completed_resume_ids must be a non-empty list"}), 400
+    ids = list(dict.fromkeys(ids))  # drop duplicates, keep order
+    if len(ids) > FORMAT_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {FORMAT_BATCH_MAX_ITEMS} resumes per batch"}), 400
+    for completed_resume_id in ids:
+        if not ObjectId.is_valid(completed_resume_id):
+            return jsonify({"error": f"Invalid completed resume ID: {completed_resume_id}"}), 400
+    if template_id not in [t["id"] for t in LATEX_TEMPLATES]:
+        return jsonify({"error": f"Unknown template_id: {template_id}"}), 400
+
+    try:
+        job_id = format_batch_queue.enqueue({
+            "user_id": request.user_id,
+            "template_id": template_id,
+            "items": [{"completed_resume_id": i, "status": "pending"} for i in ids],
+        })
     except Exception as e:
-        return jsonify({"error": f"Failed to format resume: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+    return jsonify({
+        "message": "Batch formatting started",
+        "job_id": str(job_id),
+        "status_url": url_for("format.get_format_batch", job_id=str(job_id), _external=True),
+    }), 202
+
+
+def _find_batch(job_id):
+    if not ObjectId.is_valid(job_id):
+        return None
+    return format_batch_jobs_collection.find_one({"_id": ObjectId(job_id), "user_id": request.user_id})
+
+
+@format_bp.route("/format_resume/batch/<job_id>", methods=["GET"])
+@require_firebase_auth
+def get_format_batch(job_id):
+    job = _find_batch(job_id)
+    if not job:
+        return jsonify({"error": "Batch job not found"}), 404
+    return jsonify(_batch_payload(job)), 200
+
+
+class _ZipChunks:
+    """Write-only sink for ZipFile; without seek/tell ZipFile writes streaming-style entries."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+@format_bp.route("/format_resume/batch/<job_id>/zip", methods=["GET"])
+@require_firebase_auth
+def download_format_batch(job_id):
+    """Stream the rendered PDFs of a batch as a zip, one PDF read into memory at a time."""
+    job = _find_batch(job_id)
+    if not job:
+        return jsonify({"error": "Batch job not found"}), 404
+    done = [item for item in job["items"] if item.get("status") == "completed"]
+    if not done:
+        return jsonify({"error": "No rendered resumes in this batch yet"}), 409
+
+    store = get_blob_store(FORMATTED_PDFS_BUCKET)
+
+    def generate():
+        sink = _ZipChunks()
+        used_names = set()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+            for item in done:
+                # Candidate name is the same for every item, so name entries after the application
+                base = "_".join(filter(None, [
+                    _safe_name_part(item.get("company")),
+                    _safe_name_part(item.get("job_title")),
+                    _safe_name_part(job["template_id"]),
+                ])) or "resume"
+                name, n = f"{base}.pdf", 2
+                while name in used_names:
+                    name, n = f"{base}_{n}.pdf", n + 1
+                used_names.add(name)
+
+                try:
+                    pdf_bytes = store.get(item["pdf_ref"])
+                except BlobNotFoundError:
+                    continue
+                # PDFs are already compressed; storing them keeps the zip cheap to build
+                archive.writestr(name, pdf_bytes)
+                yield sink.drain()
+        yield sink.drain()
+
+    response = Response(stream_with_context(generate()), mimetype="application/zip")
+    response.headers["Content-Disposition"] = f'attachment; filename="resumes_{job_id}.zip"'
+    return response
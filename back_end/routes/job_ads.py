@@ -1,15 +1,21 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from .auth_utils import require_firebase_auth
+from .job_events import job_events
+from .field_utils import requested_fields, sparse_projection, UnknownFieldError
+from .pagination_utils import fetch_page, paged_response, InvalidCursorError
 from db import job_ads_collection, biography_collection, completed_resumes_collection, resume_generation_jobs_collection
 from bson import ObjectId
 from parser.parser import JobAdParser, ResumeTailoringParser, ResumeScorer
-from datetime import datetime
-import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pymongo import ReturnDocument
 import time
+import json
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from job_scraper import JobAdScraper
+from job_queue import MongoJobQueue, PermanentJobError
 
 job_ads_bp = Blueprint("job_ads", __name__)
 
@@ -141,29 +147,51 @@ def get_job_ad(id):
         "scraped_title": doc.get("scraped_title")
     }), 200
 
+# Fields of the job ads list: what a table row shows. The full parse_result and
+# ad text come from GET /job_ads/<id> (or here via ?fields=parse_result,job_ad_text)
+JOB_AD_LIST_PROJECTION = {
+    "uploaded_at": 1,
+    "parse_result.job_title": 1,
+    "parse_result.company": 1,
+    "parse_result.location": 1,
+    "job_ad_url": 1,
+    "scraped_title": 1,
+}
+JOB_AD_LIST_FIELDS = {path.split(".", 1)[0] for path in JOB_AD_LIST_PROJECTION} | {"job_ad_text"}
+
 @job_ads_bp.route("/job_ads", methods=["GET"])
 @require_firebase_auth
 def list_job_ads():
     try:
-        cursor = job_ads_collection.find({"user_id": request.user_id}).sort("uploaded_at", -1)
+        fields = requested_fields(JOB_AD_LIST_FIELDS)
+    except UnknownFieldError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        docs, next_cursor = fetch_page(
+            job_ads_collection,
+            {"user_id": request.user_id},
+            sparse_projection(fields, JOB_AD_LIST_PROJECTION),
+            "uploaded_at",
+        )
         out = []
-        for doc in cursor:
-            job_data = {
-                "_id": str(doc["_id"]),
-                "job_ad_text": doc["job_ad_text"],
-                "uploaded_at": doc["uploaded_at"].isoformat(),
-                "parse_result": doc.get("parse_result", {}),
-            }
+        for doc in docs:
+            job_data = {"_id": str(doc["_id"])}
+            if doc.get("uploaded_at"):
+                job_data["uploaded_at"] = doc["uploaded_at"].isoformat()
+            if fields is None or "parse_result" in doc:
+                job_data["parse_result"] = doc.get("parse_result", {})
             
             # Add URL-related fields if they exist
-            if doc.get("job_ad_url"):
-                job_data["job_ad_url"] = doc["job_ad_url"]
-            if doc.get("scraped_title"):
-                job_data["scraped_title"] = doc["scraped_title"]
+            for key in ("job_ad_url", "scraped_title", "job_ad_text"):
+                if doc.get(key):
+                    job_data[key] = doc[key]
                 
             out.append(job_data)
-        return jsonify(out), 200
+        return paged_response(out, next_cursor)
 
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Database error: {str(e)}"}), 500
     
@@ -186,201 +214,214 @@ def delete_job_ad(id):
     return jsonify({"message": "Job ad deleted"}), 200
 
 
+# Progress reported at the start of each generation stage; tailor and score
+# run concurrently and each adds STAGE_PROGRESS_STEP when it finishes
+STAGE_PROGRESS = {"fetch": 5, "merge": 25, "tailor": 40}
+STAGE_PROGRESS_STEP = 25
+
+
+def _update_job(job_id, fields=None, completed_stage=None, progress_inc=0):
+    """Write one progress/status change for a generation job and notify subscribers."""
+    update = {"$set": {**(fields or {}), "updated_at": datetime.now(timezone.utc)}}
+    if completed_stage:
+        update["$addToSet"] = {"completed_stages": completed_stage}
+    if progress_inc:
+        update["$inc"] = {"progress": progress_inc}
+    resume_generation_jobs_collection.update_one({"_id": ObjectId(job_id)}, update)
+    job_events.publish(job_id)
+
+
+def _start_stage(job_id, stage, completed_stage=None):
+    _update_job(job_id, {"stage": stage, "progress": STAGE_PROGRESS[stage]}, completed_stage)
+
+
+def _finish_job(job_id, fields):
+    _update_job(job_id, fields)
+    job_events.forget(job_id)
+
+
+def _fail_job(job_id, error):
+    _finish_job(job_id, {"status": "failed", "error": error})
+
+
 def process_resume_generation_background(job_id, user_id, job_ad_id, resume_ids):
     """
-    Background function to process resume generation.
-    This simulates a longer-running process.
+    Background function to process resume generation, run by a generation queue worker.
+    Progress is published per stage: fetch, merge, then tailor and score in parallel.
+    Raises PermanentJobError for bad input; any other exception lets the queue retry.
     """
-    try:
-        # Update status to processing
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"status": "processing", "progress": 10}}
-        )
-        
-        # Simulate some processing time
-        time.sleep(2)
-        
-        # Fetch the job ad
-        job_ad_doc = job_ads_collection.find_one({
-            "_id": ObjectId(job_ad_id),
-            "user_id": user_id
-        })
-        if not job_ad_doc:
-            resume_generation_jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": {"status": "failed", "error": "Job ad not found"}}
-            )
-            return
-        
-        job_ad_data = job_ad_doc.get("parse_result")
-        if not job_ad_data:
-            resume_generation_jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": {"status": "failed", "error": "Job ad has no parsed data"}}
-            )
-            return
-        
-        # Update progress
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"progress": 30}}
-        )
-        
-        # Fetch the selected resumes
-        resume_docs = list(biography_collection.find({
-            "_id": {"$in": [ObjectId(rid) for rid in resume_ids]},
-            "user_id": user_id,
-            "isComplete": True
-        }))
-        
-        if len(resume_docs) != len(resume_ids):
-            resume_generation_jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": {"status": "failed", "error": "Some resumes not found or not completed"}}
-            )
-            return
-        
-        # Update progress
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"progress": 50}}
-        )
-        
-        # Simulate processing time for combining resumes
-        time.sleep(1)
-        
-        # Step 1: Combine all resume data into one master resume
-        combined_resume_data = {
-            "first_name": None,
-            "last_name": None,
-            "contact": {"emails": [], "phones": []},
-            "career_objective": None,
-            "skills": {},
-            "jobs": [],
-            "education": []
+    # A retried job starts over, so clear what the previous attempt reported
+    _update_job(job_id, {"stage": "fetch", "progress": STAGE_PROGRESS["fetch"], "completed_stages": []})
+    
+    # Fetch the job ad
+    job_ad_doc = job_ads_collection.find_one({
+        "_id": ObjectId(job_ad_id),
+        "user_id": user_id
+    })
+    if not job_ad_doc:
+        raise PermanentJobError("Job ad not found")
+    
+    job_ad_data = job_ad_doc.get("parse_result")
+    if not job_ad_data:
+        raise PermanentJobError("Job ad has no parsed data")
+    
+    # Fetch the selected resumes
+    resume_docs = list(biography_collection.find({
+        "_id": {"$in": [ObjectId(rid) for rid in resume_ids]},
+        "user_id": user_id,
+        "isComplete": True
+    }, {"parse_result": 1, "name": 1}))
+    
+    if len(resume_docs) != len(resume_ids):
+        raise PermanentJobError("Some resumes not found or not completed")
+    
+    _start_stage(job_id, "merge", completed_stage="fetch")
+    
+    # Step 1: Combine all resume data into one master resume
+    combined_resume_data = {
+        "first_name": None,
+        "last_name": None,
+        "contact": {"emails": [], "phones": []},
+        "career_objective": None,
+        "skills": {},
+        "jobs": [],
+        "education": []
+    }
+    
+    source_resume_names = []
+    
+    # Step 2: Merge data from all selected resumes
+    for resume_doc in resume_docs:
+        resume_data = resume_doc.get("parse_result")
+        if not resume_data:
+            continue
+        
+        source_resume_names.append(resume_doc.get("name", "Untitled"))
+        
+        # Merge contact info (keep first non-null values)
+        if not combined_resume_data["first_name"] and resume_data.get("first_name"):
+            combined_resume_data["first_name"] = resume_data.get("first_name")
+        if not combined_resume_data["last_name"] and resume_data.get("last_name"):
+            combined_resume_data["last_name"] = resume_data.get("last_name")
+        
+        # Merge emails and phones (combine lists)
+        contact = resume_data.get("contact", {})
+        if contact.get("emails"):
+            combined_resume_data["contact"]["emails"].extend(contact["emails"])
+        if contact.get("phones"):
+            combined_resume_data["contact"]["phones"].extend(contact["phones"])
+        
+        # Keep the first career objective found
+        if not combined_resume_data["career_objective"] and resume_data.get("career_objective"):
+            combined_resume_data["career_objective"] = resume_data.get("career_objective")
+        
+        # Merge skills (combine all skill categories)
+        skills = resume_data.get("skills", {})
+        for category, skill_list in skills.items():
+            if category in combined_resume_data["skills"]:
+                combined_resume_data["skills"][category].extend(skill_list)
+            else:
+                combined_resume_data["skills"][category] = skill_list[:]
+        
+        # Combine all jobs
+        jobs = resume_data.get("jobs", [])
+        combined_resume_data["jobs"].extend(jobs)
+        
+        # Combine all education
+        education = resume_data.get("education", [])
+        combined_resume_data["education"].extend(education)
+    
+    # Remove duplicates from emails and phones
+    combined_resume_data["contact"]["emails"] = list(set(combined_resume_data["contact"]["emails"]))
+    combined_resume_data["contact"]["phones"] = list(set(combined_resume_data["contact"]["phones"]))
+    
+    # Remove duplicate skills within each category
+    for category in combined_resume_data["skills"]:
+        combined_resume_data["skills"][category] = list(set(combined_resume_data["skills"][category]))
+    
+    _start_stage(job_id, "tailor", completed_stage="merge")
+    
+    # Step 3: Tailor the COMBINED resume against the job ad
+    tailoring_parser = ResumeTailoringParser()
+    scorer = ResumeScorer()
+    
+    # Scoring only reads the combined resume, so both LLM calls run side by side
+    errors = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(tailoring_parser.tailor_resume, combined_resume_data, job_ad_data): "tailor",
+            executor.submit(scorer.score_resume, combined_resume_data, job_ad_data): "score",
         }
-        
-        source_resume_names = []
-        
-        # Step 2: Merge data from all selected resumes
-        for resume_doc in resume_docs:
-            resume_data = resume_doc.get("parse_result")
-            if not resume_data:
-                continue
-            
-            source_resume_names.append(resume_doc.get("name", "Untitled"))
-            
-            # Merge contact info (keep first non-null values)
-            if not combined_resume_data["first_name"] and resume_data.get("first_name"):
-                combined_resume_data["first_name"] = resume_data.get("first_name")
-            if not combined_resume_data["last_name"] and resume_data.get("last_name"):
-                combined_resume_data["last_name"] = resume_data.get("last_name")
-            
-            # Merge emails and phones (combine lists)
-            contact = resume_data.get("contact", {})
-            if contact.get("emails"):
-                combined_resume_data["contact"]["emails"].extend(contact["emails"])
-            if contact.get("phones"):
-                combined_resume_data["contact"]["phones"].extend(contact["phones"])
-            
-            # Keep the first career objective found
-            if not combined_resume_data["career_objective"] and resume_data.get("career_objective"):
-                combined_resume_data["career_objective"] = resume_data.get("career_objective")
-            
-            # Merge skills (combine all skill categories)
-            skills = resume_data.get("skills", {})
-            for category, skill_list in skills.items():
-                if category in combined_resume_data["skills"]:
-                    combined_resume_data["skills"][category].extend(skill_list)
+        for future in as_completed(futures):
+            stage = futures[future]
+            try:
+                if stage == "tailor":
+                    tailored_resume_data = future.result()
                 else:
-                    combined_resume_data["skills"][category] = skill_list[:]
-            
-            # Combine all jobs
-            jobs = resume_data.get("jobs", [])
-            combined_resume_data["jobs"].extend(jobs)
-            
-            # Combine all education
-            education = resume_data.get("education", [])
-            combined_resume_data["education"].extend(education)
-        
-        # Remove duplicates from emails and phones
-        combined_resume_data["contact"]["emails"] = list(set(combined_resume_data["contact"]["emails"]))
-        combined_resume_data["contact"]["phones"] = list(set(combined_resume_data["contact"]["phones"]))
-        
-        # Remove duplicate skills within each category
-        for category in combined_resume_data["skills"]:
-            combined_resume_data["skills"][category] = list(set(combined_resume_data["skills"][category]))
-        
-        # Update progress
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"progress": 70}}
-        )
-        
-        # Simulate AI processing time
-        time.sleep(2)
-        
-        # Step 3: Tailor the COMBINED resume against the job ad
-        tailoring_parser = ResumeTailoringParser()
-        scorer = ResumeScorer()
-        
-        try:
-            # Tailor the resume (no scoring in this step)
-            tailored_resume_data = tailoring_parser.tailor_resume(combined_resume_data, job_ad_data)
-            
-            # Generate score separately
-            score_data = scorer.score_resume(combined_resume_data, job_ad_data)
-            
-            # Add score to tailored resume for backward compatibility
-            tailored_resume_data["score"] = str(score_data["overall_score"])
-            
-        except Exception as e:
-            resume_generation_jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": {"status": "failed", "error": f"Failed to tailor combined resume: {str(e)}"}}
-            )
-            return
-        
-        # Update progress
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"progress": 90}}
-        )
-        
-        # Step 4: Store as ONE tailored resume
-        completed_resume_doc = {
-            "user_id": user_id,
-            "job_ad_id": job_ad_id,
-            "job_title": job_ad_data.get("job_title"),
-            "company": job_ad_data.get("company"),
-            "created_at": datetime.utcnow(),
-            "tailored_resume": tailored_resume_data,
-            "score_data": score_data,  # Store detailed score data
-            "source_resume_ids": resume_ids,
-            "source_resume_names": source_resume_names,
-            "job_ad_data": job_ad_data
-        }
-        
-        # Insert the completed resume into the database
-        result = completed_resumes_collection.insert_one(completed_resume_doc)
-        
-        # Update job status to completed
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {
-                "status": "completed",
-                "progress": 100,
-                "completed_resume_id": str(result.inserted_id),
-                "completed_at": datetime.utcnow()
-            }}
-        )
-        
-    except Exception as e:
-        resume_generation_jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$set": {"status": "failed", "error": f"Server error: {str(e)}"}}
-        )
+                    score_data = future.result()
+                    overall_score = score_data["overall_score"]
+            except Exception as e:
+                errors.append(f"Failed to {stage} combined resume: {str(e)}")
+                continue
+            _update_job(job_id, completed_stage=stage, progress_inc=STAGE_PROGRESS_STEP)
+
+    if errors:
+        raise Exception("; ".join(errors))
+
+    # Add score to tailored resume for backward compatibility
+    tailored_resume_data["score"] = str(overall_score)
+    
+    # Step 4: Store as ONE tailored resume
+    completed_resume_doc = {
+        "user_id": user_id,
+        "job_ad_id": job_ad_id,
+        "job_title": job_ad_data.get("job_title"),
+        "company": job_ad_data.get("company"),
+        "created_at": datetime.now(timezone.utc),
+        "tailored_resume": tailored_resume_data,
+        "score_data": score_data,  # Store detailed score data
+        "source_resume_ids": resume_ids,
+        "source_resume_names": source_resume_names,
+        "job_ad_data": job_ad_data
+    }
+    
+    # Keyed by job so a retry after a crash past this point reuses the same resume
+    completed = completed_resumes_collection.find_one_and_update(
+        {"generation_job_id": job_id},
+        {"$setOnInsert": {**completed_resume_doc, "generation_job_id": job_id}},
+        upsert=True,
+        projection={"_id": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    # Update job status to completed
+    _finish_job(job_id, {
+        "status": "completed",
+        "stage": "done",
+        "progress": 100,
+        "completed_resume_id": str(completed["_id"]),
+        "completed_at": datetime.now(timezone.utc)
+    })
+
+
+def _run_generation_job(job):
+    process_resume_generation_background(str(job["_id"]), job["user_id"], job["job_ad_id"], job["resume_ids"])
+
+
+def _on_generation_failure(job, error):
+    message = str(error) if isinstance(error, PermanentJobError) else f"Server error: {str(error)}"
+    _fail_job(str(job["_id"]), message)
+
+
+generation_queue = MongoJobQueue(
+    resume_generation_jobs_collection,
+    handler=_run_generation_job,
+    on_failure=_on_generation_failure,
+    notify=job_events.publish,
+    workers=int(os.getenv("GENERATION_WORKERS", "4")),
+    lease_seconds=int(os.getenv("GENERATION_LEASE_SECONDS", "120")),
+    max_attempts=int(os.getenv("GENERATION_MAX_ATTEMPTS", "3")),
+)
 
 @job_ads_bp.route("/job_ads/<job_ad_id>/create_tailored_resume", methods=["POST"])
 @require_firebase_auth
@@ -407,26 +448,15 @@ def create_tailored_resume(job_ad_id):
             if not ObjectId.is_valid(resume_id):
                 return jsonify({"error": f"Invalid resume ID: {resume_id}"}), 400
         
-        # Create a job record for tracking
+        # Queue the job; a generation worker claims it (status: pending, processing, completed, failed)
         job_doc = {
             "user_id": request.user_id,
             "job_ad_id": job_ad_id,
             "resume_ids": resume_ids,
-            "status": "pending",  # pending, processing, completed, failed
             "progress": 0,
-            "created_at": datetime.utcnow()
+            "created_at": datetime.now(timezone.utc)
         }
-        
-        job_result = resume_generation_jobs_collection.insert_one(job_doc)
-        job_id = str(job_result.inserted_id)
-        
-        # Start background processing
-        thread = threading.Thread(
-            target=process_resume_generation_background,
-            args=(job_id, request.user_id, job_ad_id, resume_ids)
-        )
-        thread.daemon = True
-        thread.start()
+        job_id = str(generation_queue.enqueue(job_doc))
         
         return jsonify({
             "message": "Resume generation started",
@@ -436,6 +466,27 @@ def create_tailored_resume(job_ad_id):
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+def _job_status_payload(job):
+    """Status fields shared by the polling and streaming job endpoints."""
+    response_data = {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "completed_stages": job.get("completed_stages", []),
+        "progress": job.get("progress", 0),
+        "created_at": job["created_at"].isoformat(),
+    }
+    
+    # Add completed resume ID if available
+    if job.get("completed_resume_id"):
+        response_data["completed_resume_id"] = job["completed_resume_id"]
+        response_data["completed_at"] = job.get("completed_at", datetime.now(timezone.utc)).isoformat()
+    
+    # Add error if failed
+    if job.get("error"):
+        response_data["error"] = job["error"]
+    return response_data
+
 @job_ads_bp.route("/resume_generation_jobs/<job_id>", methods=["GET"])
 @require_firebase_auth
 def get_generation_status(job_id):
@@ -454,23 +505,7 @@ def get_generation_status(job_id):
         if not job:
             return jsonify({"error": "Job not found"}), 404
         
-        response_data = {
-            "job_id": job_id,
-            "status": job["status"],
-            "progress": job.get("progress", 0),
-            "created_at": job["created_at"].isoformat(),
-        }
-        
-        # Add completed resume ID if available
-        if job.get("completed_resume_id"):
-            response_data["completed_resume_id"] = job["completed_resume_id"]
-            response_data["completed_at"] = job.get("completed_at", datetime.utcnow()).isoformat()
-        
-        # Add error if failed
-        if job.get("error"):
-            response_data["error"] = job["error"]
-        
-        return jsonify(response_data), 200
+        return jsonify(_job_status_payload(job)), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -479,12 +514,15 @@ def get_generation_status(job_id):
 @require_firebase_auth
 def list_generation_jobs():
     """
-    List all resume generation jobs for the current user.
+    List the current user's resume generation jobs, newest first, one page per ?cursor=.
     """
     try:
-        jobs = list(resume_generation_jobs_collection.find({
-            "user_id": request.user_id
-        }).sort("created_at", -1).limit(50))  # Most recent 50 jobs
+        jobs, next_cursor = fetch_page(
+            resume_generation_jobs_collection,
+            {"user_id": request.user_id},
+            None,
+            "created_at",
+        )
         
         jobs_data = []
         for job in jobs:
@@ -498,14 +536,72 @@ def list_generation_jobs():
             
             if job.get("completed_resume_id"):
                 job_data["completed_resume_id"] = job["completed_resume_id"]
-                job_data["completed_at"] = job.get("completed_at", datetime.utcnow()).isoformat()
+                job_data["completed_at"] = job.get("completed_at", datetime.now(timezone.utc)).isoformat()
             
             if job.get("error"):
                 job_data["error"] = job["error"]
                 
             jobs_data.append(job_data)
         
-        return jsonify(jobs_data), 200
+        return paged_response(jobs_data, next_cursor)
         
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+# Seconds between Mongo re-reads when no in-process event arrives (job running elsewhere)
+SSE_RECHECK_SECONDS = 5
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_SECONDS = 600
+
+@job_ads_bp.route("/resume_generation_jobs/<job_id>/events", methods=["GET"])
+@require_firebase_auth
+def stream_generation_status(job_id):
+    """
+    Stream status changes of a resume generation job as Server-Sent Events.
+    Sends a `progress` event per stage change and ends with `completed` or `failed`.
+    A job still running after SSE_MAX_SECONDS ends the stream with a `reconnect`
+    event carrying its latest status; the client subscribes again.
+    """
+    if not ObjectId.is_valid(job_id):
+        return jsonify({"error": "Invalid job ID"}), 400
+    
+    query = {"_id": ObjectId(job_id), "user_id": request.user_id}
+    job = resume_generation_jobs_collection.find_one(query)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    def generate(job):
+        last_payload = None
+        version = job_events.version(job_id)
+        started = last_sent = time.monotonic()
+
+        while job:
+            payload = _job_status_payload(job)
+            now = time.monotonic()
+            if payload != last_payload:
+                event = payload["status"] if payload["status"] in ("completed", "failed") else "progress"
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+                if event != "progress":
+                    return
+                last_payload, last_sent = payload, now
+            elif now - last_sent >= SSE_HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = now
+
+            if now - started >= SSE_MAX_SECONDS:
+                yield f"event: reconnect\ndata: {json.dumps(payload)}\n\n"
+                return
+            version = job_events.wait(job_id, version, SSE_RECHECK_SECONDS)
+            job = resume_generation_jobs_collection.find_one(query)
+
+        # The job was deleted while streaming
+        gone = {"job_id": job_id, "status": "failed", "error": "Job no longer exists"}
+        yield f"event: failed\ndata: {json.dumps(gone)}\n\n"
+
+    return Response(
+        stream_with_context(generate(job)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,37 @@
+import threading
+
+
+class JobEventBroker:
+    """
+    In-process notifier for generation job progress. Workers publish after each
+    stage write; Server-Sent Events streams wait on it instead of sleeping, and
+    fall back to their wait timeout for jobs running in another process.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._versions = {}
+
+    def publish(self, job_id: str):
+        with self._cond:
+            self._versions[job_id] = self._versions.get(job_id, 0) + 1
+            self._cond.notify_all()
+
+    def version(self, job_id: str) -> int:
+        with self._cond:
+            return self._versions.get(job_id, 0)
+
+    def wait(self, job_id: str, seen_version: int, timeout: float) -> int:
+        """Block until job_id publishes past seen_version or timeout elapses; return the latest version."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._versions.get(job_id, 0) != seen_version, timeout)
+            return self._versions.get(job_id, 0)
+
+    def forget(self, job_id: str):
+        """Drop bookkeeping for a finished job; late subscribers read the final state from Mongo."""
+        with self._cond:
+            self._versions.pop(job_id, None)
+            self._cond.notify_all()
+
+
+job_events = JobEventBroker()
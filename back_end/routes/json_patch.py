@@ -0,0 +1,155 @@
+"""
+Minimal RFC 6902 JSON Patch (add, remove, replace, move, copy, test) over
+plain dicts and lists, as stored in Mongo documents.
+"""
+import copy
+
+OPERATIONS = {"add", "remove", "replace", "move", "copy", "test"}
+
+
+class JsonPatchError(Exception):
+    """Raised for a malformed patch or a path that does not resolve."""
+    pass
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Raised when a "test" operation does not match the document."""
+    pass
+
+
+def parse_pointer(pointer) -> list:
+    """Split an RFC 6901 JSON Pointer ("/jobs/0/title") into unescaped tokens."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if pointer == "":
+        return []
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _parent(doc, tokens: list):
+    """Container holding the last token of a path."""
+    node = doc
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node
+
+
+def _get(doc, tokens: list):
+    if not tokens:
+        return doc
+    parent, token = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_index(parent, token, allow_end=False)]
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _add(doc, tokens: list, value):
+    if not tokens:
+        return value
+    parent, token = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at /{'/'.join(tokens)}")
+    return doc
+
+
+def _remove(doc, tokens: list):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+    parent, token = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, allow_end=False))
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def validate_operations(operations) -> None:
+    """Raise JsonPatchError unless operations is a list of well-formed operation objects."""
+    if not isinstance(operations, list):
+        raise JsonPatchError("Patch must be a list of operations")
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict) or not isinstance(op.get("op"), str) or op["op"] not in OPERATIONS:
+            raise JsonPatchError(f"Operation {i}: unknown or missing 'op'")
+        if not isinstance(op.get("path"), str):
+            raise JsonPatchError(f"Operation {i}: 'path' must be a string")
+        if op["op"] in ("move", "copy") and not isinstance(op.get("from"), str):
+            raise JsonPatchError(f"Operation {i}: 'from' must be a string")
+        if op["op"] in ("add", "replace", "test") and "value" not in op:
+            raise JsonPatchError(f"Operation {i}: missing 'value'")
+
+
+def apply_patch(doc, operations: list):
+    """Return a patched deep copy of doc; the input is never modified."""
+    validate_operations(operations)
+
+    doc = copy.deepcopy(doc)
+    for i, op in enumerate(operations):
+        tokens = parse_pointer(op["path"])
+
+        if op["op"] == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif op["op"] == "remove":
+            _remove(doc, tokens)
+        elif op["op"] == "replace":
+            _get(doc, tokens)  # target must exist
+            if tokens:
+                _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif op["op"] == "test":
+            if _get(doc, tokens) != op["value"]:
+                raise JsonPatchTestFailed(f"Operation {i}: test failed at {op['path']}")
+        else:
+            from_tokens = parse_pointer(op["from"])
+            if op["op"] == "move":
+                if tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError(f"Operation {i}: cannot move a value into itself")
+                value = _remove(doc, from_tokens)
+            else:
+                value = copy.deepcopy(_get(doc, from_tokens))
+            doc = _add(doc, tokens, value)
+    return doc
+
+
+def touched_paths(operations: list) -> list:
+    """Token lists of every location a patch writes to (path, and from for move)."""
+    validate_operations(operations)
+    paths = []
+    for op in operations:
+        paths.append(parse_pointer(op["path"]))
+        if op["op"] == "move":
+            paths.append(parse_pointer(op["from"]))
+    return paths
+
+
+def source_paths(operations: list) -> list:
+    """Token lists of every location a patch reads a value from (from, for move and copy)."""
+    validate_operations(operations)
+    return [parse_pointer(op["from"]) for op in operations if op["op"] in ("move", "copy")]
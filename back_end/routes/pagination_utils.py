@@ -0,0 +1,104 @@
+from flask import request, jsonify
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+import base64
+import binascii
+import json
+import os
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when ?cursor= or ?limit= cannot be used."""
+    pass
+
+
+def encode_cursor(value, doc_id) -> str:
+    """Opaque cursor for the position after a document: its sort key value and _id."""
+    payload = {"v": value.isoformat() if isinstance(value, datetime) else None, "id": str(doc_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """(sort key value, ObjectId) from a cursor made by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = datetime.fromisoformat(payload["v"]) if payload["v"] is not None else None
+        return value, ObjectId(payload["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError, InvalidId):
+        raise InvalidCursorError("Invalid cursor")
+
+
+def page_params():
+    """(limit, cursor position or None) from ?limit= and ?cursor=."""
+    raw_limit = request.args.get("limit")
+    if raw_limit is None:
+        limit = PAGE_SIZE_DEFAULT
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise InvalidCursorError("limit must be an integer")
+        if not 1 <= limit <= PAGE_SIZE_MAX:
+            raise InvalidCursorError(f"limit must be between 1 and {PAGE_SIZE_MAX}")
+
+    cursor = request.args.get("cursor")
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def keyset_filter(query: dict, sort_field: str, position) -> dict:
+    """
+    Restrict query to the documents after position in (sort_field desc, _id desc)
+    order. Documents without the sort key sort last, so they follow every dated one.
+    """
+    if position is None:
+        return query
+    value, doc_id = position
+    if value is None:
+        after = {sort_field: None, "_id": {"$lt": doc_id}}
+    else:
+        after = {"$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": doc_id}},
+            {sort_field: None},
+        ]}
+    return {"$and": [query, after]} if query else after
+
+
+def keyset_sort(sort_field: str) -> list:
+    """Newest first with _id as the tie-breaker, matching the (..., sort_field, _id) indexes."""
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def fetch_page(collection, query: dict, projection, sort_field: str):
+    """
+    One page of a newest-first list: (docs, next cursor or None). Reads limit + 1
+    documents so the last page is known without a count.
+    """
+    limit, position = page_params()
+    if projection and sort_field not in projection and 1 in projection.values():
+        projection = {**projection, sort_field: 1}  # the cursor is built from it
+    docs = list(
+        collection.find(keyset_filter(query, sort_field, position), projection)
+        .sort(keyset_sort(sort_field))
+        .limit(limit + 1)
+    )
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor(last.get(sort_field), last["_id"])
+
+
+def paged_response(items: list, next_cursor):
+    """200 JSON array response carrying the next page's cursor in X-Next-Cursor (absent on the last page)."""
+    response = jsonify(items)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response, 200
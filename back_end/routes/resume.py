@@ -1,19 +1,173 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
-import tempfile
 import os
 import re
 import sys
+from pymongo import ReturnDocument
 from db import biography_collection
-from parser.extractors import extract_text
+from blob_store import WITHOUT_FILE_CONTENT
 from parser.parser import ResumeParser
 from .auth_utils import require_firebase_auth
+from .extraction_utils import extract_upload_text, collect_source_texts
+from .field_utils import requested_fields, sparse_projection, sparse_payload, UnknownFieldError
+from .json_patch import apply_patch, touched_paths, source_paths, JsonPatchError, JsonPatchTestFailed
 
 EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_REGEX = re.compile(r"^\d{3}-\d{3}-\d{4}$")
 
 resume_bp = Blueprint("resume", __name__)
 
+# Every write to parse_result bumps "version" so PATCH /resume/<id> can detect
+# concurrent edits (documents written before versioning count as version 0)
+VERSION_BUMP = {"version": 1}
+VERSION_BUMP_EXPR = {"$add": [{"$ifNull": ["$version", 0]}, 1]}  # for pipeline updates
+
+JOB_REQUIRED_FIELDS = ["title", "company", "location", "start_date", "end_date", "role_summary", "responsibilities", "accomplishments"]
+
+
+# ── validation shared by the section endpoints and PATCH ─────
+# Each returns an error message, or None when the value is valid.
+
+def _validate_emails(emails):
+    if not isinstance(emails, list) or not emails:
+        return "At least one email is required"
+    for email in emails:
+        if not isinstance(email, str) or not EMAIL_REGEX.match(email.strip()):
+            return f"Invalid email: {email}"
+    return None
+
+
+def _validate_phones(phones):
+    if not isinstance(phones, list) or not phones:
+        return "At least one phone number is required"
+    for phone in phones:
+        if not isinstance(phone, str) or not PHONE_REGEX.match(phone.strip()):
+            return f"Invalid phone: {phone}"
+    return None
+
+
+def _validate_objective(career_objective):
+    if not isinstance(career_objective, str) or not career_objective.strip():
+        return "Career objective cannot be empty"
+    return None
+
+
+def _validate_skills(skills):
+    if not isinstance(skills, dict) or not skills:
+        return "Skills must be a non-empty object"
+    for category, items in skills.items():
+        if not isinstance(category, str) or not isinstance(items, list):
+            return f"Invalid entry in skills: {category}"
+        for skill in items:
+            if not isinstance(skill, str) or not skill.strip():
+                return f"Invalid skill '{skill}' in category '{category}'"
+    return None
+
+
+def _validate_job(job):
+    if not isinstance(job, dict):
+        return "Job must be an object"
+    for field in JOB_REQUIRED_FIELDS:
+        if field not in job:
+            return f"Missing field: {field}"
+    if not isinstance(job["responsibilities"], list) or not isinstance(job["accomplishments"], list):
+        return "Responsibilities and accomplishments must be lists"
+    return None
+
+
+def _validate_jobs(jobs):
+    if not isinstance(jobs, list):
+        return "Jobs must be a list"
+    for idx, job in enumerate(jobs):
+        error = _validate_job(job)
+        if error:
+            return f"Job {idx+1}: {error}"
+    return None
+
+
+def _validate_educations(educations):
+    if not isinstance(educations, list):
+        return "Education must be a list"
+    for idx, edu in enumerate(educations):
+        if not isinstance(edu, dict):
+            return f"Education {idx+1} must be an object"
+    return None
+
+
+def _validate_name(name):
+    if name is not None and not isinstance(name, str):
+        return "Name must be a string"
+    return None
+
+
+# parse_result locations PATCH may write to, and the validator for each
+PATCH_VALIDATORS = {
+    ("first_name",): _validate_name,
+    ("last_name",): _validate_name,
+    ("contact", "emails"): _validate_emails,
+    ("contact", "phones"): _validate_phones,
+    ("career_objective",): _validate_objective,
+    ("skills",): _validate_skills,
+    ("jobs",): _validate_jobs,
+    ("education",): _validate_educations,
+}
+
+
+def _patchable(tokens) -> bool:
+    """True if tokens point at or inside one of the PATCH_VALIDATORS locations."""
+    return any(tokens[:len(key)] == list(key) for key in PATCH_VALIDATORS)
+
+# GET /resume/<id>: response keys and the parse_result paths they come from
+RESUME_SECTIONS = ["first_name", "last_name", "contact", "career_objective", "skills", "jobs", "education"]
+RESUME_FIELD_PATHS = {key: [f"parse_result.{key}"] for key in RESUME_SECTIONS}
+RESUME_PROJECTION = {"name": 1, "version": 1, **{f"parse_result.{key}": 1 for key in RESUME_SECTIONS}}
+
+
+# ── single round-trip array edits ────────────────────────────
+# Index bounds are checked by the update filter itself ("<array>.<i>" exists),
+# so each edit is one atomic find_one_and_update that also returns the new
+# array, and concurrent edits can never apply to a shifted index.
+
+def _edit_array_entry(resume_id, array_path, index, update):
+    """Apply update if array_path has an entry at index; returns (updated array, new version), or (None, None)."""
+    doc = biography_collection.find_one_and_update(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id, f"{array_path}.{index}": {"$exists": True}},
+        update,
+        projection={array_path: 1, "version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
+        return None, None
+    version, value = doc.get("version", 0), doc
+    for key in array_path.split("."):
+        value = value.get(key, {})
+    return value, version
+
+
+def _update_resume(resume_id, update):
+    """Apply update to the user's resume; returns its new version, or None if not found."""
+    doc = biography_collection.find_one_and_update(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id},
+        update,
+        projection={"version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    return None if doc is None else doc.get("version", 0)
+
+
+def _without_entry(array_path, index):
+    """Pipeline update dropping the entry at index, shifting later ones down."""
+    field = f"${array_path}"
+    before = [{"$slice": [field, index]}] if index > 0 else []
+    after = [{"$slice": [field, index + 1, {"$size": field}]}]
+    return [{"$set": {array_path: {"$concatArrays": before + after}, "version": VERSION_BUMP_EXPR}}]
+
+
+def _resume_exists(resume_id) -> bool:
+    return biography_collection.count_documents(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id}, limit=1
+    ) > 0
+
 @resume_bp.route("/resume/<resume_id>/update_contact", methods=["POST"])
 @require_firebase_auth
 def update_contact(resume_id):
@@ -30,22 +184,16 @@ def update_contact(resume_id):
             return jsonify({"error": "Missing 'emails' field in request"}), 400
 
 
-        if not isinstance(emails, list) or not emails:
-            return jsonify({"error": "At least one email is required"}), 400
+        error = _validate_emails(emails)
+        if error:
+            return jsonify({"error": error}), 400
         
-        for email in emails:
-            if not isinstance(email, str) or not EMAIL_REGEX.match(email.strip()):
-                return jsonify({"error": f"Invalid email: {email}"}), 400
-        
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.contact.emails": emails}}
-        )
+        version = _update_resume(resume_id, {"$set": {"parse_result.contact.emails": emails}, "$inc": VERSION_BUMP})
 
-        if result.matched_count == 0:
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
         
-        return jsonify({"message": "Emails updated successfully"}), 200
+        return jsonify({"message": "Emails updated successfully", "version": version}), 200
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -62,22 +210,16 @@ def update_phone(resume_id):
             return jsonify({"error": "Phone numbers not provided"}), 400
 
         phones = data["phones"]
-        if not isinstance(phones, list) or not phones:
-            return jsonify({"error": "At least one phone number is required"}), 400
+        error = _validate_phones(phones)
+        if error:
+            return jsonify({"error": error}), 400
 
-        for phone in phones:
-            if not isinstance(phone, str) or not PHONE_REGEX.match(phone.strip()):
-                return jsonify({"error": f"Invalid phone: {phone}"}), 400
+        version = _update_resume(resume_id, {"$set": {"parse_result.contact.phones": phones}, "$inc": VERSION_BUMP})
 
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.contact.phones": phones}}
-        )
-
-        if result.matched_count == 0:
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
 
-        return jsonify({"message": "Phone numbers updated successfully"}), 200
+        return jsonify({"message": "Phone numbers updated successfully", "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
@@ -96,15 +238,12 @@ def update_career_objective(resume_id):
         if not career_objective:
             return jsonify({"error": "Career objective cannot be empty"}), 400
         
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.career_objective": career_objective}}
-        )
+        version = _update_resume(resume_id, {"$set": {"parse_result.career_objective": career_objective}, "$inc": VERSION_BUMP})
 
-        if result.matched_count == 0:
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
         
-        return jsonify({"message": "Career objective updated successfully"}), 200
+        return jsonify({"message": "Career objective updated successfully", "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -120,26 +259,16 @@ def update_skills(resume_id):
             return jsonify({"error": "Missing 'skills' field in request"}), 400
         
         skills = data["skills"]
-
-        if not isinstance(skills, dict) or not skills:
-            return jsonify({"error": "Skills must be a non-empty object"}), 400
+        error = _validate_skills(skills)
+        if error:
+            return jsonify({"error": error}), 400
         
-        for category, items in skills.items():
-            if not isinstance(category, str) or not isinstance(items, list):
-                return jsonify({"error": f"Invalid entry in skills: {category}"}), 400
-            for skill in items:
-                if not isinstance(skill, str) or not skill.strip():
-                    return jsonify({"error": f"Invalid skill '{skill}' in category '{category}'"}), 400
-        
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.skills": skills}}
-        )
+        version = _update_resume(resume_id, {"$set": {"parse_result.skills": skills}, "$inc": VERSION_BUMP})
 
-        if result.matched_count == 0:
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
         
-        return jsonify({"message": "Skills updated successfully"}), 200
+        return jsonify({"message": "Skills updated successfully", "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -155,35 +284,19 @@ def update_job_entry(resume_id, index):
             return jsonify({"error": "Missing 'updatedJob' in request body"}), 400
         
         job = data["updatedJob"]
-        required_fields = ["title", "company", "location", "start_date", "end_date", "role_summary", "responsibilities", "accomplishments"]
-
-        for field in required_fields:
-            if field not in job:
-                return jsonify({"error": f"Missing field: {field}"}), 400
-
-        if not isinstance(job["responsibilities"], list) or not isinstance(job["accomplishments"], list):
-            return jsonify({"error": "Responsibilities and accomplishments must be lists"}), 400
+        error = _validate_job(job)
+        if error:
+            return jsonify({"error": error}), 400
 
         # Replace the job at the given index
-        resume = biography_collection.find_one({
-            "_id": ObjectId(resume_id),
-            "user_id": request.user_id
-        })
-
-        if not resume:
-            return jsonify({"error": "Resume not found"}), 404
-
-        jobs = resume.get("parse_result", {}).get("jobs", [])
-        if index < 0 or index >= len(jobs):
+        jobs, version = _edit_array_entry(resume_id, "parse_result.jobs", index,
+                                          {"$set": {f"parse_result.jobs.{index}": job}, "$inc": VERSION_BUMP})
+        if jobs is None:
+            if not _resume_exists(resume_id):
+                return jsonify({"error": "Resume not found"}), 404
             return jsonify({"error": "Job index out of range"}), 400
 
-        update_path = f"parse_result.jobs.{index}"
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {update_path: job}}
-        )
-
-        return jsonify({"message": "Job updated successfully"}), 200
+        return jsonify({"message": "Job updated successfully", "jobs": jobs, "version": version}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -202,23 +315,16 @@ def add_job_entry(resume_id):
         new_job = data["newJob"]
 
         # Basic validation
-        required_fields = ["title", "company", "location", "start_date", "end_date", "role_summary", "responsibilities", "accomplishments"]
-        for field in required_fields:
-            if field not in new_job:
-                return jsonify({"error": f"Missing field: {field}"}), 400
+        error = _validate_job(new_job)
+        if error:
+            return jsonify({"error": error}), 400
 
-        if not isinstance(new_job["responsibilities"], list) or not isinstance(new_job["accomplishments"], list):
-            return jsonify({"error": "Responsibilities and accomplishments must be lists"}), 400
+        version = _update_resume(resume_id, {"$push": {"parse_result.jobs": new_job}, "$inc": VERSION_BUMP})
 
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$push": {"parse_result.jobs": new_job}}
-        )
-
-        if result.matched_count == 0:
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
         
-        return jsonify({"message": "Job added successfully"}), 200
+        return jsonify({"message": "Job added successfully", "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -234,13 +340,8 @@ def set_all_jobs(resume_id):
         if not isinstance(jobs, list):
             return jsonify({"error": "Jobs must be a list"}), 400
         
-        required_fields = [
-            "title", "company", "location", "start_date", "end_date",
-            "role_summary", "responsibilities", "accomplishments"
-        ]
-
         for idx, job in enumerate(jobs):
-            for field in required_fields:
+            for field in JOB_REQUIRED_FIELDS:
                 if field not in job:
                     return jsonify({"error": f"Job {idx+1} missing field: {field}"}), 400
             if not isinstance(job["responsibilities"], list) or not isinstance(job["accomplishments"], list):
@@ -250,14 +351,11 @@ def set_all_jobs(resume_id):
             if not isinstance(job["company"], str) or not job["company"].strip():
                 return jsonify({"error": f"Job {idx+1} has invalid or empty company"}), 400
 
-        result = biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.jobs": jobs}}
-        )
-        if result.matched_count == 0:
+        version = _update_resume(resume_id, {"$set": {"parse_result.jobs": jobs}, "$inc": VERSION_BUMP})
+        if version is None:
             return jsonify({"error": "Resume not found"}), 404
         
-        return jsonify({"message": "Job order updated successfully"}), 200
+        return jsonify({"message": "Job order updated successfully", "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -268,23 +366,14 @@ def delete_job_entry(resume_id, index):
         if not ObjectId.is_valid(resume_id):
             return jsonify({"error": "Invalid resume ID"}), 400
         
-        doc = biography_collection.find_one({
-            "_id": ObjectId(resume_id),
-            "user_id": request.user_id
-        })
-        if not doc:
-            return jsonify({"error": "Resume not found"}), 404
-        
-        jobs = doc.get("parse_result", {}).get("jobs", [])
-        if index < 0 or index >= len(jobs):
+        jobs, version = _edit_array_entry(resume_id, "parse_result.jobs", index,
+                                          _without_entry("parse_result.jobs", index))
+        if jobs is None:
+            if not _resume_exists(resume_id):
+                return jsonify({"error": "Resume not found"}), 404
             return jsonify({"error": "Invalid job index"}), 400
-        
-        jobs.pop(index)
-        biography_collection.update_one(
-            {"_id": ObjectId(resume_id), "user_id": request.user_id},
-            {"$set": {"parse_result.jobs": jobs}}
-        )
-        return jsonify({"success": True}), 200
+
+        return jsonify({"success": True, "jobs": jobs, "version": version}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
@@ -300,21 +389,16 @@ def add_education(resume_id):
     if not isinstance(newEdu, dict):
         return jsonify({"error": "Missing newEdu payload"}), 400
 
-    doc = biography_collection.find_one({
-        "_id": ObjectId(resume_id),
-        "user_id": request.user_id  # Ensure the user owns this resume
-    })
+    doc = biography_collection.find_one_and_update(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id},  # Ensure the user owns this resume
+        {"$push": {"parse_result.education": newEdu}, "$inc": VERSION_BUMP},
+        projection={"parse_result.education": 1, "version": 1},
+        return_document=ReturnDocument.AFTER
+    )
     if not doc:
         return jsonify({"error": "Resume not found"}), 404
 
-    educations = doc.get("parse_result", {}).get("education", [])
-    educations.append(newEdu)
-
-    biography_collection.update_one(
-        {"_id": ObjectId(resume_id), "user_id": request.user_id},
-        {"$set": {"parse_result.education": educations}}
-    )
-    return jsonify({"success": True}), 200
+    return jsonify({"success": True, "education": doc["parse_result"]["education"], "version": doc.get("version", 0)}), 200
 
 
 
@@ -331,36 +415,30 @@ def update_education(resume_id, index):
         return jsonify({"error": "Missing 'updatedEdu' in request body"}), 400
     updated = data["updatedEdu"]
 
-    # 3) Fetch existing document
-    doc = biography_collection.find_one({
-        "_id": ObjectId(resume_id),
-        "user_id": request.user_id,  # Ensure the user owns this resume
-    })
-    if not doc:
-        return jsonify({"error": "Resume not found"}), 404
-
-    # 4) Ensure we have an education array
-    parse_result = doc.get("parse_result", {})
-    edus = parse_result.get("education", [])
-    if not isinstance(edus, list):
-        return jsonify({"error": "Malformed education data"}), 500
-    
-    # 5) Perform in-place update or push
+    # 3) Replace the entry at index, or append when index is past the end, in one
+    #    pipeline update. $literal keeps "$"-prefixed user text from being read as a field path.
+    entry = [{"$literal": updated}]
+    before = [{"$slice": ["$$edus", index]}] if index > 0 else []
+    after = [{"$slice": ["$$edus", index + 1, {"$max": [1, {"$size": "$$edus"}]}]}]
     try:
-        if index < len(edus):
-            biography_collection.update_one(
-                {"_id": ObjectId(resume_id), "user_id": request.user_id},
-                {"$set": {f"parse_result.education.{index}": updated}}
-            )
-        else:
-            # append as a new entry
-            biography_collection.update_one(
-                {"_id": ObjectId(resume_id), "user_id": request.user_id},
-                {"$push": {"parse_result.education": updated}}
-            )
+        doc = biography_collection.find_one_and_update(
+            {"_id": ObjectId(resume_id), "user_id": request.user_id},  # Ensure the user owns this resume
+            [{"$set": {"parse_result.education": {"$let": {
+                "vars": {"edus": {"$ifNull": ["$parse_result.education", []]}},
+                "in": {"$cond": [
+                    {"$lt": [index, {"$size": "$$edus"}]},
+                    {"$concatArrays": before + [entry] + after},
+                    {"$concatArrays": ["$$edus", entry]},
+                ]},
+            }}, "version": VERSION_BUMP_EXPR}}],
+            projection={"parse_result.education": 1, "version": 1},
+            return_document=ReturnDocument.AFTER
+        )
     except Exception as e:
         return jsonify({"error": f"Database update failed: {str(e)}"}), 500
-    return jsonify({"success": True}), 200
+    if not doc:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify({"success": True, "education": doc["parse_result"]["education"], "version": doc.get("version", 0)}), 200
 
 
 @resume_bp.route("/resume/<resume_id>/delete_education/<int:index>", methods=["DELETE"])
@@ -369,30 +447,15 @@ def delete_education(resume_id, index):
     if not ObjectId.is_valid(resume_id):
         return jsonify({"error": "Invalid resume ID"}), 400
 
-    doc = biography_collection.find_one({
-        "_id": ObjectId(resume_id),
-        "user_id": request.user_id
-    })
-    if not doc:
-        return jsonify({"error": "Resume not found"}), 404
-
-    parse_result = doc.get("parse_result", {})
-    edus = parse_result.get("education", [])
-    if not isinstance(edus, list):
-        return jsonify({"error": "Malformed education data"}), 500
-
-    if index < 0 or index >= len(edus):
-        return jsonify({"error": f"Invalid index: {index}"}), 400
-
     # Remove the item
-    edus.pop(index)
-
-    result = biography_collection.update_one(
-        {"_id": ObjectId(resume_id), "user_id": request.user_id},
-        {"$set": {"parse_result.education": edus}}
-    )
+    edus, version = _edit_array_entry(resume_id, "parse_result.education", index,
+                                      _without_entry("parse_result.education", index))
+    if edus is None:
+        if not _resume_exists(resume_id):
+            return jsonify({"error": "Resume not found"}), 404
+        return jsonify({"error": f"Invalid index: {index}"}), 400
 
-    return jsonify({"message": "Education entry deleted"}), 200
+    return jsonify({"message": "Education entry deleted", "education": edus, "version": version}), 200
 
 
 
@@ -407,11 +470,10 @@ def set_educations(resume_id):
     if not isinstance(newList, list):
         return jsonify({"error": "Missing or invalid educations payload"}), 400
 
-    biography_collection.update_one(
-        {"_id": ObjectId(resume_id), "user_id": request.user_id},
-        {"$set": {"parse_result.education": newList}}
-    )
-    return jsonify({"success": True}), 200
+    version = _update_resume(resume_id, {"$set": {"parse_result.education": newList}, "$inc": VERSION_BUMP})
+    if version is None:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify({"success": True, "version": version}), 200
 
 @resume_bp.route("/resume/<resume_id>", methods=["GET"])
 @require_firebase_auth
@@ -420,11 +482,16 @@ def get_resume(resume_id):
     if not ObjectId.is_valid(resume_id):
         return jsonify({"error": "Invalid resume ID"}), 400
     
-    # 2) Load document
+    # 2) Load only the fields the response is built from (?fields= narrows it further)
+    try:
+        fields = requested_fields(set(RESUME_SECTIONS) | {"name", "version"})
+    except UnknownFieldError as e:
+        return jsonify({"error": str(e)}), 400
+
     doc = biography_collection.find_one({
         "_id": ObjectId(resume_id),
         "user_id": request.user_id  # Ensure the user owns this resume
-    })
+    }, sparse_projection(fields, RESUME_PROJECTION, RESUME_FIELD_PATHS))
     if not doc:
         return jsonify({"error": "Resume not found"}), 404
     
@@ -445,8 +512,86 @@ def get_resume(resume_id):
         "skills": parse.get("skills", {}),
         "jobs": parse.get("jobs", []),
         "education": parse.get("education", []),
+        "version": doc.get("version", 0),
     }
-    return  jsonify(payload), 200
+    return  jsonify(sparse_payload(payload, fields)), 200
+
+@resume_bp.route("/resume/<resume_id>", methods=["PATCH"])
+@require_firebase_auth
+def patch_resume(resume_id):
+    """
+    Apply a JSON Patch (RFC 6902) to parse_result in one write. The body is
+    {"version": n, "operations": [...]}, or a bare list of operations with the
+    version in an If-Match header. The write only lands if the resume is still
+    at the version the patch was applied to; otherwise 409 with the current
+    version so the client can reload and retry.
+    """
+    if not ObjectId.is_valid(resume_id):
+        return jsonify({"error": "Invalid resume ID"}), 400
+
+    data = request.get_json(silent=True)
+    if isinstance(data, list):
+        operations, expected = data, request.headers.get("If-Match", "").strip('"') or None
+    elif isinstance(data, dict):
+        operations, expected = data.get("operations"), data.get("version")
+    else:
+        return jsonify({"error": "Missing JSON Patch payload"}), 400
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if expected is not None:
+        try:
+            expected = int(expected)
+        except (TypeError, ValueError):
+            return jsonify({"error": "version must be an integer"}), 400
+
+    # 1) Only the editable sections of parse_result may be written or copied from
+    try:
+        paths = touched_paths(operations)
+        sources = source_paths(operations)
+    except JsonPatchError as e:
+        return jsonify({"error": str(e)}), 400
+    for tokens in paths + sources:
+        if not _patchable(tokens):
+            return jsonify({"error": f"Path not editable: /{'/'.join(tokens)}"}), 400
+
+    doc = biography_collection.find_one(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id},
+        {"parse_result": 1, "version": 1}
+    )
+    if not doc:
+        return jsonify({"error": "Resume not found"}), 404
+    current = doc.get("version", 0)
+    if expected is not None and expected != current:
+        return jsonify({"error": "Resume was modified by another save", "version": current}), 409
+
+    # 2) Apply in memory and validate every section the patch wrote to
+    try:
+        patched = apply_patch(doc.get("parse_result") or {}, operations)
+    except JsonPatchTestFailed as e:
+        return jsonify({"error": str(e), "version": current}), 409
+    except JsonPatchError as e:
+        return jsonify({"error": str(e)}), 400
+
+    for key, validate in PATCH_VALIDATORS.items():
+        if not any(tokens[:len(key)] == list(key[:len(tokens)]) for tokens in paths):
+            continue
+        value = patched
+        for part in key:
+            value = value.get(part) if isinstance(value, dict) else None
+        error = validate(value)
+        if error:
+            return jsonify({"error": error}), 400
+
+    # 3) One conditional write; a concurrent edit in between bumped the version
+    version_filter = {"version": current} if current else {"version": {"$in": [0, None]}}
+    result = biography_collection.update_one(
+        {"_id": ObjectId(resume_id), "user_id": request.user_id, **version_filter},
+        {"$set": {"parse_result": patched}, "$inc": VERSION_BUMP}
+    )
+    if result.matched_count == 0:
+        return jsonify({"error": "Resume was modified by another save"}), 409
+
+    return jsonify({"message": "Resume updated", "version": current + 1}), 200
 
 @resume_bp.route("/api/reparse-history/<resume_id>", methods=["POST"])
 @require_firebase_auth
@@ -459,23 +604,16 @@ def reparse_resume(resume_id):
     doc = biography_collection.find_one({
         "_id": ObjectId(resume_id),
         "user_id": request.user_id
-    })
+    }, WITHOUT_FILE_CONTENT)
     if not doc:
         return jsonify({"error": "Resume not found"}), 404
 
     # 3) determine source for re-parsing
     text = None
 
-    if doc.get("file_content") and doc.get("filename"):
-        # Original upload with file
-        suffix = os.path.splitext(doc["filename"])[1]  # e.g. ".pdf", ".docx", ".txt", etc.
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(doc["file_content"])
-            tmp_path = tmp.name
-        try:
-            text = extract_text(tmp_path)
-        finally:
-            os.remove(tmp_path)
+    if doc.get("file_type") and doc.get("filename"):
+        # Original upload with file; bytes come from the blob store only on a cache miss
+        text = extract_upload_text(doc)
 
     elif doc.get("biography_text"):
         # no original file—fall back to the raw text the user pasted
@@ -487,33 +625,17 @@ def reparse_resume(resume_id):
         if not source_ids:
             return jsonify({"error": "Generated resume has no source uploads"}), 400
         
-        text_parts = []
-        for source_id in source_ids:
-            try:
-                source_doc = biography_collection.find_one({
-                    "_id": ObjectId(source_id),
-                    "user_id": request.user_id  # Ensure the user owns this source
-                })
-                if not source_doc:
-                    continue  # Skip if source not found
-                
-                if source_doc.get("biography_text"):
-                    text_parts.append(source_doc["biography_text"])
-
-                elif source_doc.get("file_content") and source_doc.get("file_type"):
-                    suffix = f".{source_doc['file_type']}"
-
-                    # Create a temporary file to extract text from the source
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                        tmp.write(source_doc["file_content"])
-                        tmp_path = tmp.name
-                    try:
-                        extracted = extract_text(tmp_path)
-                        text_parts.append(extracted)
-                    finally:
-                        os.remove(tmp_path)
-            except Exception:
-                continue  # Ignore any errors with individual sources
+        source_oids = [ObjectId(sid) for sid in source_ids if ObjectId.is_valid(sid)]
+        found = {
+            d["_id"]: d for d in biography_collection.find({
+                "_id": {"$in": source_oids},
+                "user_id": request.user_id  # Ensure the user owns these sources
+            }, WITHOUT_FILE_CONTENT)
+        }
+        # Skip sources that are missing; keep the original createdFrom order
+        source_docs = [found[oid] for oid in source_oids if oid in found]
+
+        text_parts = [t for t in collect_source_texts(source_docs) if t]
 
         if not text_parts:
             return jsonify({"error": "No valid source uploads found for re-parsing"}), 400
@@ -531,15 +653,15 @@ def reparse_resume(resume_id):
         return jsonify({"error": f"Re-parse failed: {e}"}), 500
 
     # 5) overwrite parse_result wholesale
-    biography_collection.update_one(
-        {"_id": ObjectId(resume_id), "user_id": request.user_id},
-        {"$set": {"parse_result": new_parse}}
-    )
+    version = _update_resume(resume_id, {"$set": {"parse_result": new_parse}, "$inc": VERSION_BUMP})
+    if version is None:
+        return jsonify({"error": "Resume not found"}), 404
 
     # 6) return the brand-new structure
     return jsonify({
         "message": "Re-parse successful",
-        "parse_result": new_parse
+        "parse_result": new_parse,
+        "version": version
     }), 200
 
 # Flip the incomplete to complete
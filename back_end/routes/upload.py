@@ -2,11 +2,13 @@ from flask import Blueprint, jsonify, request
 from db import biography_collection
 from bson import ObjectId
 from datetime import datetime
-import tempfile, os
-from parser.extractors import extract_text
+from .extraction_utils import extract_cached, extract_upload_text, collect_source_texts
 from .auth_utils import require_firebase_auth
+from .download_utils import not_modified, stream_file
+from .field_utils import requested_fields, sparse_projection, UnknownFieldError
+from .pagination_utils import fetch_page, paged_response, InvalidCursorError
 from .firebase_admin_init import auth
-import base64
+from blob_store import get_blob_store, open_upload_file, release_upload_blob, WITHOUT_FILE_CONTENT
 
 # Define the Blueprint
 upload_bp = Blueprint("upload", __name__)
@@ -15,6 +17,13 @@ upload_bp = Blueprint("upload", __name__)
 MAX_FILE_SIZE = 15 * 1024 * 1024
 ALLOWED_EXTENSIONS = {"pdf", "docx", "txt", "md", "odt"}
 PREVIEW_LEN = 80 # Number of characters shown in the preview
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "odt": "application/vnd.oasis.opendocument.text",
+    "txt": "text/plain; charset=utf-8",
+    "md": "text/markdown; charset=utf-8",
+}
 
 # Utility Function
 def make_snippet(text: str, max_len: int = PREVIEW_LEN) -> str:
@@ -55,24 +64,26 @@ def upload():
         if not content:
             return jsonify({"error": "Uploaded file is empty"}), 400
 
+        # Content-addressed, so the reference doubles as the hash
+        try:
+            file_ref = get_blob_store().put(content)
+        except Exception as e:
+            return jsonify({"error": f"File storage error: {str(e)}"}), 500
+
         doc.update({
             "filename": filename,
             "file_type": extension,
-            "file_content": content,
+            "file_ref": file_ref,
+            "file_size": len(content),
+            "file_sha256": file_ref,
         })
 
         # Generate preview snippet from file
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{extension}") as tmp:
-                tmp.write(content)
-                tmp_path = tmp.name
-            extracted_text = extract_text(tmp_path) or ""
+            extracted_text = extract_cached(content, extension, doc["file_sha256"]) or ""
             doc["snippet"] = make_snippet(extracted_text)
         except Exception:
             doc["snippet"] = None          # extraction failed / binary PDF
-        finally:
-            if 'tmp_path' in locals():
-                os.remove(tmp_path)
 
     # --------  B) Pure-text upload  ------------------------------
     if biography_text:
@@ -101,10 +112,16 @@ def get_data(id):
     except Exception:
         return jsonify({"error": "Invalid ID format"}), 400
 
+    # ?fields=parse_result.skills,parse_result.jobs returns just those sections
+    try:
+        fields = requested_fields({"parse_result"})
+    except UnknownFieldError as e:
+        return jsonify({"error": str(e)}), 400
+
     doc = biography_collection.find_one({
         "_id": oid, 
         "user_id": request.user_id
-    })
+    }, sparse_projection(fields, {"parse_result": 1}))
     if not doc:
         return jsonify({"error": "Document not found"}), 404
     
@@ -119,23 +136,28 @@ def get_data(id):
 
 
 # ───────────────────────────────
-# GET /uploads  – list all entries
+# GET /uploads  – list entries, one page per ?cursor=
 # ───────────────────────────────
 @upload_bp.route("/uploads", methods=["GET"])
 @require_firebase_auth
 def list_uploads():
-    cursor = biography_collection.find(
-        {"createdFrom": {"$exists": False}, "user_id": request.user_id},
-        {
-            "filename": 1,
-            "biography_text": 1,   # kept for hasText flag
-            "snippet": 1,
-            "uploadedAt": 1,
-        }
-    ).sort("uploadedAt", -1)
+    try:
+        docs, next_cursor = fetch_page(
+            biography_collection,
+            {"createdFrom": {"$exists": False}, "user_id": request.user_id},
+            {
+                "filename": 1,
+                "biography_text": 1,   # kept for hasText flag
+                "snippet": 1,
+                "uploadedAt": 1,
+            },
+            "uploadedAt",
+        )
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
 
     out = []
-    for doc in cursor:
+    for doc in docs:
         ts = doc.get("uploadedAt") or datetime.utcnow()
         out.append({
             "id": str(doc["_id"]),
@@ -144,10 +166,11 @@ def list_uploads():
             "snippet": doc.get("snippet"),
             "uploadedAt": ts.isoformat(),
         })
-    return jsonify(out), 200
+    return paged_response(out, next_cursor)
 
 # ──────────────────────────────────────────────────────────────
-# GET /uploads/<id>/content – get single upload with file content
+# GET /uploads/<id>/content – get single upload metadata
+# (the file itself is served by /uploads/<id>/file)
 # ──────────────────────────────────────────────────────────────
 @upload_bp.route("/uploads/<id>/content", methods=["GET"])
 @require_firebase_auth
@@ -160,38 +183,26 @@ def get_upload(id):
     doc = biography_collection.find_one({
         "_id": oid,
         "user_id": request.user_id  # Only allow user's own uploads
-    })
+    }, WITHOUT_FILE_CONTENT)
 
     if not doc:
         return jsonify({"error": "Document not found"}), 404
     
 
-    # Convert bytes to base64 for JSON serialization
-    file_content = doc.get("file_content")
-    if file_content and isinstance(file_content, bytes):
-        file_content = base64.b64encode(file_content).decode('utf-8')
-    
-    # For ODT files, extract text for preview
+    # For ODT files, extract text for preview (served from the extraction cache after the first call)
     extracted_text_content = None
-    if doc.get("file_type") == "odt" and doc.get("file_content"):
+    if doc.get("file_type") == "odt":
         try:
-            # Save to a temporary file to extract text
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".odt") as tmp:
-                tmp.write(doc["file_content"])
-                tmp_path = tmp.name
-            
-            extracted_text_content = extract_text(tmp_path)
-            os.remove(tmp_path)  # Clean up temp file
+            extracted_text_content = extract_upload_text(doc)
         except Exception as e:
             print(f"ODT text extraction failed: {e}")
             extracted_text_content = None
 
-    # Return the full document (including file_content for preview)
     result = {
         "_id": str(doc["_id"]),
         "filename": doc.get("filename"),
-        "file_content": file_content,
         "file_type": doc.get("file_type"),
+        "file_size": doc.get("file_size"),
         "biography_text": doc.get("biography_text"),
         "snippet": doc.get("snippet"),
         "extracted_text": extracted_text_content,  # For ODT files
@@ -200,6 +211,40 @@ def get_upload(id):
     
     return jsonify(result), 200
 
+# ──────────────────────────────────────────────────────────────
+# GET /uploads/<id>/file – stream the original upload bytes
+# ──────────────────────────────────────────────────────────────
+@upload_bp.route("/uploads/<id>/file", methods=["GET"])
+@require_firebase_auth
+def get_upload_file(id):
+    try:
+        oid = ObjectId(id)
+    except Exception:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    doc = biography_collection.find_one({
+        "_id": oid,
+        "user_id": request.user_id  # Only allow user's own uploads
+    }, {"filename": 1, "file_type": 1, "file_ref": 1, "file_sha256": 1})
+
+    if not doc:
+        return jsonify({"error": "Document not found"}), 404
+    if not doc.get("file_type"):
+        return jsonify({"error": "Upload has no file"}), 404
+
+    # The bytes behind an upload never change, so its content hash is a strong ETag
+    etag = doc.get("file_sha256")
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    try:
+        fh, size = open_upload_file(doc)
+    except Exception as e:
+        return jsonify({"error": f"File storage error: {str(e)}"}), 500
+
+    return stream_file(fh, size, MIME_TYPES.get(doc["file_type"], "application/octet-stream"), etag)
+
 # ───────────────────────────────
 # DELETE /uploads/<id>  – remove
 # ───────────────────────────────
@@ -211,14 +256,20 @@ def delete_upload(id):
     except Exception:
         return jsonify({"error": "Invalid ID"}), 400
 
-    result = biography_collection.delete_one({
+    doc = biography_collection.find_one_and_delete({
         "_id": oid,
         "user_id": request.user_id # Only allow deleting your own uploads
-    })
+    }, projection={"file_ref": 1})
 
-    if result.deleted_count == 0:
+    if not doc:
         return jsonify({"error": "Upload not found"}), 404
 
+    # Identical files share one blob; drop it with its last reference
+    try:
+        release_upload_blob(doc.get("file_ref"))
+    except Exception as e:
+        print(f"Failed to release upload blob: {e}")
+
     return jsonify({"message": "Upload deleted"}), 200
 
 # ─────────────────────────────────────────
@@ -234,35 +285,33 @@ def generate_resume():
     if not ids or not name:
         return jsonify({"error": "ids and name are required"}), 400
 
-    # 1) Load every selected upload
-    sources = []
+    # 1) Load every selected upload in one round-trip
+    oids = []
     for _id in ids:
         try:
-            doc = biography_collection.find_one({
-                "_id": ObjectId(_id),
-                "user_id": request.user_id  # Only allow user's own uploads
-        })
+            oids.append(ObjectId(_id))
         except Exception:
             return jsonify({"error": f"Invalid upload id: {_id}"}), 400
-        if not doc:
+
+    found = {
+        d["_id"]: d for d in biography_collection.find({
+            "_id": {"$in": oids},
+            "user_id": request.user_id  # Only allow user's own uploads
+        }, WITHOUT_FILE_CONTENT)
+    }
+    sources = []
+    for _id, oid in zip(ids, oids):
+        if oid not in found:
             return jsonify({"error": f"Upload not found or not authorized: {_id}"}), 404
-        sources.append(doc)
+        sources.append(found[oid])
 
-    # 2) Concatenate text for LLM
+    # 2) Concatenate text for LLM (file extraction runs in parallel)
     full_text_parts = []
-    for s in sources:
-        if s.get("biography_text"): # raw text upload
-            full_text_parts.append(s["biography_text"])
-        elif s.get("file_content") and s.get("file_type"):  # run extractor
-            suffix = f".{s['file_type']}"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                tmp.write(s["file_content"])
-                tmp_path = tmp.name
-            try:
-                text = extract_text(tmp_path)
-                full_text_parts.append(text)
-            finally:
-                os.remove(tmp_path)
+    for s, text in zip(sources, collect_source_texts(sources)):
+        if text is not None:
+            full_text_parts.append(text)
+        elif s.get("file_type"):
+            return jsonify({"error": f"Text extraction failed for upload: {s.get('filename') or s['_id']}"}), 500
 
     full_text = "\n\n".join(full_text_parts)
 
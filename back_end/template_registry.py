@@ -0,0 +1,151 @@
+"""
+Registry of LaTeX resume templates, loaded and validated once per process.
+
+Style configs (latex_templates/<name>.py) are executed once and the layout
+sources (base_template.tex, two_column_template.tex) are read once and split
+on their {{PLACEHOLDER}} markers, so rendering a resume is a single join with
+no file I/O. Set LATEX_TEMPLATE_HOT_RELOAD=true in development to pick up
+edits to template files by their mtime.
+"""
+import importlib.util
+import os
+import re
+import threading
+from pathlib import Path
+
+LATEX_TEMPLATE_HOT_RELOAD = os.getenv("LATEX_TEMPLATE_HOT_RELOAD", "false").lower() == "true"
+TEMPLATES_DIR = Path(__file__).parent / "latex_templates"
+
+SINGLE_COLUMN_LAYOUT = "base_template.tex"
+TWO_COLUMN_LAYOUT = "two_column_template.tex"
+
+PLACEHOLDER_REGEX = re.compile(r"\{\{([A-Z_]+)\}\}")
+
+# Attributes every style config must define, with the values used when one cannot be loaded
+CONFIG_DEFAULTS = {
+    "TEMPLATE_CUSTOMIZATIONS": "",
+    "SECTION_COLOR": "",
+    "SECTION_UNDERLINE_COLOR": "\\color{black}",
+    "NAME_STYLE": "\\Huge \\scshape",
+    "FONT_PACKAGES": "",
+}
+
+
+class TemplateConfig:
+    """Style settings of one template, copied out of its config module."""
+
+    def __init__(self, name: str, values: dict):
+        self.name = name
+        for attr in CONFIG_DEFAULTS:
+            setattr(self, attr, values[attr])
+
+
+class CompiledTemplate:
+    """
+    A layout source pre-split into literal text and placeholder names.
+    Even positions of `parts` are literal text, odd positions are names.
+    """
+
+    def __init__(self, source: str):
+        self.parts = PLACEHOLDER_REGEX.split(source)
+        self.placeholders = set(self.parts[1::2])
+
+    def render(self, values: dict) -> str:
+        """Substitute placeholders in one pass; names without a value are left as-is."""
+        out = list(self.parts)
+        for i in range(1, len(out), 2):
+            name = out[i]
+            out[i] = values[name] if name in values else f"{{{{{name}}}}}"
+        return "".join(out)
+
+
+def _load_config(path: Path) -> TemplateConfig:
+    spec = importlib.util.spec_from_file_location(f"latex_template_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    missing = [attr for attr in CONFIG_DEFAULTS if not isinstance(getattr(module, attr, None), str)]
+    if missing:
+        raise ValueError(f"Template config {path.name} is missing string attributes: {', '.join(missing)}")
+    return TemplateConfig(path.stem, {attr: getattr(module, attr) for attr in CONFIG_DEFAULTS})
+
+
+def _load_layout(path: Path) -> CompiledTemplate:
+    return CompiledTemplate(path.read_text(encoding="utf-8"))
+
+
+class TemplateRegistry:
+    """Loaded template configs and layouts, keyed by file name stem / file name."""
+
+    def __init__(self, directory: Path = TEMPLATES_DIR, hot_reload: bool = LATEX_TEMPLATE_HOT_RELOAD):
+        self.directory = Path(directory)
+        self.hot_reload = hot_reload
+        self._configs = {}
+        self._layouts = {}
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self.load_all()
+
+    def load_all(self):
+        """Load every config and layout; a broken config is reported and skipped."""
+        with self._lock:
+            for path in sorted(self.directory.glob("*.py")):
+                self._load(path)
+            for name in (SINGLE_COLUMN_LAYOUT, TWO_COLUMN_LAYOUT):
+                self._load(self.directory / name)
+        if "default" not in self._configs:
+            print("Template config default.py could not be loaded, using built-in defaults")
+
+    def _load(self, path: Path):
+        """(Re)load one template file and record its mtime. Caller holds the lock."""
+        try:
+            self._mtimes[path] = path.stat().st_mtime
+            if path.suffix == ".py":
+                self._configs[path.stem] = _load_config(path)
+            else:
+                self._layouts[path.name] = _load_layout(path)
+        except Exception as e:
+            print(f"Error loading LaTeX template {path.name}: {e}")
+            if path.suffix != ".py":
+                raise
+
+    def _refresh(self, path: Path):
+        """Reload a file whose mtime changed since it was loaded (hot reload only)."""
+        if not self.hot_reload:
+            return
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return
+        with self._lock:
+            if self._mtimes.get(path) != mtime:
+                print(f"Reloading LaTeX template {path.name}")
+                try:
+                    self._load(path)
+                except Exception:
+                    pass  # keep serving the last good version
+
+    def get_config(self, name: str) -> TemplateConfig:
+        """Style config by base template name, falling back to default."""
+        path = self.directory / f"{name}.py"
+        self._refresh(path)
+        config = self._configs.get(name) or self._configs.get("default")
+        return config or TemplateConfig("default", CONFIG_DEFAULTS)
+
+    def get_layout(self, two_column: bool = False) -> CompiledTemplate:
+        name = TWO_COLUMN_LAYOUT if two_column else SINGLE_COLUMN_LAYOUT
+        self._refresh(self.directory / name)
+        return self._layouts[name]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Process-wide template registry, loaded on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TemplateRegistry()
+        return _registry
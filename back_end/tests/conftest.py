@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the back end tests. Tests that need MongoDB run against
+the server in MONGO_TEST_URI, in a throwaway database that is dropped at the
+end of the run, and are skipped when it is not set.
+"""
+import os
+import secrets
+import sys
+import time
+import uuid
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI")
+
+# Must be set before db.py is imported: never point tests at the real database
+os.environ["MONGO_DB_NAME"] = f"fiveguys_test_{uuid.uuid4().hex[:12]}"
+if MONGO_TEST_URI:
+    os.environ["MONGO_URI"] = MONGO_TEST_URI
+os.environ.setdefault("FORMATTED_PDF_URL_SECRET", secrets.token_hex(32))
+
+# routes.firebase_admin_init loads the service account at import; tests never call
+# Firebase (see auth_headers), so application default credentials stand in for it
+if not os.getenv("FIREBASE_ADMINSDK_PATH"):
+    from firebase_admin import credentials
+    credentials.Certificate = lambda path: credentials.ApplicationDefault()
+
+
+@pytest.fixture(scope="session")
+def test_db():
+    """The throwaway test database, reachable through the collections in db.py."""
+    if not MONGO_TEST_URI:
+        pytest.skip("MONGO_TEST_URI is not set")
+    from db import client, db
+    try:
+        client.admin.command("ping")
+    except Exception as e:
+        pytest.skip(f"Test database unreachable: {e}")
+    yield db
+    client.drop_database(db.name)
+
+
+@pytest.fixture
+def auth_headers(monkeypatch):
+    """
+    Returns a function giving Authorization headers for a user id. Only tokens
+    handed out here verify; Firebase is never called.
+    """
+    from routes import auth_utils
+    issued = {}
+
+    def verify_id_token(id_token, *args, **kwargs):
+        if id_token not in issued:
+            raise ValueError("Unknown test token")
+        return issued[id_token]
+
+    def headers_for(user_id: str) -> dict:
+        token = f"test-{secrets.token_hex(16)}"
+        issued[token] = {"uid": user_id, "sub": user_id, "exp": time.time() + 3600}
+        return {"Authorization": f"Bearer {token}"}
+
+    monkeypatch.setattr(auth_utils.auth, "verify_id_token", verify_id_token)
+    return headers_for
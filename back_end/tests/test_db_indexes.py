@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from bson import ObjectId
+import db_indexes
+from db import (
+    biography_collection,
+    job_ads_collection,
+    completed_resumes_collection,
+    resume_generation_jobs_collection,
+)
+
+
+def _seed():
+    """A few documents per list query, for two users, so the planner has a real choice."""
+    now = datetime.utcnow()
+    for user_id in ("user-a", "user-b"):
+        for i in range(5):
+            at = now - timedelta(minutes=i)
+            biography_collection.insert_one({"user_id": user_id, "uploadedAt": at, "filename": f"{i}.pdf"})
+            job_ads_collection.insert_one({"user_id": user_id, "uploaded_at": at})
+            completed_resumes_collection.insert_one({
+                "user_id": user_id, "status": "applied", "applied_at": at, "created_at": at,
+                "generation_job_id": str(ObjectId()),
+            })
+            resume_generation_jobs_collection.insert_one({
+                "user_id": user_id, "status": "completed", "created_at": at, "available_at": at,
+            })
+
+
+def test_declared_indexes_are_created(test_db):
+    db_indexes.ensure_indexes()
+    for collection, _, options in db_indexes.INDEXES:
+        assert options["name"] in collection.index_information(), f"{collection.name}.{options['name']}"
+
+
+def test_list_queries_use_an_index(test_db):
+    db_indexes.ensure_indexes()
+    _seed()
+    assert db_indexes.check_query_plans() == []
+
+
+def test_ensure_indexes_is_idempotent(test_db):
+    db_indexes.ensure_indexes()
+    before = {c.name: c.index_information() for c, _, _ in db_indexes.INDEXES}
+    db_indexes.ensure_indexes()
+    after = {c.name: c.index_information() for c, _, _ in db_indexes.INDEXES}
+    assert before == after
@@ -0,0 +1,38 @@
+import pytest
+from routes.json_patch import apply_patch, touched_paths, source_paths, JsonPatchError
+
+
+@pytest.mark.parametrize("operations", [
+    ["foo"],
+    [None],
+    [{"path": "/jobs"}],
+    [{"op": ["add"], "path": "/jobs", "value": []}],
+    [{"op": "add", "path": 3, "value": []}],
+    [{"op": "copy", "path": "/jobs/-"}],
+    [{"op": "move", "path": "/jobs/0", "from": {"x": 1}}],
+    [{"op": "replace", "path": "/career_objective"}],
+])
+def test_malformed_operations_are_rejected(operations):
+    with pytest.raises(JsonPatchError):
+        touched_paths(operations)
+    with pytest.raises(JsonPatchError):
+        apply_patch({}, operations)
+
+
+def test_paths_written_and_read():
+    operations = [
+        {"op": "move", "path": "/jobs/0", "from": "/jobs/1"},
+        {"op": "copy", "path": "/skills/Languages", "from": "/skills/Tools"},
+        {"op": "add", "path": "/contact/emails/-", "value": "a@b.co"},
+    ]
+    assert touched_paths(operations) == [
+        ["jobs", "0"], ["jobs", "1"], ["skills", "Languages"], ["contact", "emails", "-"],
+    ]
+    assert source_paths(operations) == [["jobs", "1"], ["skills", "Tools"]]
+
+
+def test_apply_patch_leaves_input_untouched():
+    doc = {"jobs": [{"title": "a"}, {"title": "b"}]}
+    patched = apply_patch(doc, [{"op": "move", "path": "/jobs/0", "from": "/jobs/1"}])
+    assert patched == {"jobs": [{"title": "b"}, {"title": "a"}]}
+    assert doc == {"jobs": [{"title": "a"}, {"title": "b"}]}
@@ -0,0 +1,109 @@
+"""
+The single-pass escaper must produce what the replace() chain it replaced did,
+on the sample resumes in LLM_Tests and on every character the old escaper
+handled. It differs on purpose for decomposed accents (composed to NFC first),
+curly quotes and the backslash, which the old escaper mangled.
+"""
+import unicodedata
+from pathlib import Path
+import pytest
+from latex_compiler import LaTeXCompiler
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / "LLM_Tests"
+
+# Characters only the new escaper handles: curly quotes, and the backslash, whose
+# \textbackslash{} the old escaper went on to mangle into \textbackslash\{\}
+NOT_COMPARABLE = set('\\\u201c\u201d\u2018\u2019')
+# One of each character the old escaper did handle
+OLD_SPECIALS = '{}$&%#^_~"'
+
+
+def old_escape_latex_text(text):
+    """The escaper before the single regex pass, copied unchanged."""
+    if not text:
+        return ""
+
+    # Convert to string if not already
+    text = str(text)
+
+    # Dictionary of LaTeX special characters and their escaped versions
+    latex_special_chars = {
+        '\\': r'\textbackslash{}',
+        '{': r'\{',
+        '}': r'\}',
+        '$': r'\$',
+        '&': r'\&',
+        '%': r'\%',
+        '#': r'\#',
+        '^': r'\textasciicircum{}',
+        '_': r'\_',
+        '~': r'\textasciitilde{}',
+    }
+
+    # Escape special characters
+    for char, escaped in latex_special_chars.items():
+        text = text.replace(char, escaped)
+
+    # Handle quotes
+    text = text.replace('"', "''")
+    text = text.replace('"', "''")
+    text = text.replace('"', "''")
+    text = text.replace("'", "'")
+    text = text.replace("'", "'")
+
+    return text
+
+
+def _sample_fields():
+    """Resume text split into field-sized strings: each line and each comma-separated item."""
+    fields = []
+    for path in sorted(SAMPLES_DIR.rglob("*.txt")):
+        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if line:
+                fields.append(line)
+                fields.extend(item.strip() for item in line.split(",") if item.strip())
+    return fields
+
+
+def _comparable(text):
+    return not NOT_COMPARABLE.intersection(text) and unicodedata.is_normalized("NFC", text)
+
+
+@pytest.fixture(scope="module")
+def escape():
+    return LaTeXCompiler().escape_latex_text
+
+
+def test_matches_old_escaper(escape):
+    corpus = [f for f in _sample_fields() if _comparable(f)]
+    assert corpus, f"No sample resumes found under {SAMPLES_DIR}"
+    corpus += list(OLD_SPECIALS) + [OLD_SPECIALS, "R&D at 100% for C# & C++ (~$5k)", "", None]
+    mismatches = [text for text in corpus if escape(text) != old_escape_latex_text(text)]
+    assert not mismatches, f"{len(mismatches)} input(s) escape differently, e.g. {mismatches[:5]!r}"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Cafe\u0301 & Bar", "Caf\u00e9 \\& Bar"),
+    ("Jose\u0301 Nu\u0301n\u0303ez", "Jos\u00e9 N\u00fa\u00f1ez"),
+    ("Caf\u00e9", "Caf\u00e9"),
+])
+def test_composes_accents_to_nfc(escape, text, expected):
+    assert escape(text) == expected
+    # Matches the old escaper once the input is composed
+    assert escape(text) == old_escape_latex_text(unicodedata.normalize("NFC", text))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("\u201cTeam player\u201d", "``Team player''"),
+    ("\u2018Agile\u2019 coach", "`Agile' coach"),
+    ("Led the team\u2019s \u201cmove fast\u201d effort", "Led the team's ``move fast'' effort"),
+    ('Said "hi"', "Said ''hi''"),
+])
+def test_curly_quotes(escape, text, expected):
+    assert escape(text) == expected
+
+
+def test_backslash_is_escaped_once(escape):
+    assert escape("C:\\Users") == "C:\\textbackslash{}Users"
+    assert old_escape_latex_text("C:\\Users") == "C:\\textbackslash\\{\\}Users"
@@ -0,0 +1,137 @@
+"""
+Guard against list endpoints growing heavy payloads again: seed one user with
+documents carrying every large field the collections hold (file bytes, full
+texts, tailored resumes, legacy data: URL PDFs) and check that no list item
+serializes past its endpoint's budget.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+import pytest
+from bson import Binary
+from flask import Flask
+from db import (
+    biography_collection,
+    job_ads_collection,
+    completed_resumes_collection,
+    resume_generation_jobs_collection,
+)
+from routes.upload import upload_bp
+from routes.resume import resume_bp
+from routes.job_ads import job_ads_bp
+from routes.completed_resumes import completed_resumes_bp
+from routes.format import format_bp
+
+USER_ID = "budget-user"
+
+# Maximum serialized size of one list item, in bytes
+LIST_ITEM_BYTE_BUDGETS = {
+    "/uploads": 1024,
+    "/resume/resumes": 256,
+    "/job_ads": 512,
+    "/completed_resumes": 2048,
+    "/resume_generation_jobs": 1024,
+}
+
+LONG_TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 2000  # ~114 KB
+LEGACY_PDF_URL = "data:application/pdf;base64," + base64.b64encode(b"%PDF-1.4\n" + b"0" * 200_000).decode("ascii")
+
+
+def _parse_result():
+    job = {
+        "title": "Software Engineer", "company": "Acme", "location": "Newark, NJ",
+        "start_date": "2021-01", "end_date": "Present", "role_summary": LONG_TEXT[:2000],
+        "responsibilities": [LONG_TEXT[:500]] * 10, "accomplishments": [LONG_TEXT[:500]] * 10,
+    }
+    return {
+        "first_name": "Ada", "last_name": "Lovelace",
+        "contact": {"emails": ["ada@example.com"], "phones": ["555-555-5555"]},
+        "career_objective": LONG_TEXT[:2000],
+        "skills": {"Languages": ["Python", "TypeScript"] * 50},
+        "jobs": [job] * 5,
+        "education": [{"institution": "NJIT", "degree": "BS", "start_date": "2017", "end_date": "2021", "GPA": 3.9}],
+    }
+
+
+def _seed():
+    now = datetime.utcnow()
+    for i in range(3):
+        at = now - timedelta(minutes=i)
+        upload_id = biography_collection.insert_one({
+            "user_id": USER_ID,
+            "filename": f"resume-{i}.pdf",
+            "file_type": "application/pdf",
+            "file_content": Binary(b"%PDF-1.4\n" + b"0" * 200_000),  # pre-blob-store upload
+            "biography_text": LONG_TEXT,
+            "snippet": LONG_TEXT[:200],
+            "parse_result": _parse_result(),
+            "uploadedAt": at,
+        }).inserted_id
+        biography_collection.insert_one({
+            "user_id": USER_ID,
+            "name": f"Generated resume {i}",
+            "createdFrom": [str(upload_id)],
+            "parse_result": _parse_result(),
+            "isComplete": False,
+            "uploadedAt": at,
+        })
+        job_ad_id = job_ads_collection.insert_one({
+            "user_id": USER_ID,
+            "job_ad_text": LONG_TEXT,
+            "job_ad_url": "https://jobs.example.com/postings/12345",
+            "scraped_title": "Software Engineer at Acme",
+            "parse_result": {
+                "job_title": "Software Engineer", "company": "Acme", "location": "Remote",
+                "job_summary": LONG_TEXT[:1000],
+                "responsibilities": [LONG_TEXT[:200]] * 5,
+                "requirements": [LONG_TEXT[:200]] * 5,
+            },
+            "uploaded_at": at,
+        }).inserted_id
+        completed_id = completed_resumes_collection.insert_one({
+            "user_id": USER_ID,
+            "status": "applied",
+            "job_title": "Software Engineer",
+            "company": "Acme",
+            "created_at": at,
+            "applied_at": at,
+            "job_ad_id": str(job_ad_id),
+            "job_ad_data": {"job_title": "Software Engineer", "company": "Acme", "job_ad_text": LONG_TEXT},
+            "tailored_resume": _parse_result(),
+            "score_data": {"score": 87, "reasoning": LONG_TEXT[:5000]},
+            "source_resume_ids": [str(upload_id)],
+            "source_resume_names": [f"resume-{i}.pdf"],
+            "formatted_pdf_url": LEGACY_PDF_URL,  # pre-blob-store formatted PDF
+        }).inserted_id
+        resume_generation_jobs_collection.insert_one({
+            "user_id": USER_ID,
+            "job_ad_id": str(job_ad_id),
+            "resume_ids": [str(upload_id)],
+            "status": "completed",
+            "progress": 100,
+            "attempts": 1,
+            "created_at": at,
+            "available_at": at,
+            "completed_at": at,
+            "completed_resume_id": str(completed_id),
+        })
+
+
+@pytest.fixture(scope="module")
+def client(test_db):
+    _seed()
+    app = Flask(__name__)
+    for blueprint in (upload_bp, resume_bp, job_ads_bp, completed_resumes_bp, format_bp):
+        app.register_blueprint(blueprint)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("path, budget", LIST_ITEM_BYTE_BUDGETS.items())
+def test_list_items_within_budget(client, auth_headers, path, budget):
+    response = client.get(path, headers=auth_headers(USER_ID))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    items = response.get_json()
+    assert len(items) == 3
+    for item in items:
+        size = len(json.dumps(item, separators=(",", ":")))
+        assert size <= budget, f"GET {path}: item {item.get('_id') or item.get('id') or item.get('job_id')} is {size} bytes"
@@ -6,6 +6,7 @@ import { useParams, useRouter } from "next/navigation";
 import { getAuth } from "firebase/auth";
 import { IconDownload, IconArrowBack, IconArrowForward, IconCheck, IconColumns1, IconColumns2 } from "@tabler/icons-react";
 import { useTheme } from "@/context/themeContext";
+import { withDownloadName } from "@/lib/pdfLinks";
 
 interface CompletedResume {
     _id: string;
@@ -51,6 +52,7 @@ export default function FormatResumePage() {
     // Column layout toggle state
     const [isDoubleColumn, setIsDoubleColumn] = useState(false);
     const [availableTemplates, setAvailableTemplates] = useState<Template[]>([]);
+    const [previewImages, setPreviewImages] = useState<Record<string, string>>({});
     const [showContinueModal, setShowContinueModal] = useState(false);
 
     // Get theme-appropriate colors and styling
@@ -181,6 +183,43 @@ export default function FormatResumePage() {
         }
     }, [completedResumeId]);
 
+    // Render page-1 thumbnails of every template in one request once resume and templates are loaded
+    useEffect(() => {
+        if (!data?.tailored_resume || availableTemplates.length === 0) return;
+        let cancelled = false;
+
+        async function fetchPreviews() {
+            try {
+                const authHeaders = await getAuthHeaders();
+                const response = await fetch('http://localhost:5000/format_resume/previews', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        ...authHeaders,
+                    },
+                    body: JSON.stringify({
+                        resume_data: data!.tailored_resume,
+                        template_ids: availableTemplates.map(t => t.id),
+                    }),
+                });
+                if (!response.ok) return;
+                const result = await response.json();
+
+                const images: Record<string, string> = {};
+                for (const preview of result.previews || []) {
+                    if (preview.thumbnail_url) images[preview.template_id] = preview.thumbnail_url;
+                }
+                if (!cancelled) setPreviewImages(images);
+            } catch (err) {
+                // Thumbnails are a nice-to-have; the template list works without them
+                console.error('❌ Preview fetch error:', err);
+            }
+        }
+
+        fetchPreviews();
+        return () => { cancelled = true; };
+    }, [data, availableTemplates]);
+
     // Function to format resume (extracted for reuse)
     const formatResume = async (resumeData: CompletedResume, authHeaders?: any) => {
         if (!selectedTemplateId) {
@@ -443,6 +482,7 @@ export default function FormatResumePage() {
                         <SimpleGrid cols={{ base: 1, sm: 2, md: 3 }} spacing="md">
                             {templates.map((template) => {
                                 const isSelected = selectedTemplateId === template.id;
+                                const imageUrl = previewImages[template.id] || template.imageUrl;
                                 const isNightSky = theme === 'night-sky';
                                 return (
                                     <Card
@@ -478,9 +518,9 @@ export default function FormatResumePage() {
                                             </Badge>
                                         )}
                                         
-                                        {template.imageUrl && (
+                                        {imageUrl && (
                                             <Image
-                                                src={template.imageUrl}
+                                                src={imageUrl}
                                                 alt={`${template.name} preview`}
                                                 height={120}
                                                 fit="cover"
@@ -606,7 +646,9 @@ export default function FormatResumePage() {
                                         size="lg"
                                         onClick={() => {
                                             const link = document.createElement('a');
-                                            link.href = downloadUrl;
+                                            link.href = downloadUrl.startsWith('data:')
+                                                ? downloadUrl
+                                                : withDownloadName(downloadUrl, filename);
                                             link.download = filename;
                                             link.click();
                                         }}
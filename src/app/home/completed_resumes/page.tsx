@@ -1,11 +1,13 @@
 "use client";
 
-import React, { useEffect, useState } from "react";
+import React, { useState } from "react";
 import { Container, Title, Loader, Text, Stack, Card, Group, Button, Badge, ActionIcon, Tooltip, Modal } from "@mantine/core";
 import { useRouter } from "next/navigation";
 import { getAuth } from "firebase/auth";
 import { IconEye, IconDownload, IconBriefcase, IconX } from "@tabler/icons-react";
 import { useTheme } from "@/context/themeContext";
+import { withDownloadName } from "@/lib/pdfLinks";
+import { usePagedList } from "@/lib/pagination";
 
 interface JobApplication {
     _id: string;
@@ -22,9 +24,6 @@ interface JobApplication {
 export default function JobApplicationsPage() {
     const router = useRouter();
     const { theme } = useTheme();
-    const [applications, setApplications] = useState<JobApplication[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState<string | null>(null);
     const [pdfModalOpen, setPdfModalOpen] = useState(false);
     const [selectedPdfUrl, setSelectedPdfUrl] = useState<string | null>(null);
     const [selectedPdfTitle, setSelectedPdfTitle] = useState<string>("");
@@ -54,31 +53,9 @@ export default function JobApplicationsPage() {
         return { Authorization: `Bearer ${idToken}` };
     };
 
-    useEffect(() => {
-        async function fetchJobApplications() {
-            try {
-                const authHeaders = await getAuthHeaders();
-                
-                // Fetch all completed resumes (job applications)
-                const response = await fetch(
-                    'http://localhost:5000/completed_resumes',
-                    { headers: authHeaders }
-                );
-                
-                if (!response.ok) throw new Error('Failed to fetch job applications');
-                const result = await response.json();
-                
-                setApplications(result || []);
-            } catch (err) {
-                console.error('Error fetching job applications:', err);
-                setError(err instanceof Error ? err.message : 'Failed to load job applications');
-            } finally {
-                setLoading(false);
-            }
-        }
-
-        fetchJobApplications();
-    }, []);
+    // Completed resumes (job applications), newest first, one page at a time
+    const { items: applications, loading, loadingMore, error, hasMore, loadMore } =
+        usePagedList<JobApplication>('http://localhost:5000/completed_resumes', getAuthHeaders);
 
     const formatDate = (dateString: string) => {
         return new Date(dateString).toLocaleDateString('en-US', {
@@ -109,7 +86,7 @@ export default function JobApplicationsPage() {
         );
     }
 
-    if (error) {
+    if (error && applications.length === 0) {
         return (
             <Container size="lg" py="xl">
                 <Text color="red">Error: {error}</Text>
@@ -141,7 +118,7 @@ export default function JobApplicationsPage() {
                     color={themeStyles.primaryColor}
                     leftSection={<IconBriefcase size={16} />}
                 >
-                    {applications.length} Application{applications.length !== 1 ? 's' : ''}
+                    {applications.length}{hasMore ? '+' : ''} Application{applications.length !== 1 ? 's' : ''}
                 </Badge>
             </Group>
 
@@ -222,8 +199,11 @@ export default function JobApplicationsPage() {
                                                 onClick={() => {
                                                     if (application.formatted_pdf_url) {
                                                         const link = document.createElement('a');
-                                                        link.href = application.formatted_pdf_url;
-                                                        link.download = `${application.job_title}_${application.company}.pdf`;
+                                                        const pdfName = `${application.job_title}_${application.company}.pdf`;
+                                                        link.href = application.formatted_pdf_url.startsWith('data:')
+                                                            ? application.formatted_pdf_url
+                                                            : withDownloadName(application.formatted_pdf_url, pdfName);
+                                                        link.download = pdfName;
                                                         link.click();
                                                     }
                                                 }}
@@ -236,6 +216,13 @@ export default function JobApplicationsPage() {
                                 </Group>
                             </Card>
                         ))}
+                        {hasMore && (
+                            <Group justify="center">
+                                <Button variant="light" color={themeStyles.primaryColor} loading={loadingMore} onClick={loadMore}>
+                                    Load more
+                                </Button>
+                            </Group>
+                        )}
                     </Stack>
                 )}
             </div>
@@ -1,12 +1,13 @@
 "use client";
 
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { Container, Loader, Text, Table, ScrollArea, Group, Button, Stack, Collapse, Modal, Tooltip, Checkbox, TextInput, Paper} from "@mantine/core";
 import { IconFileText, IconFile, IconCheck, IconLock, IconDatabase } from "@tabler/icons-react";
 import { notifications } from "@mantine/notifications";
 import { useRouter } from "next/navigation";
 import { getAuth } from "firebase/auth";
 import mammoth from "mammoth";
+import { usePagedList } from "@/lib/pagination";
 
 // ────────────────────────────────────────────────────────────
 // Types
@@ -22,8 +23,27 @@ interface UploadItem {
 }
 
 export default function ResumeDatabasePage() {
-  const [uploads, setUploads] = useState<UploadItem[]>([]);
-  const [loading, setLoading] = useState(true);
+  const getAuthHeaders = async () => {
+    const auth = getAuth();
+    const user = auth.currentUser;
+    if (!user) throw new Error("User not authenticated");
+    const idToken = await user.getIdToken();
+    return { Authorization: `Bearer ${idToken}` };
+  };
+
+  // ────────────────────────────────────────────────────────────
+  // Fetch uploads, one page at a time
+  // ────────────────────────────────────────────────────────────
+  const { items: uploads, setItems: setUploads, loading, loadingMore, hasMore, loadMore } =
+    usePagedList<UploadItem>("http://localhost:5000/uploads", getAuthHeaders, {
+      map: (d: any) => ({
+        id: d.id,
+        displayName: d.filename || d.snippet || "(untitled)",
+        snippet: d.snippet,
+        hasText: Boolean(d.hasText),
+        uploadedAt: d.uploadedAt,
+      }),
+    });
   const [expandedId, setExpandedId] = useState<string | null>(null);
   const [pendingDeleteId, setPendingDeleteId] = useState<string | null>(null);
   const [isDeleting, setIsDeleting] = useState(false);
@@ -32,7 +52,8 @@ export default function ResumeDatabasePage() {
   const [previewLoading, setPreviewLoading] = useState<string | null>(null);
   const [fileData, setFileData] = useState<{
     [key: string]: { 
-      content: string; 
+      url: string; // Object URL of the original file
+      text?: string; // Decoded contents of text files
       type: string; 
       htmlContent?: string; 
       extractedText?: string; // For ODT files
@@ -40,6 +61,10 @@ export default function ResumeDatabasePage() {
     }
   }>({});
 
+  // Object URLs keep their blobs alive until revoked; release them when leaving the page
+  const fileUrlsRef = useRef<string[]>([]);
+  useEffect(() => () => fileUrlsRef.current.forEach(url => URL.revokeObjectURL(url)), []);
+
 
   // selection + naming
   const [selectedIds, setSelectedIds] = useState<Set<string>>(new Set());
@@ -48,7 +73,8 @@ export default function ResumeDatabasePage() {
   // Full-screen modal state
   const [fullScreenPreview, setFullScreenPreview] = useState<{ 
     upload: UploadItem; file: { 
-      content: string; 
+      url: string; // Object URL of the original file
+      text?: string; // Decoded contents of text files
       type: string; 
       htmlContent?: string; 
       extractedText?: string; // For ODT files
@@ -58,44 +84,6 @@ export default function ResumeDatabasePage() {
 
   const router = useRouter();
 
-  // ────────────────────────────────────────────────────────────
-  // Fetch uploads
-  // ────────────────────────────────────────────────────────────
-  useEffect(() => {
-      const fetchUploads = async () => {
-        try {
-          const auth = getAuth();
-          const user = auth.currentUser;
-          if (!user) throw new Error("User not authenticated");
-          const idToken = await user.getIdToken();
-
-          const res = await fetch("http://localhost:5000/uploads", {
-            headers: {
-              Authorization: `Bearer ${idToken}`,
-            },
-          });
-          if (!res.ok) throw new Error(res.statusText);
-          const raw = await res.json();
-          setUploads(
-            raw.map((d: any) => ({
-              id: d.id,
-              displayName: d.filename || d.snippet || "(untitled)",
-              snippet: d.snippet,
-              hasText: Boolean(d.hasText),
-              uploadedAt: d.uploadedAt,
-            }))
-          );
-        } 
-        catch (err) {
-          console.error("Failed to load uploads:", err);
-        } 
-        finally {
-          setLoading(false);
-        }
-      };
-      fetchUploads();
-    }, []);
-
   // ────────────────────────────────────────────────────────────
   // Fetch file content for preview
   // ────────────────────────────────────────────────────────────
@@ -118,10 +106,25 @@ export default function ResumeDatabasePage() {
       if (!res.ok) throw new Error("Failed to fetch file content");
       const data = await res.json();
 
+      // The raw file is streamed separately from the metadata and shown through an object URL
+      let fileBlob: Blob | null = null;
+      let fileUrl = "";
+      if (data.file_type) {
+        const fileRes = await fetch(`http://localhost:5000/uploads/${id}/file`, {
+          headers: {
+            Authorization: `Bearer ${idToken}`,
+          },
+        });
+        if (!fileRes.ok) throw new Error("Failed to fetch file content");
+        fileBlob = await fileRes.blob();
+        fileUrl = URL.createObjectURL(fileBlob);
+        fileUrlsRef.current.push(fileUrl);
+      }
+
       // Special handling for DOCX files
-      if (data.file_type === 'docx' && data.file_content) {
+      if (data.file_type === 'docx' && fileBlob) {
         try {
-          const arrayBuffer = Uint8Array.from(atob(data.file_content), c => c.charCodeAt(0)).buffer;
+          const arrayBuffer = await fileBlob.arrayBuffer();
 
           const result = await mammoth.convertToHtml(
             { arrayBuffer },
@@ -149,7 +152,7 @@ export default function ResumeDatabasePage() {
           setFileData(prev => ({
             ...prev,
             [id]: {
-              content: data.file_content, // Keep original for fallback
+              url: fileUrl, // Keep original for fallback
               htmlContent: result.value,  // Formatted HTML
               type: data.file_type,
               isFormatted: true,
@@ -162,7 +165,7 @@ export default function ResumeDatabasePage() {
           setFileData(prev => ({
             ...prev,
             [id]: {
-              content: data.file_content,
+              url: fileUrl,
               type: data.file_type,
               isFormatted: false,
             }
@@ -174,7 +177,7 @@ export default function ResumeDatabasePage() {
         setFileData(prev => ({
           ...prev,
           [id]: {
-            content: data.file_content,
+            url: fileUrl,
             extractedText: data.extracted_text,  // Store extracted text
             type: data.file_type,
             isFormatted: true,
@@ -183,10 +186,12 @@ export default function ResumeDatabasePage() {
       }
       else {
         // Regular handling for other file types
+        const text = fileBlob && ['txt', 'md'].includes(data.file_type) ? await fileBlob.text() : undefined;
         setFileData(prev => ({
           ...prev,
           [id]: {
-            content: data.file_content,
+            url: fileUrl,
+            text,
             type: data.file_type || (data.filename ? data.filename.split('.').pop()?.toLowerCase() : 'unknown'),
             isFormatted: false,
           }
@@ -260,10 +265,7 @@ export default function ResumeDatabasePage() {
 
     // PDF files
     if (file.type === "pdf") {
-      const pdfBlob = new Blob([
-        Uint8Array.from(atob(file.content), c => c.charCodeAt(0))
-      ], { type: "application/pdf" });
-      const pdfUrl = URL.createObjectURL(pdfBlob);
+      const pdfUrl = file.url;
 
       return (
         <Paper p="md" withBorder style={{ cursor: "pointer" }} onClick={() => setFullScreenPreview({ upload, file })}>
@@ -285,7 +287,7 @@ export default function ResumeDatabasePage() {
 
     // Text files (txt, md)
     if (['txt', 'md'].includes(file.type)) {
-      const textContent = atob(file.content);
+      const textContent = file.text ?? "";
       return (
         <Paper p="md" withBorder style={{ cursor: 'pointer' }} onClick={() => setFullScreenPreview({ upload, file })}>
           <Stack>
@@ -442,10 +444,7 @@ export default function ResumeDatabasePage() {
     const { upload, file } = fullScreenPreview;
 
     if (file.type === "pdf") {
-      const pdfBlob = new Blob([
-        Uint8Array.from(atob(file.content), c => c.charCodeAt(0))
-      ], { type: "application/pdf" });
-      const pdfUrl = URL.createObjectURL(pdfBlob);
+      const pdfUrl = file.url;
 
       return (
         <div style={{ width: '100%', height: '80vh' }}>
@@ -632,7 +631,7 @@ export default function ResumeDatabasePage() {
     }
 
     if (['txt', 'md'].includes(file.type)) {
-      const textContent = atob(file.content);
+      const textContent = file.text ?? "";
       return (
         <ScrollArea style={{ height: '80vh' }}>
           <Text 
@@ -863,6 +862,14 @@ export default function ResumeDatabasePage() {
         </div>
       </ScrollArea>
 
+      {hasMore && (
+        <Group justify="center" mt="md">
+          <Button variant="light" loading={loadingMore} onClick={loadMore}>
+            Load more
+          </Button>
+        </Group>
+      )}
+
       {/* Footer controls */}
       <Stack mt="md" maw={400} align="flex-start">
         <TextInput
@@ -113,70 +113,134 @@ export default function JobAdPage() {
         fetchCompleted();
     }, []);
 
-    // Polling effect for generation job status
+    // Subscribe to generation job progress over Server-Sent Events
     useEffect(() => {
         if (!generationJobId) return;
 
-        const pollStatus = async () => {
-            try {
-                const authHeaders = await getAuthHeaders();
-                const response = await fetch(`http://localhost:5000/resume_generation_jobs/${generationJobId}`, {
-                    headers: authHeaders,
-                });
-
-                if (!response.ok) {
-                    throw new Error(`Failed to fetch job status: ${response.status}`);
-                }
+        const controller = new AbortController();
 
-                const data = await response.json();
-                setGenerationStatus(data.status);
-                setGenerationProgress(data.progress || 0);
+        const handleStatus = (data: any) => {
+            setGenerationStatus(data.status);
+            setGenerationProgress(data.progress || 0);
 
-                if (data.status === "completed") {
-                    // Update status to show checkmark
-                    setGenerationStatus("completed");
-                    setGenerationProgress(100);
+            if (data.status === "completed") {
+                // Update status to show checkmark
+                setGenerationStatus("completed");
+                setGenerationProgress(100);
+                
+                // CF009: Show checkmark briefly then redirect
+                setTimeout(() => {
+                    // Navigate directly without showing notification (the destination page will handle success feedback)
+                    router.push(`/home/completed_resumes/${data.completed_resume_id}`);
                     
-                    // CF009: Show checkmark briefly then redirect
+                    // Clear states after navigation
                     setTimeout(() => {
-                        // Navigate directly without showing notification (the destination page will handle success feedback)
-                        router.push(`/home/completed_resumes/${data.completed_resume_id}`);
-                        
-                        // Clear states after navigation
-                        setTimeout(() => {
-                            setGenerationJobId(null);
-                            setGenerationStatus(null);
-                            setGenerationProgress(0);
-                        }, 1000);
-                    }, 1500); // Show checkmark for 1.5 seconds
-                } else if (data.status === "failed") {
-                    // CF009: Show error confirmation
-                    notifications.show({
-                        title: "Generation Failed",
-                        message: data.error || "Failed to create tailored resume",
-                        color: "red",
-                        autoClose: 5000,
-                    });
-                    setGenerationJobId(null);
-                    setGenerationStatus(null);
-                    setGenerationProgress(0);
-                }
-            } catch (error) {
-                console.error("Polling error:", error);
+                        setGenerationJobId(null);
+                        setGenerationStatus(null);
+                        setGenerationProgress(0);
+                    }, 1000);
+                }, 1500); // Show checkmark for 1.5 seconds
+            } else if (data.status === "failed") {
+                // CF009: Show error confirmation
                 notifications.show({
-                    title: "Status Check Failed",
-                    message: "Unable to check generation status",
-                    color: "orange",
-                    autoClose: 3000,
+                    title: "Generation Failed",
+                    message: data.error || "Failed to create tailored resume",
+                    color: "red",
+                    autoClose: 5000,
                 });
+                setGenerationJobId(null);
+                setGenerationStatus(null);
+                setGenerationProgress(0);
+            }
+        };
+
+        const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+        const isFinal = (status: string) => status === "completed" || status === "failed";
+
+        // Read one status stream; true once the job reached a terminal event
+        const streamStatus = async (): Promise<boolean> => {
+            const authHeaders = await getAuthHeaders();
+            // EventSource cannot send the Authorization header, so read the stream manually
+            const response = await fetch(`http://localhost:5000/resume_generation_jobs/${generationJobId}/events`, {
+                headers: authHeaders,
+                signal: controller.signal,
+            });
+
+            if (!response.ok || !response.body) {
+                throw new Error(`Failed to subscribe to job status: ${response.status}`);
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) return false;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split("\n\n");
+                buffer = events.pop() || "";
+                for (const event of events) {
+                    const lines = event.split("\n");
+                    const name = lines.find((line) => line.startsWith("event: "))?.slice(7);
+                    const dataLine = lines.find((line) => line.startsWith("data: "));
+                    if (!dataLine) continue;
+                    handleStatus(JSON.parse(dataLine.slice(6)));
+                    if (name === "completed" || name === "failed") return true;
+                }
+            }
+        };
+
+        // Fallback when the stream is unavailable; true once the job is finished
+        const pollStatus = async (): Promise<boolean> => {
+            const authHeaders = await getAuthHeaders();
+            const response = await fetch(`http://localhost:5000/resume_generation_jobs/${generationJobId}`, {
+                headers: authHeaders,
+                signal: controller.signal,
+            });
+            if (response.status === 404) {
+                handleStatus({ status: "failed", error: "Job no longer exists" });
+                return true;
+            }
+            if (!response.ok) throw new Error(`Failed to get job status: ${response.status}`);
+            const data = await response.json();
+            handleStatus(data);
+            return isFinal(data.status);
+        };
+
+        // Follow the job until it finishes: resubscribe when a stream ends early
+        // (reconnect event, proxy or server restart), poll while streaming fails
+        const subscribe = async () => {
+            let notified = false;
+            while (!controller.signal.aborted) {
+                try {
+                    if (await streamStatus()) return;
+                    await sleep(1000);
+                } catch (error) {
+                    if (controller.signal.aborted) return;
+                    console.error("Status stream error:", error);
+                    if (!notified) {
+                        notified = true;
+                        notifications.show({
+                            title: "Status Check Failed",
+                            message: "Live updates unavailable, checking status periodically",
+                            color: "orange",
+                            autoClose: 3000,
+                        });
+                    }
+                    try {
+                        if (await pollStatus()) return;
+                    } catch (pollError) {
+                        if (controller.signal.aborted) return;
+                        console.error("Status poll error:", pollError);
+                    }
+                    await sleep(5000);
+                }
             }
         };
 
-        // Poll immediately, then every 2 seconds
-        pollStatus();
-        const interval = setInterval(pollStatus, 2000);
+        subscribe();
         
-        return () => clearInterval(interval);
+        return () => controller.abort();
     }, [generationJobId, ad, router]);
 
     if (loading) {
@@ -6,26 +6,31 @@ import { IconCheck, IconClock, IconBolt, IconExternalLink, IconBriefcase, IconBu
 import { notifications } from "@mantine/notifications";
 import { useRouter } from "next/navigation";
 import { getAuth } from "firebase/auth";
+import { fetchPage, usePagedList } from "@/lib/pagination";
 
+// The list only carries title, company and location; the rest of parse_result
+// is loaded from GET /job_ads/<id> when a row is expanded or used for advice
 interface JobAd {
     _id: string;
-    job_ad_text: string;
+    job_ad_text?: string; // only with ?fields=job_ad_text
     uploaded_at: string;
     job_ad_url?: string;
     scraped_title?: string;
-    parse_result: {
-        job_title: string;
-        company: string;
-        location: string;
-        employment_type?: string;
-        salary_range?: string;
-        required_experience?: string;
-        required_education?: string;
-        job_description?: string;
-        responsibilities?: string[];
-        qualifications?: string[];
-        benefits?: string[];
-    };
+    parse_result: JobAdDetails;
+}
+
+interface JobAdDetails {
+    job_title: string;
+    company: string;
+    location: string;
+    employment_type?: string;
+    salary_range?: string;
+    required_experience?: string;
+    required_education?: string;
+    job_description?: string;
+    responsibilities?: string[];
+    qualifications?: string[];
+    benefits?: string[];
 }
 
 interface ResumeSummary {
@@ -33,10 +38,47 @@ interface ResumeSummary {
     name: string;
 }
 
+function JobAdDetailsView({ info }: { info: JobAdDetails }) {
+    return (
+        <>
+            <Text><strong>Employment Type:</strong> {info.employment_type || "N/A"}</Text>
+            <Text><strong>Salary Range:</strong> {info.salary_range || "N/A"}</Text>
+            <Text><strong>Required Experience:</strong> {info.required_experience || "N/A"}</Text>
+            <Text><strong>Required Education:</strong> {info.required_education || "N/A"}</Text>
+            {info.job_description && (
+              <Text><strong>Description:</strong> {info.job_description}</Text>
+            )}
+            {info.responsibilities && (
+              <div>
+                <Text><strong>Responsibilities:</strong></Text>
+                <ul>
+                  {info.responsibilities.map((item, idx) => <li key={idx}>{item}</li>)}
+                </ul>
+              </div>
+            )}
+            {info.qualifications && (
+              <div>
+                <Text><strong>Qualifications:</strong></Text>
+                <ul>
+                  {info.qualifications.map((item, idx) => <li key={idx}>{item}</li>)}
+                </ul>
+              </div>
+            )}
+            {info.benefits && (
+              <div>
+                <Text><strong>Benefits:</strong></Text>
+                <ul>
+                  {info.benefits.map((item, idx) => <li key={idx}>{item}</li>)}
+                </ul>
+              </div>
+            )}
+        </>
+    );
+}
+
 export default function JobAdsPage() {
-    const [ads, setAds] = useState<JobAd[]>([]);
-    const [loading, setLoading] = useState(true);
     const [expandedId, setExpandedId] = useState<string | null>(null);
+    const [details, setDetails] = useState<{[jobAdId: string]: JobAdDetails}>({});
     const [pendingDeleteId, setPendingDeleteId] = useState<string | null>(null);
     const [isDeleting, setIsDeleting] = useState(false)
     const [generationJobs, setGenerationJobs] = useState<{[jobAdId: string]: any}>({});
@@ -64,76 +106,48 @@ export default function JobAdsPage() {
       return { Authorization: `Bearer ${idToken}` };
     };
 
-    useEffect(() => {
-        async function fetchJobAds() {
-            try {
-                const authHeaders = await getAuthHeaders(); // Add this
-                
-                const response = await fetch("http://localhost:5000/job_ads", {
-                    headers: authHeaders, // Add this
-                });
-                
-                if (!response.ok) {
-                    throw new Error(response.statusText);
-                }
-                
-                const data: JobAd[] = await response.json();
-                setAds(data);
-            } catch (err) {
-                console.error("Failed to load job ads:", err);
-            } finally {
-                setLoading(false);
-            }
+    // Job ads one page at a time; each page's applied badges come with it
+    const { items: ads, setItems: setAds, loading, loadingMore, hasMore, loadMore } =
+        usePagedList<JobAd>("http://localhost:5000/job_ads", getAuthHeaders, {
+            onPage: (page) => fetchAppliedJobs(page.map((ad) => ad._id)),
+        });
+
+    async function fetchAppliedJobs(jobAdIds: string[]) {
+        if (jobAdIds.length === 0) return;
+        try {
+            const authHeaders = await getAuthHeaders();
+            const url = new URL("http://localhost:5000/completed_resumes/applied_job_ads");
+            url.searchParams.set("job_ad_ids", jobAdIds.join(","));
+            const response = await fetch(url.toString(), { headers: authHeaders });
+            if (!response.ok) throw new Error(response.statusText);
+            const { job_ad_ids }: { job_ad_ids: string[] } = await response.json();
+            setAppliedJobs(prev => new Set([...prev, ...job_ad_ids]));
+        } catch (err) {
+            console.error("Failed to load applied jobs:", err);
         }
+    }
+
+    useEffect(() => {
 
         async function fetchGenerationJobs() {
             try {
                 const authHeaders = await getAuthHeaders();
-                const response = await fetch("http://localhost:5000/resume_generation_jobs", {
-                    headers: authHeaders,
-                });
+                // Active jobs are the newest ones, so the first page is enough
+                const { items: jobs } = await fetchPage<any>("http://localhost:5000/resume_generation_jobs", authHeaders);
+                const jobsMap: {[jobAdId: string]: any} = {};
                 
-                if (response.ok) {
-                    const jobs = await response.json();
-                    const jobsMap: {[jobAdId: string]: any} = {};
-                    
-                    // Group jobs by job_ad_id, keeping only the most recent active job per job ad
-                    jobs.forEach((job: any) => {
-                        if (job.status === "processing" || job.status === "pending") {
-                            if (!jobsMap[job.job_ad_id] || new Date(job.created_at) > new Date(jobsMap[job.job_ad_id].created_at)) {
-                                jobsMap[job.job_ad_id] = job;
-                            }
+                // Group jobs by job_ad_id, keeping only the most recent active job per job ad
+                jobs.forEach((job: any) => {
+                    if (job.status === "processing" || job.status === "pending") {
+                        if (!jobsMap[job.job_ad_id] || new Date(job.created_at) > new Date(jobsMap[job.job_ad_id].created_at)) {
+                            jobsMap[job.job_ad_id] = job;
                         }
-                    });
-                    
-                    setGenerationJobs(jobsMap);
-                }
-            } catch (err) {
-                console.error("Failed to load generation jobs:", err);
-            }
-        }
-        
-        async function fetchAppliedJobs() {
-            try {
-                const authHeaders = await getAuthHeaders();
-                const response = await fetch("http://localhost:5000/completed_resumes", {
-                    headers: authHeaders,
+                    }
                 });
                 
-                if (response.ok) {
-                    const completedResumes = await response.json();
-                    const appliedJobIds = new Set<string>();
-                    
-                    completedResumes.forEach((resume: any) => {
-                        if (resume.job_ad_id) {
-                            appliedJobIds.add(resume.job_ad_id);
-                        }
-                    });
-                    
-                    setAppliedJobs(appliedJobIds);
-                }
+                setGenerationJobs(jobsMap);
             } catch (err) {
-                console.error("Failed to load applied jobs:", err);
+                console.error("Failed to load generation jobs:", err);
             }
         }
         
@@ -152,9 +166,7 @@ export default function JobAdsPage() {
             }
         }
         
-        fetchJobAds();
         fetchGenerationJobs();
-        fetchAppliedJobs();
         fetchCompletedResumes();
     }, []);
 
@@ -163,24 +175,19 @@ export default function JobAdsPage() {
         const pollJobs = async () => {
             try {
                 const authHeaders = await getAuthHeaders();
-                const response = await fetch("http://localhost:5000/resume_generation_jobs", {
-                    headers: authHeaders,
-                });
+                // Active jobs are the newest ones, so the first page is enough
+                const { items: jobs } = await fetchPage<any>("http://localhost:5000/resume_generation_jobs", authHeaders);
+                const jobsMap: {[jobAdId: string]: any} = {};
                 
-                if (response.ok) {
-                    const jobs = await response.json();
-                    const jobsMap: {[jobAdId: string]: any} = {};
-                    
-                    jobs.forEach((job: any) => {
-                        if (job.status === "processing" || job.status === "pending") {
-                            if (!jobsMap[job.job_ad_id] || new Date(job.created_at) > new Date(jobsMap[job.job_ad_id].created_at)) {
-                                jobsMap[job.job_ad_id] = job;
-                            }
+                jobs.forEach((job: any) => {
+                    if (job.status === "processing" || job.status === "pending") {
+                        if (!jobsMap[job.job_ad_id] || new Date(job.created_at) > new Date(jobsMap[job.job_ad_id].created_at)) {
+                            jobsMap[job.job_ad_id] = job;
                         }
-                    });
-                    
-                    setGenerationJobs(jobsMap);
-                }
+                    }
+                });
+                
+                setGenerationJobs(jobsMap);
             } catch (err) {
                 console.error("Failed to poll generation jobs:", err);
             }
@@ -218,8 +225,22 @@ export default function JobAdsPage() {
       }
     };
 
+    const loadDetails = async (id: string): Promise<JobAdDetails> => {
+        if (details[id]) return details[id];
+        const response = await fetch(`http://localhost:5000/job_ads/${id}`, {
+            headers: await getAuthHeaders(),
+        });
+        if (!response.ok) throw new Error("Failed to load job ad");
+        const { parse_result } = await response.json();
+        setDetails(prev => ({ ...prev, [id]: parse_result }));
+        return parse_result;
+    };
+
     const toggleExpand = (id: string) => {
         setExpandedId((prev) => (prev === id ? null : id));
+        if (!details[id]) {
+            loadDetails(id).catch((err) => console.error("Failed to load job ad details:", err));
+        }
     };
 
     const handleJobSelect = (ad: JobAd) => {
@@ -284,11 +305,12 @@ export default function JobAdsPage() {
             });
             
             const resumeDataArray = await Promise.all(resumePromises);
+            const jobAdDetails = await loadDetails(selectedJobForAdvice._id);
             
             // Create advice request payload with multiple resumes
             const advicePayload = {
                 resume_data: resumeDataArray, // Array of resume data
-                job_ad_data: selectedJobForAdvice,
+                job_ad_data: { ...selectedJobForAdvice, parse_result: jobAdDetails },
                 score_data: {} // We don't have score data for this case
             };
             
@@ -457,37 +479,7 @@ export default function JobAdsPage() {
                   <Table.Td colSpan={5} style={{ padding: 0, border: 0 }}>
                     <Collapse in={expandedId === ad._id}>
                       <Stack px="md" py="sm">
-                        <Text><strong>Employment Type:</strong> {ad.parse_result.employment_type || "N/A"}</Text>
-                        <Text><strong>Salary Range:</strong> {ad.parse_result.salary_range || "N/A"}</Text>
-                        <Text><strong>Required Experience:</strong> {ad.parse_result.required_experience || "N/A"}</Text>
-                        <Text><strong>Required Education:</strong> {ad.parse_result.required_education || "N/A"}</Text>
-                        {ad.parse_result.job_description && (
-                          <Text><strong>Description:</strong> {ad.parse_result.job_description}</Text>
-                        )}
-                        {ad.parse_result.responsibilities && (
-                          <div>
-                            <Text><strong>Responsibilities:</strong></Text>
-                            <ul>
-                              {ad.parse_result.responsibilities.map((item, idx) => <li key={idx}>{item}</li>)}
-                            </ul>
-                          </div>
-                        )}
-                        {ad.parse_result.qualifications && (
-                          <div>
-                            <Text><strong>Qualifications:</strong></Text>
-                            <ul>
-                              {ad.parse_result.qualifications.map((item, idx) => <li key={idx}>{item}</li>)}
-                            </ul>
-                          </div>
-                        )}
-                        {ad.parse_result.benefits && (
-                          <div>
-                            <Text><strong>Benefits:</strong></Text>
-                            <ul>
-                              {ad.parse_result.benefits.map((item, idx) => <li key={idx}>{item}</li>)}
-                            </ul>
-                          </div>
-                        )}
+                        {details[ad._id] ? <JobAdDetailsView info={details[ad._id]} /> : <Loader size="sm" />}
                       </Stack>
                     </Collapse>
                   </Table.Td>
@@ -498,6 +490,14 @@ export default function JobAdsPage() {
         </Table>
       </ScrollArea>
 
+      {hasMore && (
+        <Group justify="center" mt="md">
+          <Button variant="light" loading={loadingMore} onClick={loadMore}>
+            Load more
+          </Button>
+        </Group>
+      )}
+
       {/* Applied Job Warning Modal */}
       <Modal
         opened={showAppliedWarning}
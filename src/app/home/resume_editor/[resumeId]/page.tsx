@@ -32,10 +32,8 @@ export default function Resume_Editor() {
         const data = await res.json();
 
         if(res.ok) {
-          setResumeData({
-            _id: data.id,
-            ...data.parse_result
-          });
+          // Already shaped for ResumeInfo, including _id and version
+          setResumeData(data);
           setError(null);
         }
         else {
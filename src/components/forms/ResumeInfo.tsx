@@ -88,6 +88,7 @@ export interface ResumeInfoProps {
       end_date: string | null;
       GPA: number | null;
     }[];
+    version?: number;
   };
 }
 
@@ -360,6 +361,13 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
   const [isReparseModalOpen, setReparseModalOpen] = useState(false);
   const [reparsing, setReparsing] = useState(false);
 
+  // Resume version this editor last saw; Save All sends it so the server
+  // refuses to overwrite changes saved elsewhere in the meantime
+  const [version, setVersion] = useState<number | null>(data.version ?? null);
+  function trackVersion(body: { version?: number }) {
+    if (typeof body.version === "number") setVersion(body.version);
+  }
+
   const {
     name,
     first_name,
@@ -674,6 +682,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
       const resData = await response.json();
 
       if (response.ok) {
+        trackVersion(resData);
         clearDirty("emails");
         notifications.show({
           title: "Success",
@@ -785,6 +794,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
 
       const resData = await response.json();
       if (response.ok) {
+        trackVersion(resData);
         clearDirty("phones");
         notifications.show({
           title: "Success",
@@ -835,6 +845,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
 
       const resData = await response.json();
       if (response.ok) {
+        trackVersion(resData);
         clearDirty("objective");
         notifications.show({
           title: "Success",
@@ -1037,6 +1048,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
       const resData = await response.json();
 
       if (response.ok) {
+        trackVersion(resData);
         clearDirty("skills");
         notifications.show({
           title: "Success",
@@ -1175,6 +1187,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
 
       const result = await response.json();
       if (response.ok) {
+        trackVersion(result);
         clearDirty("jobs");
         notifications.show({
           title: "Success",
@@ -1267,6 +1280,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
           color: "red",
         });
       } else {
+        trackVersion(resData);
         clearDirty("jobs");
         notifications.show({
           title: "Success",
@@ -1323,6 +1337,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
           color: "red",
         });
       } else {
+        trackVersion(resData);
         clearDirty("jobs");
         notifications.show({
           title: "Success",
@@ -1408,6 +1423,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
     });
     const result = await res.json();
     if (res.ok) {
+      trackVersion(result);
       // update UI & snapshot
       setEdusState((prev) => {
         const copy = [...prev];
@@ -1471,6 +1487,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
     if (!res.ok) {
       notifications.show({ title: "Error", message: js.error, color: "red" });
     } else {
+      trackVersion(js);
       clearDirty("education");
       notifications.show({
         title: "Success",
@@ -1505,6 +1522,7 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
       if (!res.ok) {
         notifications.show({ title: "Error", message: js.error, color: "red" });
       } else {
+        trackVersion(js);
         clearDirty("education");
 
         setEdusState((prev) => prev.filter((_, i) => i !== idx));
@@ -1632,36 +1650,78 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
         });
       }
     }
-    // Sequintal Saves
+    // Single PATCH with every section; the server applies it as one write
+    const cleanedEmails = emails.map((e) => e.trim()).filter((e) => e !== "");
+    const cleanedPhones = phones
+      .map((p) => p.replace(/\D/g, ""))
+      .filter((p) => p.length === 10)
+      .map((p) => `${p.slice(0, 3)}-${p.slice(3, 6)}-${p.slice(6)}`);
+    const cleanedSkills: Record<string, string[]> = {};
+    for (const category of categoryOrder) {
+      const list = skillsState[category];
+      if (list && list.length > 0) cleanedSkills[category] = list;
+    }
+    // Include entries still open in an edit form
+    const jobsToSave = [...jobsState];
+    if (editingIndex !== null && jobDraft) jobsToSave[editingIndex] = jobDraft;
+    const edusToSave = [...edusState];
+    if (editingEduIndex !== null && eduDraft) edusToSave[editingEduIndex] = eduDraft;
+
     setSavingAll(true);
     try {
-      await saveEmails();
-      if (emailErrors.some(Boolean)) throw new Error("Emails still invalid");
-
-      await savePhones();
-      if (phoneErrors.some(Boolean)) throw new Error("Phones still invalid");
-
-      await saveCareerObjective();
-      if (objectiveError) throw new Error("Objective still invalid");
-
-      await saveSkills();
-      if (skillSaveValidationMessage) throw new Error(skillSaveValidationMessage);
+      const response = await fetch(`http://localhost:5000/resume/${data._id}`, {
+        method: "PATCH",
+        headers: {
+          "Content-Type": "application/json",
+          ...(await getAuthHeaders()),
+        },
+        body: JSON.stringify({
+          version,
+          operations: [
+            { op: "add", path: "/contact/emails", value: cleanedEmails },
+            { op: "add", path: "/contact/phones", value: cleanedPhones },
+            { op: "add", path: "/career_objective", value: objective.trim() },
+            { op: "add", path: "/skills", value: cleanedSkills },
+            { op: "add", path: "/jobs", value: jobsToSave.map(canonicalizeJob) },
+            { op: "add", path: "/education", value: edusToSave.map(canonicalizeEdu) },
+          ],
+        }),
+      });
+      const resData = await response.json();
 
-      // Jobs
-      for (let i = 0; i < jobsState.length; i++) {
-        const err = validateJobEntry(jobsState[i]);
-        if (err) throw new Error(`Job ${i + 1}: ${err}`);
-        await saveJob(i);
+      if (response.status === 409) {
+        return notifications.show({
+          title: "Resume changed",
+          message: "This resume was changed somewhere else since you opened it. Reload the page to get the latest version, then save again.",
+          color: "red",
+        });
       }
-      await saveJobOrder(jobsState);
-
-      // Education
-      for (let i = 0; i < edusState.length; i++) {
-        const err = validateEduEntry(edusState[i]);
-        if (err) throw new Error(`Education ${i + 1}: ${err}`);
-        await saveEdu(i);
+      if (!response.ok) {
+        return notifications.show({
+          title: "Error",
+          message: resData.error || "Something went wrong saving—please try again.",
+          color: "red",
+        });
       }
-      await saveEduOrder(edusState);
+
+      trackVersion(resData);
+      setJobsState(jobsToSave.map(canonicalizeJob));
+      setOriginalJobs(jobsToSave.map(canonicalizeJob));
+      setSavedJobsCount(jobsToSave.length);
+      setEditingIndex(null);
+      setJobDraft(null);
+      setEdusState(edusToSave.map(canonicalizeEdu));
+      setOriginalEdus(edusToSave.map(canonicalizeEdu));
+      setEditingEduIndex(null);
+      setEduDraft(null);
+      setDirty({
+        emails: false,
+        phones: false,
+        objective: false,
+        skills: false,
+        jobs: false,
+        education: false,
+      });
 
       notifications.show({
         title: "All Saved",
@@ -1671,7 +1731,6 @@ export default function ResumeInfo({ data }: ResumeInfoProps) {
       setHasSavedAll(true);
     } 
     catch (err) {
-      // in case any of the saves threw
       notifications.show({
         title: "Error",
         message: "Something went wrong saving—please try again.",
@@ -0,0 +1,106 @@
+// Cursor pagination for the list endpoints (uploads, job ads, completed resumes,
+// generation jobs). Each page is a JSON array; the cursor of the next page comes
+// back in the X-Next-Cursor header and is absent on the last page.
+
+import { useCallback, useEffect, useRef, useState } from "react";
+
+export const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+export const PAGE_SIZE = 100;
+
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null;
+};
+
+function pageUrl(url: string, cursor: string | null, limit: number): string {
+  const u = new URL(url);
+  u.searchParams.set("limit", String(limit));
+  if (cursor) u.searchParams.set("cursor", cursor);
+  return u.toString();
+}
+
+/** Fetch one page of a list endpoint. */
+export async function fetchPage<T>(
+  url: string,
+  headers: HeadersInit,
+  cursor: string | null = null,
+  limit: number = PAGE_SIZE
+): Promise<Page<T>> {
+  const res = await fetch(pageUrl(url, cursor, limit), { headers });
+  if (!res.ok) throw new Error(res.statusText);
+  const items: T[] = await res.json();
+  return { items, nextCursor: res.headers.get(NEXT_CURSOR_HEADER) };
+}
+
+type PagedListOptions<T> = {
+  /** Shape each raw item of the response into a list item. */
+  map?: (raw: any) => T;
+  /** Called with the items of every page as it arrives. */
+  onPage?: (items: T[]) => void;
+};
+
+/**
+ * A list endpoint loaded one page at a time: the first page on mount, the next
+ * one each time loadMore is called (e.g. from a "Load more" button). setItems
+ * lets the page drop or edit items locally, such as after a delete.
+ */
+export function usePagedList<T>(
+  url: string,
+  getHeaders: () => Promise<HeadersInit>,
+  options: PagedListOptions<T> = {}
+) {
+  const [items, setItems] = useState<T[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+
+  // Callers pass fresh closures every render; only the latest ones are used
+  const getHeadersRef = useRef(getHeaders);
+  const optionsRef = useRef(options);
+  getHeadersRef.current = getHeaders;
+  optionsRef.current = options;
+
+  const load = useCallback(
+    async (cursor: string | null) => {
+      try {
+        const page = await fetchPage<any>(url, await getHeadersRef.current(), cursor);
+        const { map, onPage } = optionsRef.current;
+        const loaded: T[] = map ? page.items.map(map) : page.items;
+        setItems((prev) => (cursor ? prev.concat(loaded) : loaded));
+        setNextCursor(page.nextCursor);
+        setError(null);
+        onPage?.(loaded);
+      } catch (err) {
+        console.error(`Failed to load ${url}:`, err);
+        setError(err instanceof Error ? err.message : String(err));
+      }
+    },
+    [url]
+  );
+
+  useEffect(() => {
+    setLoading(true);
+    load(null).finally(() => setLoading(false));
+  }, [load]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      await load(nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [load, nextCursor, loadingMore]);
+
+  return {
+    items,
+    setItems,
+    loading,
+    loadingMore,
+    error,
+    hasMore: nextCursor !== null,
+    loadMore,
+  };
+}
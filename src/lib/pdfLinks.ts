@@ -0,0 +1,9 @@
+// Formatted PDF links are signed (?expires=&sig=), so extra parameters must be
+// added to the existing query string rather than appended with "?".
+
+/** Link to a formatted PDF that saves it under the given name instead of previewing it. */
+export function withDownloadName(pdfUrl: string, filename: string): string {
+  const url = new URL(pdfUrl);
+  url.searchParams.set("download", filename);
+  return url.toString();
+}